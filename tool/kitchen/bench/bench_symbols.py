@@ -0,0 +1,52 @@
+# bench/bench_symbols.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+
+Run: python -m bench.bench_symbols
+"""
+
+import time
+import logging
+import tempfile
+
+from pathlib import Path
+
+from forge import replace_syms
+from forge import clear_sym_file_cache
+from forge import ADS_SYM_FILE_HEADER
+
+
+def bench_replace_syms(symbols: int, patches: int, directory: Path) -> float:
+	sym_p: Path = directory / f'library_{symbols}.sym'
+	with sym_p.open(mode='w', newline='\r\n') as f_o:
+		f_o.write(f'{ADS_SYM_FILE_HEADER}\n')
+		for i in range(symbols):
+			f_o.write(f'0x{0x10080000 + i * 0x10:08X} T Function_{i}\n')
+	lines: list[str] = [f'0x{0x12000000 + i * 0x10:08X} T Function_{i * (symbols // patches)}' for i in range(patches)]
+	lines += [f'0x{0x13000000 + i * 0x10:08X} T Patch_{i}' for i in range(patches)]
+	clear_sym_file_cache()
+	start: float = time.perf_counter()
+	replace_syms(lines, sym_p, 'E1', 'R373_G_0E.30.49R', 'EP2', '1.0')
+	return time.perf_counter() - start
+
+
+def main() -> None:
+	logging.disable(logging.CRITICAL)
+	with tempfile.TemporaryDirectory() as temp:
+		print(f'{"symbols":>8} {"patches":>8} {"time, ms":>10} {"ms per 1000 entries":>20}')
+		for symbols in (1000, 2000, 4000, 8000, 16000):
+			patches: int = symbols // 10
+			elapsed: float = bench_replace_syms(symbols, patches, Path(temp))
+			print(f'{symbols:>8} {patches:>8} {elapsed * 1000:>10.1f} {elapsed * 1000000 / symbols:>20.2f}')
+
+
+if __name__ == '__main__':
+	main()
@@ -26,6 +26,7 @@ class Mode(Enum):
 	SYM_TO_SYM: int = 0
 	SYM_TO_DEF: int = 1
 	PAT_TO_PAT: int = 2
+	LIB_TO_LIB: int = 3
 
 
 # Helpers.
@@ -36,6 +37,9 @@ def swap_reverse_arguments(args: Namespace) -> Namespace:
 	e_reverse: forge.ElfPack = args.elfpack_src
 	args.elfpack_src = args.elfpack_cmp
 	args.elfpack_cmp = e_reverse
+	a_reverse: bool = args.argon_src
+	args.argon_src = args.argon_cmp
+	args.argon_cmp = a_reverse
 	return args
 
 
@@ -54,6 +58,12 @@ def start_comparator_work(mode: Mode, args: Namespace) -> bool:
 		if args.swap:
 			args = swap_reverse_arguments(args)
 		return forge.log_result(forge.pat_cmp_pat(args.source, args.compare, args.names))
+	elif mode == Mode.LIB_TO_LIB:
+		if args.swap:
+			args = swap_reverse_arguments(args)
+		return forge.log_result(
+			forge.lib_cmp_lib(args.source, args.compare, args.names, (args.argon_src, args.argon_cmp))
+		)
 	return False
 
 
@@ -78,6 +88,8 @@ class Args(argparse.ArgumentParser):
 		c_sym = forge.check_files_extensions([c], ['sym'], False)
 		s_pat = forge.check_files_extensions([s], ['pts'], False)
 		c_pat = forge.check_files_extensions([c], ['pts'], False)
+		s_lib = forge.check_files_extensions([s], ['lib', 'bin'], False)
+		c_lib = forge.check_files_extensions([c], ['lib', 'bin'], False)
 
 		if s_sym and c_def:
 			return Mode.SYM_TO_DEF, args
@@ -85,6 +97,8 @@ class Args(argparse.ArgumentParser):
 			return Mode.SYM_TO_SYM, args
 		elif s_pat and c_pat:
 			return Mode.PAT_TO_PAT, args
+		elif s_lib and c_lib:
+			return Mode.LIB_TO_LIB, args
 
 		self.error('all arguments are empty')
 
@@ -98,6 +112,8 @@ def parse_arguments() -> tuple[Mode, Namespace]:
 		'ec': 'ElfPack version of compare file',
 		'r': 'reverse and swap source and compare arguments',
 		'n': 'compare names only',
+		'as': 'data addresses of EP1 source library are shifted for Argon phones',
+		'ac': 'data addresses of EP1 compare library are shifted for Argon phones',
 		'v': 'verbose output'
 	}
 	epl: str = """examples:
@@ -118,6 +134,13 @@ def parse_arguments() -> tuple[Mode, Namespace]:
 	python compare.py -s patterns_1.pts -c patterns_2.pts
 	python compare.py -s patterns_1.pts -c patterns_2.pts -r
 	python compare.py -s patterns_1.pts -c patterns_2.pts -n
+
+	# Compare libraries among themselves without conversion to symbols files (+swap/reverse arguments, names only).
+	python compare.py -s elfloader_1.lib -c elfloader_2.lib
+	python compare.py -s elfloader_1.lib -c library_2.bin -r
+	python compare.py -s library_1.bin -c library_2.bin -n
+	python compare.py -s elfloader_1.lib -c library_2.bin -as
+	python compare.py -s elfloader_1.lib -as -c elfloader_2.lib
 	"""
 	parser_args: Args = Args(description=hlp['h'], epilog=epl, formatter_class=argparse.RawDescriptionHelpFormatter)
 	parser_args.add_argument('-s', '--source', required=True, type=forge.at_file, metavar='INPUT', help=hlp['s'])
@@ -126,6 +149,8 @@ def parse_arguments() -> tuple[Mode, Namespace]:
 	parser_args.add_argument('-ec', '--elfpack-cmp', required=False, type=forge.at_ep, metavar='ELFPACK', help=hlp['ec'])
 	parser_args.add_argument('-r', '--swap', required=False, action='store_true', help=hlp['r'])
 	parser_args.add_argument('-n', '--names', required=False, action='store_true', help=hlp['n'])
+	parser_args.add_argument('-as', '--argon-src', required=False, action='store_true', help=hlp['as'])
+	parser_args.add_argument('-ac', '--argon-cmp', required=False, action='store_true', help=hlp['ac'])
 	parser_args.add_argument('-v', '--verbose', required=False, action='store_true', help=hlp['v'])
 	return parser_args.parse_check_arguments()
 
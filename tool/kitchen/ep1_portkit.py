@@ -340,34 +340,43 @@ EP1_PFW_VARIANTS: dict[str, dict[str, any]] = {
 }
 
 
-# Patches.
-def apply_patches(phone: str, firmware: str, lib_sym: Path) -> bool:
-	patches: list[str] = []
-	if phone == 'E1':
-		if firmware == 'R373_G_0E.30.49R':
-			# Pattern: EV_BacklightContinueOn D 00000E10102E
-			patches.append('0x102FC120 D EV_BacklightContinueOn')
-	elif phone == 'K1':
-		if firmware == 'R452F_G_08.03.08R':
-			# Pattern: [201490002000900190029003+0x01E8]+28
-			patches.append('0x14501210 D Ram_l7e')
-	elif phone == 'L9':
-		if firmware == 'R452J_G_08.22.05R':
-			# Pattern: [7FFF0000011E00000122+0x0A]
-			patches.append('0x1451C1C8 D Ram_l7e')
-	elif phone == 'V3i':
-		if firmware == 'R4441D_G_08.01.03R':
-			# Pattern: BEGIN_4A__IN_DB D 1 BC08471800000600+0x4
-			patches.append('0x100A7AB6 D BEGIN_4A__IN_DB')
-	elif phone == 'V235':
-		if firmware == 'R3512_G_0A.30.6CR':
-			# Pattern: Ram_398_l7 D [80A842B0D1062006+0x24]+0x10
-			patches.append('0x124A4BB8 D Ram_398_l7')
-	elif phone == 'Z3':
-		if firmware == 'R452F1_G_08.04.09R':
-			# Pattern: [14??????00003E580000FFFF]+0x4
-			patches.append('0x14076374 D Ram_l7e')
-	return forge.libgen_apply_patches(patches, lib_sym, phone, firmware, 'EP1') if patches else False
+# Patches, every pattern is given with its value verified on this firmware file for the reference.
+PATCH_PATTERNS: dict[str, list[tuple[str, int]]] = {
+	'E1_R373_G_0E.30.49R': [
+		('EV_BacklightContinueOn D 00000E10102E', 0x102FC120),
+	],
+	'K1_R452F_G_08.03.08R': [
+		('Ram_l7e D [201490002000900190029003+0x01E8]+28', 0x14501210),
+	],
+	'L9_R452J_G_08.22.05R': [
+		('Ram_l7e D [7FFF0000011E00000122+0x0A]', 0x1451C1C8),
+	],
+	'V3i_R4441D_G_08.01.03R': [
+		('BEGIN_4A__IN_DB D 1 BC08471800000600+0x4', 0x100A7AB6),
+	],
+	'V235_R3512_G_0A.30.6CR': [
+		('Ram_398_l7 D [80A842B0D1062006+0x24]+0x10', 0x124A4BB8),
+	],
+	'Z3_R452F1_G_08.04.09R': [
+		('Ram_l7e D [14??????00003E580000FFFF+0x0]+0x4', 0x14076374),
+	],
+}
+
+
+def apply_patches(phone: str, firmware: str, lib_sym: Path, fw_file: Path, start: int) -> bool:
+	entries: list[tuple[str, int]] | None = PATCH_PATTERNS.get(f'{phone}_{firmware}')
+	if not entries:
+		logging.info(f'There are no patches for "{phone}_{firmware}" firmware.')
+		return True
+	patches: list[str] | None = forge.resolve_pattern_lines([pattern for pattern, _ in entries], fw_file, start)
+	if not patches:
+		logging.error(f'Cannot resolve patches of "{phone}_{firmware}" firmware.')
+		return False
+	for patch, (pattern, reference) in zip(patches, entries):
+		address, mode, name = forge.split_and_validate_line(patch)
+		if int(address, 16) != reference:
+			logging.warning(f'Patch "{patch}" differs from the verified {forge.int2hex(reference)} value.')
+	return forge.libgen_apply_patches(patches, lib_sym, phone, firmware, 'EP1')
 
 
 # Various generators.
@@ -377,9 +386,8 @@ def generate_lib_sym(
 	names_skip_pattern: bool = False
 ) -> bool:
 	if forge.check_files_if_exists([p_i_f, p_i_e]):
-		with (p_i_f.open(mode='r') as i_f, p_i_e.open(mode='r') as i_s, p_o_l.open(mode='w', newline='\r\n') as o_l):
-			o_l.write(f'{forge.ADS_SYM_FILE_HEADER}\n')
-			o_l.write('# SYMDEFS ADS HEADER\n\n')
+		with (p_i_f.open(mode='r') as i_f, p_i_e.open(mode='r') as i_s, forge.LineWriter(p_o_l) as o_l):
+			o_l.write_lines(forge.get_sym_file_header())
 			for line in i_f.read().splitlines():
 				address, mode, name = forge.split_and_validate_line(line)
 				found: bool = False
@@ -389,25 +397,28 @@ def generate_lib_sym(
 							if name.find(add) != -1:
 								found = True
 				if (name is not None) and (not found) if names_skip_pattern else (name not in names_skip):
-					o_l.write(f'{line}\n')
-			o_l.write('\n\n')
+					o_l.write_line(line)
+			o_l.write_lines(['', ''])
 			for line in i_s.read().splitlines():
 				address, mode, name = forge.split_and_validate_line(line)
 				if name is not None:
 					for add in patterns_add:
 						if name.find(add) != -1:
-							o_l.write(f'{line}\n')
+							o_l.write_line(line)
 			return True
 	return False
 
 
 def generate_register_patch(fw: str, author: str, desc: str, p_e: Path, p_r: Path, p_p: Path, cg: Path) -> bool:
 	if forge.check_files_if_exists([p_e, p_r]):
-		hex_data: str = forge.int2hex_r(forge.get_function_address_from_sym_file(p_e, FUNC_AUTORUN))
-		reg_address: int = forge.get_function_address_from_sym_file(p_r, FUNC_REGISTER)
+		elfpack_lookup: forge.SymbolLookup | None = forge.open_symbol_lookup(p_e)
+		register_lookup: forge.SymbolLookup | None = forge.open_symbol_lookup(p_r)
+		if (elfpack_lookup is not None) and (register_lookup is not None):
+			hex_data: str = forge.int2hex_r(elfpack_lookup.resolve(FUNC_AUTORUN))
+			reg_address: int = register_lookup.resolve(FUNC_REGISTER)
 
-		forge.hex2fpa(fw, author, desc, reg_address, hex_data, p_p, cg)
-		return True
+			forge.hex2fpa(fw, author, desc, reg_address, hex_data, p_p, cg)
+			return True
 	return False
 
 
@@ -424,7 +435,10 @@ def generate_system_information_source(phone: str, firmware: str, soc: str, sour
 def generate_register_sym(
 	combined_sym: Path, cgs_path: Path, register_func: str, pat: Path, sym: Path, hook: int = None
 ) -> bool:
-	address: int = hook if hook else forge.get_function_address_from_sym_file(combined_sym, register_func)
+	address: int = hook
+	if not address:
+		lookup: forge.SymbolLookup | None = forge.open_symbol_lookup(combined_sym)
+		address = lookup.resolve(register_func) if (lookup is not None) else 0x00000000
 	if address != 0x00000000:
 		forge.pat_append(pat, 'Register', 'D', forge.int2hex_r(address))
 		forge.pat_find(pat, cgs_path, 0x00000000, False, sym)
@@ -472,34 +486,36 @@ def start_ep1_portkit_work(opts: dict[str, any]) -> bool:
 		forge.pat_find(opts['patterns'], opts['fw_file'], opts['start'], opts['ram_trans'], val_functions_sym)
 		logging.info('')
 
+		val_combined_sym_files: list[Path] = [val_combined_sym]
 		if not opts['skip_platform']:
-			logging.info('Combining all functions into one symbols file.')
 			if opts['soc'] == 'LTE':
-				forge.create_combined_sym_file([val_functions_sym, val_platform_sym], val_combined_sym)
+				val_combined_sym_files = [val_functions_sym, val_platform_sym]
 			elif opts['soc'] == 'LTE2':
 				if forge.is_modern_lte2(opts['phone']):
-					forge.create_combined_sym_file(
-						[val_functions_sym, val_platform_sym, val_functions_modern_lte2, val_lte2_irom_sym],
-						val_combined_sym
-					)
+					val_combined_sym_files = [
+						val_functions_sym, val_platform_sym, val_functions_modern_lte2, val_lte2_irom_sym
+					]
 				else:
-					forge.create_combined_sym_file(
-						[val_functions_sym, val_platform_sym, val_lte2_irom_sym],
-						val_combined_sym
-					)
+					val_combined_sym_files = [val_functions_sym, val_platform_sym, val_lte2_irom_sym]
+
+		# Only the Combined.sym file itself is there on skipping platform symbols, nothing to combine.
+		if val_combined_sym_files != [val_combined_sym]:
+			logging.info('Combining all functions into one symbols file.')
+			if not forge.create_combined_sym_file(val_combined_sym_files, val_combined_sym):
+				return False
 			logging.info('')
 
 		if opts['append']:
 			logging.info('Append additional patterns file if any.')
 			val_append_sym: Path = opts['output'] / 'Append.sym'
-			val_combined_append_sym: Path = opts['output'] / 'Combined_Append.sym'
 			forge.pat_find(opts['append'], opts['fw_file'], opts['start'], opts['ram_trans'], val_append_sym)
-			forge.create_combined_sym_file([val_append_sym, val_combined_sym], val_combined_append_sym)
-			val_combined_sym = val_combined_append_sym
+			if not forge.create_combined_sym_file([val_append_sym, val_combined_sym], val_combined_sym, True):
+				return False
 			logging.info('')
 
 		logging.info('Applying phone specific patches.')
-		apply_patches(opts['phone'], opts['fw_name'], val_combined_sym)
+		if not apply_patches(opts['phone'], opts['fw_name'], val_combined_sym, opts['fw_file'], opts['start']):
+			return False
 		logging.info('')
 
 		logging.info('Validating combined symbols file.')
@@ -530,9 +546,8 @@ def start_ep1_portkit_work(opts: dict[str, any]) -> bool:
 
 	if opts['append_sym']:
 		logging.info('Append additional symbols file if any.')
-		val_combined_append_added_sym: Path = opts['output'] / 'Combined_Append_Added.sym'
-		forge.create_combined_sym_file([opts['append_sym'], val_combined_sym], val_combined_append_added_sym)
-		val_combined_sym = val_combined_append_added_sym
+		if not forge.create_combined_sym_file([opts['append_sym'], val_combined_sym], val_combined_sym, True):
+			return False
 		logging.info('')
 
 	if opts['gcc']:
@@ -635,8 +650,9 @@ def start_ep1_portkit_work(opts: dict[str, any]) -> bool:
 			logging.error(f'Cannot link "{val_elfpack_elf}" executable file using GCC.')
 			return False
 		forge.ep2_gcc_objcopy(val_elfpack_elf, val_elfpack_bin)
-		forge.ep2_gcc_nm(val_elfpack_elf, opts['output'] / 'ElfPack.nm')
-		forge.convert_nm_to_sym(opts['output'] / 'ElfPack.nm', opts['output'] / 'ElfPack.sym')
+		if not forge.ep2_gcc_nm_to_sym(val_elfpack_elf, val_elfpack_sym):
+			logging.error(f'Cannot generate "{val_elfpack_sym}" symbols file using GCC.')
+			return False
 	logging.info('')
 
 	logging.info('Patch resulting binaries.')
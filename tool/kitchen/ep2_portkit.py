@@ -278,9 +278,11 @@ def get_additional_pfw_patches(phone: str, firmware: str) -> list[Path]:
 # Various generators.
 def generate_register_patch(fw: str, author: str, desc: str, p_r: Path, reg_address: int, p_p: Path, cg: Path) -> bool:
 	if forge.check_files_if_exists([p_r]):
-		hex_data: str = forge.int2hex_r(forge.get_function_address_from_sym_file(p_r, FUNC_REGISTER))
-		forge.hex2fpa(fw, author, desc, reg_address, hex_data, p_p, cg)
-		return True
+		lookup: forge.SymbolLookup | None = forge.open_symbol_lookup(p_r)
+		if lookup is not None:
+			hex_data: str = forge.int2hex_r(lookup.resolve(FUNC_REGISTER))
+			forge.hex2fpa(fw, author, desc, reg_address, hex_data, p_p, cg)
+			return True
 	return False
 
 
@@ -25,6 +25,10 @@ from argparse import Namespace
 class Mode(Enum):
 	SYM_TO_PAT: int = 0
 	SYM_TO_SYM: int = 1
+	SYM_TO_PAT_MINE: int = 2
+	PAT_TO_SYM_BATCH: int = 3
+	SYMBOLIZE: int = 4
+	PAT_TO_SYM: int = 5
 
 
 # Helpers.
@@ -36,9 +40,25 @@ def start_forge_work(mode: Mode,  sort: forge.LibrarySort, args: Namespace) -> b
 	if mode == Mode.SYM_TO_PAT:
 		return forge.log_result(
 			forge.sym2pat(
-				args.source, args.output, args.firmware, args.offset, args.size, args.irom, (args.offset == 0xA0080000)
+				args.source, args.output, args.firmware, args.offset, args.size, args.irom, (args.offset == 0xA0080000),
+				args.unique, args.ram_trans, args.index
 			)
 		)
+	elif mode == Mode.SYM_TO_PAT_MINE:
+		return forge.log_result(forge.mine_patterns(args.source, args.firmwares, args.output, args.size, args.offset))
+	elif mode == Mode.PAT_TO_SYM:
+		return forge.log_result(
+			forge.pat_find(args.source, args.firmware, args.offset, args.ram_trans, args.output, args.index)
+		)
+	elif mode == Mode.PAT_TO_SYM_BATCH:
+		return forge.log_result(
+			forge.pat_find_directory(
+				args.source, args.firmware_dir, args.offset, args.ram_trans, args.output, args.index
+			)
+		)
+	elif mode == Mode.SYMBOLIZE:
+		max_size: int = forge.SYMBOLIZER_MAX_SIZE if args.size is None else args.size
+		return forge.log_result(forge.symbolize_file(args.source, args.addresses, args.output, max_size))
 	elif mode == Mode.SYM_TO_SYM:
 		names: list[str] | None = forge.libgen_names_sym(args.defines, args.elfpack, not args.const)
 		if names:
@@ -63,6 +83,9 @@ class Args(argparse.ArgumentParser):
 		s: Path = args.source
 		o: Path = args.output
 		f: Path = args.firmware
+		fs: list[Path] = args.firmwares
+		fd: Path = args.firmware_dir
+		a: Path = args.addresses
 		g: int = args.offset
 		z: int = args.size
 		d: Path = args.defines
@@ -70,12 +93,21 @@ class Args(argparse.ArgumentParser):
 		pf: tuple[str, str] = args.phone_fw
 
 		s_sym: bool = forge.check_files_extensions([s], ['sym'], False)
+		s_pat: bool = forge.check_files_extensions([s], ['pts'], False)
 		o_pat: bool = forge.check_files_extensions([o], ['pts'], False)
 		o_sym: bool = forge.check_files_extensions([o], ['sym'], False)
 		d_sym: bool = forge.check_files_extensions([d], ['sym', 'def'], False)
 
 		if s_sym and o_pat and (f is not None) and (g is not None) and (z is not None):
 			return Mode.SYM_TO_PAT, sort, args
+		elif s_sym and o_pat and fs and (z is not None):
+			return Mode.SYM_TO_PAT_MINE, sort, args
+		elif s_pat and o_sym and (f is not None) and (g is not None):
+			return Mode.PAT_TO_SYM, sort, args
+		elif s_pat and (fd is not None):
+			return Mode.PAT_TO_SYM_BATCH, sort, args
+		elif s_sym and (a is not None):
+			return Mode.SYMBOLIZE, sort, args
 		elif s_sym and d_sym and o_sym and pf and (e is not None):
 			return Mode.SYM_TO_SYM, sort, args
 
@@ -87,10 +119,16 @@ def parse_arguments() -> tuple[Mode, forge.LibrarySort, Namespace]:
 		'h': 'A Forge auxiliary utility for various ElfPacks and Motorola phones on P2K platform, 15-Dec-2023',
 		's': 'source file',
 		'f': 'path to CG0+CG1 firmware file',
-		'g': 'offset (in HEX)',
-		'z': 'size (integer)',
-		'o': 'output file',
+		'fd': 'directory with CG0+CG1 firmware files',
+		'fs': 'paths to CG0+CG1 firmware files with libraries in the "res" directory',
+		'g': 'offset (in HEX), will be detected for every firmware if omitted in mining and batch modes',
+		'a': 'text file with addresses, hex dumps or crash logs to symbolize',
+		'z': 'size (integer), the maximum function size in symbolize mode, 65536 by default and 0 is unlimited',
+		'o': 'output file or directory',
 		'i': 'irom',
+		'u': 'minimal unique patterns, size is the maximum',
+		'rt': 'use RAM-Trans to find patterns or to generate patterns for IRAM entries',
+		'x': 'use and keep a "*.idx" index file beside firmware files to speed up repeated pattern searches',
 		'pf': 'phone and firmware, e.g. "E1_R373_G_0E.30.49R"',
 		'd': 'source defines or symbols file',
 		'e': 'ElfPack version',
@@ -105,6 +143,25 @@ def parse_arguments() -> tuple[Mode, forge.LibrarySort, Namespace]:
 	python forge.py -s library.sym -f ../cg/E1_R373_G_0E.30.49R.smg -g 0x10080000 -z 32 -o patterns.pts
 	python forge.py -i -s library.sym -f ../irom/0300-irom-LTE2.bin -g 0x00000000 -z 32 -o patterns.pts
 
+	# Generate a draft patterns file with the shortest unique patterns up to 64 bytes.
+	python forge.py -u -s library.sym -f ../cg/E1_R373_G_0E.30.49R.smg -g 0x10080000 -z 64 -o patterns.pts
+	python forge.py -u -x -s library.sym -f ../cg/E1_R373_G_0E.30.49R.smg -g 0x10080000 -z 64 -o patterns.pts
+
+	# Mine generalized patterns from several firmware files using their "res/*/elfloader.sym" libraries.
+	python forge.py -s library.sym -fs ../cg/E1_R373_G_0E.30.49R.smg ../cg/C650_R365_G_0B.D3.08R.smg -z 32 -o lib.pts
+
+	# Find patterns in the firmware file and write symbols file, the index speeds up repeated runs on the same firmware.
+	python forge.py -s ../../ep1/pts/General_P2K_LTE2.pts -f ../cg/E1_R373_G_0E.30.49R.smg -g 0x10092000 -o lib.sym
+	python forge.py -x -s ../../ep1/pts/General_P2K_LTE2.pts -f ../cg/E1_R373_G_0E.30.49R.smg -g 0x10092000 -o lib.sym
+
+	# Find patterns in every firmware file of the directory, write symbols files and "Summary.txt" matrix to output.
+	python forge.py -s ../../ep1/pts/General_P2K_LTE2.pts -fd ../cg -g 0x10092000 -o output_dir
+	python forge.py -x -s ../../ep1/pts/General_P2K_LTE2.pts -fd ../cg -g 0x10092000 -o output_dir
+
+	# Symbolize addresses, hex dumps or crash logs, every address is suffixed by a "<symbol+offset>" tag.
+	python forge.py -s ../../res/E1_R373_G_0E.30.49R/elfloader.sym -a crash.txt -o crash_symbolized.txt
+	python forge.py -s ../../res/E1_R373_G_0E.30.49R/elfloader.sym -a dump.txt -z 4096 -o dump_symbolized.txt
+
 	# Rechunk symbols file from another one.
 	python forge.py -sn -s gsm_flash_dev.sym -d elfloader.sym -e EP1 -pf 'E1_R373_G_0E.30.49R' -o library.sym
 	python forge.py -sn -c -s gsm_flash_dev.sym -d elfloader.sym -e EP1 -pf 'E1_R373_G_0E.30.49R' -o library.sym
@@ -113,9 +170,17 @@ def parse_arguments() -> tuple[Mode, forge.LibrarySort, Namespace]:
 	parser_args.add_argument('-s', '--source', required=True, type=forge.at_file, metavar='INPUT', help=hlp['s'])
 	parser_args.add_argument('-o', '--output', required=True, type=forge.at_path, metavar='OUTPUT', help=hlp['o'])
 	parser_args.add_argument('-f', '--firmware', required=False, type=forge.at_file, metavar='FILE.smg', help=hlp['f'])
+	parser_args.add_argument('-fd', '--firmware-dir', required=False, type=forge.at_dir, metavar='DIR', help=hlp['fd'])
+	parser_args.add_argument(
+		'-fs', '--firmwares', required=False, type=forge.at_file, nargs='+', metavar='FILE.smg', help=hlp['fs']
+	)
+	parser_args.add_argument('-a', '--addresses', required=False, type=forge.at_file, metavar='FILE', help=hlp['a'])
 	parser_args.add_argument('-g', '--offset', required=False, type=forge.at_hex, metavar='OFFSET', help=hlp['g'])
 	parser_args.add_argument('-z', '--size', required=False, type=forge.at_int, metavar='SIZE', help=hlp['z'])
 	parser_args.add_argument('-i', '--irom', required=False, action='store_true', help=hlp['i'])
+	parser_args.add_argument('-u', '--unique', required=False, action='store_true', help=hlp['u'])
+	parser_args.add_argument('-rt', '--ram-trans', required=False, action='store_true', help=hlp['rt'])
+	parser_args.add_argument('-x', '--index', required=False, action='store_true', help=hlp['x'])
 	parser_args.add_argument('-pf', '--phone-fw', required=False, type=forge.at_pfw, metavar='PHONE_FW', help=hlp['pf'])
 	parser_args.add_argument('-d', '--defines', required=False, type=forge.at_file, metavar='INPUT', help=hlp['d'])
 	parser_args.add_argument('-e', '--elfpack', required=False, type=forge.at_ep, metavar='ELFPACK', help=hlp['e'])
@@ -26,6 +26,7 @@ from .arguments import args_dump
 from .comparator import sym_cmp_sym
 from .comparator import sym_cmp_def
 from .comparator import pat_cmp_pat
+from .comparator import lib_cmp_lib
 
 from .constants import *
 
@@ -40,6 +41,7 @@ from .toolchain import ep2_gcc_gcc
 from .toolchain import ep2_gcc_link
 from .toolchain import ep2_gcc_objcopy
 from .toolchain import ep2_gcc_nm
+from .toolchain import ep2_gcc_nm_to_sym
 from .toolchain import ep2_gcc_ar
 from .toolchain import ep2_gcc_strip
 from .toolchain import toolchain_compile
@@ -62,6 +64,8 @@ from .firmware import get_file_size
 from .firmware import determine_soc
 from .firmware import is_modern_lte2
 from .firmware import determine_memory_region
+from .firmware import FirmwareView
+from .firmware import detect_firmware_start
 
 from .hexer import hex2int
 from .hexer import hex2int_r
@@ -90,15 +94,58 @@ from .libgen import ep2_libgen_model
 from .libgen import ep2_libgen_library
 from .libgen import ep2_libgen_symbols
 from .libgen import ep2_libgen_generate_names_defines
+from .libgen import ep2_libgen_api_names
 from .libgen import ep2_libgen_regenerator
 from .libgen import ep2_libgen_resort
 from .libgen import ep2_libgen_chunk_sym
 from .libgen import ep2_libgen_names_sym
 from .libgen import determine_sort_mode
+from .libgen import libgen_regenerate_directory
+from .libgen import libgen_resort_directory
+from .libgen import libgen_directory_worker
+from .libgen import libgen_process_directories
+from .libgen import log_regenerator_summary
 from .libgen import ep1_libgen_get_library_sym
 from .libgen import ep2_libgen_get_library_sym
 from .libgen import libgen_gcc_sym
 
+from .ptc import dump_patterns_to_ptc_file
+from .ptc import load_patterns_from_ptc_file
+
+from .symcache import SymbolCache
+from .symcache import get_symbol_cache_path
+from .symcache import update_symbol_cache
+from .symcache import open_symbol_cache
+
+from .symbolizer import AddressIndex
+from .symbolizer import open_address_index
+from .symbolizer import symbolize_text
+from .symbolizer import symbolize_file
+
+from .libbin import LibraryView
+from .libbin import ElfloaderLibView
+from .libbin import LibraryBinView
+from .libbin import open_library_bin
+from .libbin import open_elfloader_lib
+from .libbin import open_library_view
+from .libbin import diff_library_symbols
+from .libbin import pack_ep1_library
+from .libbin import pack_ep2_library
+from .libbin import pack_ep2_stub_library
+
+from .writer import LineWriter
+from .writer import write_lines_to_file
+from .writer import get_forge_header
+from .writer import get_sym_file_header
+
+from .ramtrans import parse_region_table
+from .ramtrans import RamTranslator
+
+from .indexer import get_index_path
+from .indexer import build_firmware_index
+from .indexer import open_firmware_index
+from .indexer import FirmwareIndex
+
 from .patcher import bin2fpa
 from .patcher import hex2fpa
 from .patcher import fpa2bin
@@ -110,15 +157,44 @@ from .patcher import generate_and_append_undo_values_to_fpa
 from .patcher import patch_text_file_template
 
 from .patterns import pat_find
+from .patterns import pat_find_external
+from .patterns import parse_pattern_line
+from .patterns import load_pattern_file
+from .patterns import get_compiled_pattern_path
+from .patterns import resolve_pattern_value
+from .patterns import evaluate_patterns
+from .patterns import resolve_pattern_lines
+from .patterns import dump_pattern_values_to_sym_file
+from .patterns import scan_firmware_image
+from .patterns import PatternScanner
 from .patterns import pat_append
 from .patterns import sym2pat
+from .patterns import mask_branch_opcodes
+from .patterns import find_pattern_matches
+from .patterns import select_unique_pattern
+from .patterns import generalize_patterns
+from .patterns import mine_patterns
+from .patterns import pat_find_firmware
+from .patterns import pat_find_directory
+from .patterns import find_ram_translator
 
+from .symbols import merge_sym_files
 from .symbols import create_combined_sym_file
 from .symbols import split_and_validate_line
 from .symbols import validate_sym_file
 from .symbols import get_function_address_from_sym_file
+from .symbols import SymbolLookup
+from .symbols import open_symbol_lookup
 from .symbols import dump_library_model_to_sym_file
 from .symbols import dump_sym_file_to_library_model
+from .symbols import parse_sym_file
+from .symbols import load_symbol_table
+from .symbols import clear_sym_file_cache
+from .symbols import load_definitions
+from .symbols import clear_definitions_cache
+from .symbols import replace_syms
+from .symbols import write_nm_line_to_sym
+from .symbols import format_nm_line_to_sym
 from .symbols import convert_nm_to_sym
 
 from .types import ElfPack
@@ -126,11 +202,21 @@ from .types import ElfPacks
 from .types import LibraryModel
 from .types import LibrarySort
 from .types import MemoryRegion
+from .types import Pattern
+from .types import BinaryImage
+from .types import PatternStatus
+from .types import RegeneratorResult
+from .types import RegionTable
+from .types import SymbolTable
+from .types import DefinitionsRegistry
+from .types import SymbolCacheEntry
 
 from .utilities import format_timedelta
 from .utilities import chop_str
 from .utilities import log_result
+from .utilities import ErrorCollector
 from .utilities import dump_text_file_to_debug_log
 from .utilities import set_logging_configuration
+from .utilities import set_worker_logging_configuration
 from .utilities import get_current_datetime_formatted
 from .utilities import is_string_filled_by_character
@@ -22,6 +22,11 @@ from .types import LibraryModel
 from .types import PatternModel
 from .libgen import ep1_libgen_model
 from .libgen import ep2_libgen_model
+from .hexer import int2hex
+from .libbin import LibraryView
+from .libbin import LibraryBinView
+from .libbin import open_library_view
+from .libbin import diff_library_symbols
 from .symbols import combine_sym_str
 from .symbols import split_and_validate_line
 from .patterns import combine_pat_str
@@ -141,3 +146,41 @@ def pat_cmp_pat(s_pat: Path, c_pat: Path, names_only: bool) -> bool:
 			logging.info(f'"{c_str}" not found in "{s_pat}" file.')
 
 	return True
+
+
+def lib_cmp_lib(
+	s_lib: Path, c_lib: Path, names_only: bool, argonlv: tuple[bool, bool] = (False, False)
+) -> bool:
+	s_argonlv, c_argonlv = argonlv
+	s_view: LibraryView | None = open_library_view(s_lib, s_argonlv)
+	c_view: LibraryView | None = open_library_view(c_lib, c_argonlv)
+	try:
+		if (s_view is None) or (c_view is None):
+			return False
+
+		s_symbols: dict[bytes, int] = s_view.symbols()
+		c_symbols: dict[bytes, int] = c_view.symbols()
+		missed, mismatched = diff_library_symbols(s_symbols, c_symbols)
+		for name in missed:
+			logging.info(f'"{int2hex(c_symbols[name])} {name.decode("ascii")}" not found in "{s_lib}" file.')
+		if not names_only:
+			for name in mismatched:
+				logging.info('Addresses mismatch:')
+				logging.info(f'\t"{int2hex(c_symbols[name])} {name.decode("ascii")}" in "{c_lib}" file.')
+				logging.info(f'\t"{int2hex(s_symbols[name])} {name.decode("ascii")}" in "{s_lib}" file.')
+
+		if isinstance(s_view, LibraryBinView) and isinstance(c_view, LibraryBinView):
+			s_consts: dict[int, int] = dict(zip(s_view.const_indexes, s_view.const_values))
+			for index, value in zip(c_view.const_indexes, c_view.const_values):
+				if index not in s_consts:
+					logging.info(f'Const "{int2hex(index, 4)}" not found in "{s_lib}" file.')
+				elif (s_consts[index] != value) and not names_only:
+					logging.info(f'Const "{int2hex(index, 4)}" values mismatch:')
+					logging.info(f'\t"{int2hex(value)}" in "{c_lib}" file.')
+					logging.info(f'\t"{int2hex(s_consts[index])}" in "{s_lib}" file.')
+		return True
+	finally:
+		if s_view is not None:
+			s_view.close()
+		if c_view is not None:
+			c_view.close()
@@ -90,8 +90,46 @@ P2K_EP2_API_DEF: Path = P2K_DIR_EP2_DEF / 'ElfLoaderAPI2.def'
 P2K_EP2_NMS_DEF: Path = P2K_DIR_EP2_DEF / 'EntriesNames.def'
 
 ADS_SYM_FILE_HEADER: str = '#<SYMDEFS>#symdef-file'
+ADS_SYM_FILE_MODES: frozenset[str] = frozenset({'A', 'C', 'D', 'T'})
 
 MAX_BINARY_CHUNK_READ: int = 4096
+MAX_TEXT_CHUNK_LINES: int = 4096
+MIN_UNIQUE_PATTERN_SIZE: int = 8
+
+# Estimated size of the last symbol and the default symbol size limit, see the "forge/symbolizer.py" file.
+SYMBOLIZER_MAX_SIZE: int = 0x10000
+
+# Pattern of the firmware region table for RAM-Trans, see the "forge/ramtrans.py" file.
+P2K_REGION_TABLE_PATTERN: str = '_region_table D E255501028A408C18AFFFFFCE1B05E85+0x1C'
+
+# Persistent firmware words index, see the "forge/indexer.py" file.
+INDEX_FILE_EXTENSION: str = 'idx'
+INDEX_FILE_MAGIC: bytes = b'P2KI'
+INDEX_FILE_VERSION: int = 1
+INDEX_BUCKETS: int = 0x10000
+INDEX_MIN_IMAGE_SIZE: int = 0x100000
+
+# Compiled patterns file, see the "forge/ptc.py" file.
+PATTERN_FILE_EXTENSION: str = 'ptc'
+PATTERN_FILE_MAGIC: bytes = b'P2KP'
+PATTERN_FILE_VERSION: int = 1
+SYMBOL_CACHE_FILE_NAME: str = 'Symbols.cache'
+SYMBOL_CACHE_FILE_MAGIC: bytes = b'P2KS'
+SYMBOL_CACHE_FILE_VERSION: int = 1
+
+EP2_LIBRARY_MAGIC: int = 0x7F4C4942
+EP2_STUB_ELF_IDENT: bytes = b'\x7FELF\x01\x02\x01'
+EP2_STUB_ELF_FLAGS: int = 0x04000000
+EP2_STUB_SECTION_NAMES: bytes = b'\0.dynamic\0.dynsym\0.dynstr\0.shstrtab\0'
+
+# Start addresses of CG0+CG1 firmware images on various SoCs.
+P2K_SOC_START_ADDRESSES: dict[int, str] = {
+	0x10080000: 'LTE',
+	0x10092000: 'LTE2',
+	0x100A0000: 'LTE2',
+	0x10152000: 'LTE2',
+	0xA0080000: 'ArgonLV',
+}
 
 # Motorola phones based on Argon+, ArgonLV, ArgonLVLT, and similar SoCs.
 P2K_ARGON_PHONES: list[str] = ['V3xx', 'V6', 'K3', 'K3m', 'Z9', 'V9', 'M702iG', 'M702iS', 'E825']
@@ -11,9 +11,14 @@ Date: 15-Dec-2023
 Version: 1.0
 """
 
+import mmap
+
 from pathlib import Path
 
 from .types import MemoryRegion
+from .types import BinaryImage
+from .types import LibraryModel
+from .constants import P2K_SOC_START_ADDRESSES
 from .filesystem import check_files_if_exists
 from .filesystem import check_files_extensions
 
@@ -56,14 +61,7 @@ def get_file_size(path: Path) -> int:
 
 
 def determine_soc(start_firmware_address: int) -> str:
-	soc_map: dict[int, str] = {
-		0x10080000: 'LTE',
-		0x10092000: 'LTE2',
-		0x100A0000: 'LTE2',
-		0x10152000: 'LTE2',
-		0xA0080000: 'ArgonLV',
-	}
-	return soc_map.get(start_firmware_address, 'Unknown')
+	return P2K_SOC_START_ADDRESSES.get(start_firmware_address, 'Unknown')
 
 
 def is_modern_lte2(phone: str) -> bool:
@@ -96,3 +94,71 @@ def determine_memory_region(address: int, argonlv: bool = False) -> MemoryRegion
 			return MemoryRegion.PERIPHERALS
 		else:
 			return MemoryRegion.UNKNOWN
+
+
+def is_function_prologue(data: BinaryImage, position: int, mode: str) -> bool:
+	if position < 0:
+		return False
+	if mode == 'T':
+		return data[position:position + 1] in (b'\xB4', b'\xB5')  # PUSH {...}
+	return data[position:position + 2] == b'\xE9\x2D'  # STMFD SP!, {...}
+
+
+def detect_firmware_start(data: BinaryImage, model: LibraryModel) -> int | None:
+	"""
+	Pick the known SoC start address where most of the functions from the symbols model start from PUSH opcodes.
+	"""
+	best_start: int | None = None
+	best_count: int = 0
+	for start in P2K_SOC_START_ADDRESSES:
+		count: int = sum(
+			1 for address, mode, _ in model
+			if mode in ('T', 'A') and is_function_prologue(data, int(address, 16) - start, mode)
+		)
+		if count > best_count:
+			best_start, best_count = start, count
+	return best_start
+
+
+class FirmwareView:
+	"""
+	Read-only memory-mapped firmware file, all slices are zero-copy "memoryview" objects over it.
+	"""
+
+	def __init__(self, firmware_p: Path) -> None:
+		self.path: Path = firmware_p
+		self.file = firmware_p.open(mode='rb')
+		self.map: mmap.mmap | None = None
+		if firmware_p.stat().st_size > 0:
+			self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+			self.data: memoryview = memoryview(self.map)
+		else:
+			self.data: memoryview = memoryview(b'')
+
+	def __enter__(self) -> 'FirmwareView':
+		return self
+
+	def __exit__(self, *args) -> None:
+		self.close()
+
+	def __len__(self) -> int:
+		return len(self.data)
+
+	def close(self) -> None:
+		self.data.release()
+		if self.map is not None:
+			try:
+				self.map.close()
+			except BufferError:
+				# Slices still alive outside of the view keep the mapping, it will be unmapped with the last of them.
+				pass
+		self.file.close()
+
+	def read(self, offset: int, size: int) -> memoryview:
+		# Same as the "seek()" and "read()" pair on a file: reading beyond the end returns a short or empty slice.
+		if offset < 0:
+			return self.data[0:0]
+		return self.data[offset:offset + size]
+
+	def hex(self, offset: int, size: int) -> str:
+		return self.read(offset, size).hex().upper()
@@ -0,0 +1,141 @@
+# forge/indexer.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import os
+import sys
+import mmap
+import struct
+import hashlib
+import logging
+
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
+from pathlib import Path
+
+from .types import BinaryImage
+from .constants import INDEX_BUCKETS
+from .constants import INDEX_FILE_MAGIC
+from .constants import INDEX_FILE_VERSION
+from .constants import INDEX_FILE_EXTENSION
+
+# Magic, version, byte order of the index data, SHA-256 digest of the firmware image, and its size.
+INDEX_HEADER: struct.Struct = struct.Struct('<4sHH32sQ')
+
+
+def get_index_path(image_p: Path) -> Path:
+	return image_p.with_name(f'{image_p.name}.{INDEX_FILE_EXTENSION}')
+
+
+def get_index_bucket(word: int) -> int:
+	return (word ^ (word >> 16)) & (INDEX_BUCKETS - 1)
+
+
+def get_index_header(image: BinaryImage) -> bytes:
+	return INDEX_HEADER.pack(
+		INDEX_FILE_MAGIC,
+		INDEX_FILE_VERSION,
+		sys.byteorder == 'little',
+		hashlib.sha256(image).digest(),
+		len(image)
+	)
+
+
+def build_firmware_index(image: BinaryImage, index_p: Path, header: bytes) -> bool:
+	"""
+	Index file layout: header, table of buckets starts, and 4-byte aligned word numbers of the firmware image.
+	Every bucket keeps word numbers sorted by word value and then by their position in the firmware image.
+	"""
+	logging.info(f'Building "{index_p}" firmware index, it will take a while.')
+	buckets: list[array] = [array('I') for _ in range(INDEX_BUCKETS)]
+	with memoryview(image) as view, view[:len(image) & ~3].cast('I') as words:
+		for position, word in enumerate(words):
+			buckets[(word ^ (word >> 16)) & (INDEX_BUCKETS - 1)].append(position)
+		starts: array = array('I', [0])
+		for i, bucket in enumerate(buckets):
+			buckets[i] = array('I', sorted(bucket, key=words.__getitem__))
+			starts.append(starts[-1] + len(bucket))
+
+	temporary_p: Path = index_p.with_name(f'{index_p.name}.tmp')
+	try:
+		with temporary_p.open(mode='wb') as f_o:
+			f_o.write(header)
+			starts.tofile(f_o)
+			for bucket in buckets:
+				bucket.tofile(f_o)
+		os.replace(temporary_p, index_p)
+		return True
+	except OSError as error:
+		logging.error(f'Cannot write "{index_p}" firmware index: {error}')
+		temporary_p.unlink(missing_ok=True)
+	return False
+
+
+class FirmwareIndex:
+	"""
+	Memory-mapped persistent index of all 4-byte aligned words of the firmware image.
+	"""
+
+	def __init__(self, image: BinaryImage, index_p: Path) -> None:
+		self.index_file = index_p.open(mode='rb')
+		self.index_map: mmap.mmap = mmap.mmap(self.index_file.fileno(), 0, access=mmap.ACCESS_READ)
+		self.index_view: memoryview = memoryview(self.index_map)[INDEX_HEADER.size:].cast('I')
+		self.starts: memoryview = self.index_view[:INDEX_BUCKETS + 1]
+		self.positions: memoryview = self.index_view[INDEX_BUCKETS + 1:]
+		self.image_view: memoryview = memoryview(image)
+		self.words: memoryview = self.image_view[:len(image) & ~3].cast('I')
+
+	def __enter__(self) -> 'FirmwareIndex':
+		return self
+
+	def __exit__(self, *args) -> None:
+		self.close()
+
+	def close(self) -> None:
+		for view in (self.words, self.image_view, self.positions, self.starts, self.index_view):
+			view.release()
+		self.index_map.close()
+		self.index_file.close()
+
+	def find_word(self, word: int) -> list[int]:
+		bucket: int = get_index_bucket(word)
+		start: int = self.starts[bucket]
+		end: int = self.starts[bucket + 1]
+		first: int = bisect_left(self.positions, word, start, end, key=self.words.__getitem__)
+		last: int = bisect_right(self.positions, word, first, end, key=self.words.__getitem__)
+		return [position * 4 for position in self.positions[first:last]]
+
+
+def is_firmware_index_valid(image: BinaryImage, index_p: Path, header: bytes) -> bool:
+	if not index_p.is_file():
+		return False
+	expected_size: int = INDEX_HEADER.size + (INDEX_BUCKETS + 1 + len(image) // 4) * 4
+	if index_p.stat().st_size != expected_size:
+		return False
+	with index_p.open(mode='rb') as f_i:
+		return f_i.read(INDEX_HEADER.size) == header
+
+
+def open_firmware_index(image: BinaryImage, image_p: Path) -> FirmwareIndex | None:
+	index_p: Path = get_index_path(image_p)
+	header: bytes = get_index_header(image)
+	if not is_firmware_index_valid(image, index_p, header):
+		if index_p.exists():
+			logging.info(f'Firmware index "{index_p}" is outdated and will be rebuilt.')
+		if not build_firmware_index(image, index_p, header):
+			return None
+	try:
+		return FirmwareIndex(image, index_p)
+	except (OSError, ValueError) as error:
+		logging.error(f'Cannot open "{index_p}" firmware index: {error}')
+	return None
@@ -15,22 +15,27 @@ import logging
 import subprocess
 
 from pathlib import Path
+from typing import Callable
 
 from .filesystem import check_files_if_exists
 
 
 def invoke_external_system_command(arguments: list[str], stdout_output: Path = None) -> int:
+	if stdout_output:
+		try:
+			with stdout_output.open(mode='w', encoding='utf-8') as f_o:
+				return invoke_external_system_command_stream(arguments, f_o.write)
+		except OSError as error:
+			logging.error(f'Cannot write "{stdout_output}" file: {error}')
+			return -1
+
 	command: str = ' '.join(arguments)
 
 	logging.info('Will execute external system command:')
 	logging.info(f'{command}')
 	logging.info('')
 
-	if stdout_output:
-		status = subprocess.run(arguments, stdout=subprocess.PIPE)
-		stdout_output.write_text(status.stdout.decode('utf-8'))
-	else:
-		status = subprocess.run(arguments)
+	status = subprocess.run(arguments)
 
 	result: int = status.returncode
 
@@ -40,6 +45,25 @@ def invoke_external_system_command(arguments: list[str], stdout_output: Path = N
 	return result
 
 
+def invoke_external_system_command_stream(arguments: list[str], consumer: Callable[[str], any]) -> int:
+	command: str = ' '.join(arguments)
+
+	logging.info('Will execute external system command with streaming output:')
+	logging.info(f'{command}')
+	logging.info('')
+
+	with subprocess.Popen(arguments, stdout=subprocess.PIPE, encoding='utf-8', errors='replace') as process:
+		for line in process.stdout:
+			consumer(line)
+
+	result: int = process.returncode
+
+	logging.info('Result:')
+	logging.info(f'{result}')
+
+	return result
+
+
 def invoke_custom_arguments(custom_flags: list[str] | None = None) -> list[str]:
 	if custom_flags is None:
 		custom_flags: list[str] = []
@@ -50,3 +74,9 @@ def invoke_external_command_res(p_in: list[Path], arguments: list[str], stdout_o
 	if check_files_if_exists(p_in):
 		return invoke_external_system_command(arguments, stdout_output) == 0
 	return False
+
+
+def invoke_external_command_stream(p_in: list[Path], arguments: list[str], consumer: Callable[[str], any]) -> bool:
+	if check_files_if_exists(p_in):
+		return invoke_external_system_command_stream(arguments, consumer) == 0
+	return False
@@ -0,0 +1,363 @@
+# forge/libbin.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import sys
+import mmap
+import struct
+import logging
+
+from abc import ABC
+from abc import abstractmethod
+from array import array
+from pathlib import Path
+from functools import cached_property
+
+from .hexer import int2hex
+from .constants import EP2_LIBRARY_MAGIC
+from .constants import EP2_STUB_ELF_IDENT
+from .constants import EP2_STUB_ELF_FLAGS
+from .constants import EP2_STUB_SECTION_NAMES
+from .filesystem import check_files_if_exists
+from .filesystem import check_files_extensions
+
+# Count of entries, then the string table offset and the address of every entry, the string table follows them.
+EP1_LIBRARY_HEADER: struct.Struct = struct.Struct('>I')
+EP1_LIBRARY_ENTRY: struct.Struct = struct.Struct('>II')
+
+# Magic, version, firmware, count of symbols, size and offset of the string table, count and offset of the constants.
+EP2_LIBRARY_HEADER: struct.Struct = struct.Struct('>I8s24sIIIII')
+
+# ELF header, section header, dynamic tag, symbol and program header of the EP2 "std.sa" stub library.
+ELF32_HEADER: struct.Struct = struct.Struct('>16sHHIIIIIHHHHHH')
+ELF32_SECTION_HEADER: struct.Struct = struct.Struct('>10I')
+ELF32_DYNAMIC_TAG: struct.Struct = struct.Struct('>II')
+ELF32_SYMBOL: struct.Struct = struct.Struct('>IIIBBH')
+ELF32_PROGRAM_HEADER: struct.Struct = struct.Struct('>8I')
+
+
+def unpack_big_endian_array(type_code: str, data: memoryview) -> array:
+	values: array = array(type_code)
+	values.frombytes(data[:len(data) - len(data) % values.itemsize])
+	if sys.byteorder == 'little':
+		values.byteswap()
+	return values
+
+
+def pack_big_endian_array(type_code: str, values: list[int]) -> bytes:
+	packed: array = array(type_code, values)
+	if sys.byteorder == 'little':
+		packed.byteswap()
+	return packed.tobytes()
+
+
+def pack_ep1_library(count: int, entries: list[int], names: list[bytes]) -> bytearray:
+	"""
+	Whole EP1 "elfloader.lib" file in one preallocated buffer, "entries" are flat pairs of the string table offset
+	and the address.
+	"""
+	size: int = EP1_LIBRARY_HEADER.size + len(entries) * 4
+	library: bytearray = bytearray(size + sum(len(name) + 1 for name in names))
+	EP1_LIBRARY_HEADER.pack_into(library, 0, count)
+	library[EP1_LIBRARY_HEADER.size:size] = pack_big_endian_array('I', entries)
+	for name in names:
+		library[size:size + len(name)] = name
+		size += len(name) + 1
+	return library
+
+
+def pack_ep2_library(
+	names: list[bytes], addresses: list[int], consts: list[tuple[int, int]], version: str, firmware: str
+) -> bytearray:
+	"""
+	Whole EP2 "library.bin" file as the "postlink" utility writes it, "consts" are pairs of the constant ID and value
+	sorted by ID. The "postlink" utility swaps the byte order only when there are constants, so a library without them
+	stays little-endian.
+	"""
+	byte_order: str = '>' if len(consts) > 0 else '<'
+	strtab: bytes = b''.join(name + b'\0' for name in names)
+	strtab_offset: int = EP2_LIBRARY_HEADER.size + len(names) * 8
+	consts_offset: int = strtab_offset + len(strtab)
+	library: bytearray = bytearray(consts_offset + len(consts) * 6)
+	struct.pack_into(
+		byte_order + EP2_LIBRARY_HEADER.format[1:], library, 0, EP2_LIBRARY_MAGIC, version.encode('ascii'),
+		firmware.encode('ascii'), len(names), len(strtab), strtab_offset, len(consts), consts_offset
+	)
+	entries: list[int] = []
+	name_offset: int = 0
+	for name, address in zip(names, addresses):
+		entries.extend((name_offset, address))
+		name_offset += len(name) + 1
+	struct.pack_into(f'{byte_order}{len(entries)}I', library, EP2_LIBRARY_HEADER.size, *entries)
+	library[strtab_offset:consts_offset] = strtab
+	if len(consts) > 0:
+		values_offset: int = consts_offset + len(consts) * 2
+		library[consts_offset:values_offset] = pack_big_endian_array('H', [index & 0xFFFF for index, _ in consts])
+		library[values_offset:] = pack_big_endian_array('I', [value for _, value in consts])
+	return library
+
+
+def pack_ep2_stub_library(names: list[bytes], addresses: list[int]) -> bytearray:
+	"""
+	EP2 "std.sa" stub library as the "postlink" utility writes it: big-endian ARM ELF32 shared object, which section
+	headers are followed by the ".dynamic", ".dynsym", ".dynstr" and ".shstrtab" sections, and then by program headers.
+	"""
+	strtab: bytes = b'\0' + b''.join(name + b'\0' for name in names)
+	dynamic: int = ELF32_HEADER.size + ELF32_SECTION_HEADER.size * 5
+	dynsym: int = dynamic + ELF32_DYNAMIC_TAG.size * 4
+	dynstr: int = dynsym + ELF32_SYMBOL.size * (len(names) + 1)
+	shstrtab: int = dynstr + len(strtab)
+	program: int = shstrtab + len(EP2_STUB_SECTION_NAMES)
+	library: bytearray = bytearray(program + ELF32_PROGRAM_HEADER.size * 2)
+
+	# ET_DYN, EM_ARM, EV_CURRENT, 2 program headers, 5 section headers and the ".shstrtab" section is the last.
+	ELF32_HEADER.pack_into(
+		library, 0, EP2_STUB_ELF_IDENT, 3, 40, 1, 0, program, ELF32_HEADER.size, EP2_STUB_ELF_FLAGS,
+		ELF32_HEADER.size, ELF32_PROGRAM_HEADER.size, 2, ELF32_SECTION_HEADER.size, 5, 4
+	)
+
+	# Name, type, flags, address, offset, size, link, info, alignment and entry size, the first section is null.
+	sections: list[tuple[int, ...]] = [
+		(1, 6, 0, 0, dynamic, dynsym - dynamic, 0, 0, 0, ELF32_DYNAMIC_TAG.size),
+		(10, 11, 0, 0, dynsym, dynstr - dynsym, 3, 0, 0, ELF32_SYMBOL.size),
+		(18, 3, 0, 0, dynstr, len(strtab), 0, 0, 0, 1),
+		(26, 3, 0, 0, shstrtab, len(EP2_STUB_SECTION_NAMES), 0, 0, 0, 1)
+	]
+	for index, section in enumerate(sections, 1):
+		ELF32_SECTION_HEADER.pack_into(library, ELF32_HEADER.size + index * ELF32_SECTION_HEADER.size, *section)
+
+	# DT_SYMTAB, DT_STRTAB, DT_STRSZ and DT_NULL tags.
+	for index, tag in enumerate([(6, dynsym), (5, dynstr), (10, len(strtab)), (0, 0)]):
+		ELF32_DYNAMIC_TAG.pack_into(library, dynamic + index * ELF32_DYNAMIC_TAG.size, *tag)
+
+	# Global functions of the ".dynstr" section, the first symbol is null.
+	offset: int = dynsym + ELF32_SYMBOL.size
+	name_offset: int = 1
+	for name, address in zip(names, addresses):
+		ELF32_SYMBOL.pack_into(library, offset, name_offset, address, 0, 0x12, 0, 3)
+		offset += ELF32_SYMBOL.size
+		name_offset += len(name) + 1
+	library[dynstr:shstrtab] = strtab
+	library[shstrtab:program] = EP2_STUB_SECTION_NAMES
+
+	# PT_DYNAMIC segment, the "postlink" utility defines the PF_R flag as 2.
+	ELF32_PROGRAM_HEADER.pack_into(
+		library, program + ELF32_PROGRAM_HEADER.size, 2, dynamic, 0, 0, dynsym - dynamic, 0, 2, 4
+	)
+	return library
+
+
+class LibraryView(ABC):
+	"""
+	Read-only memory-mapped library file, the common part of the EP1 "elfloader.lib" and EP2 "library.bin" readers.
+	Addresses are kept as an array of the stored 32-bit values, names are decoded only on request.
+	"""
+
+	def __init__(self, lib_p: Path, header_size: int) -> None:
+		self.path: Path = lib_p
+		self.file = lib_p.open(mode='rb')
+		try:
+			if lib_p.stat().st_size < header_size:
+				raise ValueError(f'file is smaller than {header_size} bytes header')
+			self.map: mmap.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+		except (OSError, ValueError):
+			self.file.close()
+			raise
+		self.data: memoryview = memoryview(self.map)
+		self.count: int = 0
+
+	def __enter__(self) -> 'LibraryView':
+		return self
+
+	def __exit__(self, *args) -> None:
+		self.close()
+
+	def __len__(self) -> int:
+		return self.count
+
+	def close(self) -> None:
+		self.data.release()
+		self.map.close()
+		self.file.close()
+
+	@property
+	@abstractmethod
+	def addresses(self) -> array:
+		pass
+
+	@abstractmethod
+	def raw_name(self, index: int) -> bytes:
+		pass
+
+	def name(self, index: int) -> str:
+		return self.raw_name(index).decode('ascii').strip()
+
+	@cached_property
+	def names(self) -> list[str]:
+		return [self.name(index) for index in range(len(self.addresses))]
+
+	def value(self, index: int) -> int:
+		return self.addresses[index]
+
+	def symbols(self) -> dict[bytes, int]:
+		# Raw names to comparable values, the first entry of the same name wins.
+		symbols: dict[bytes, int] = {}
+		for index in range(min(len(self.addresses), self.count)):
+			symbols.setdefault(self.raw_name(index).strip(), self.value(index))
+		return symbols
+
+
+class ElfloaderLibView(LibraryView):
+	"""
+	EP1 "elfloader.lib" file: count of entries, pairs of the string table offset and the address, and the string table.
+	Every name is resolved by its offset, so the string table is never split as a whole.
+	"""
+
+	def __init__(self, lib_p: Path, argonlv: bool = False) -> None:
+		super().__init__(lib_p, EP1_LIBRARY_HEADER.size)
+		self.count = EP1_LIBRARY_HEADER.unpack_from(self.data)[0]
+		self.data_shift: int = 0xC0000000 if argonlv else 0x30000000
+		self.strtab_offset: int = min(EP1_LIBRARY_HEADER.size + self.count * EP1_LIBRARY_ENTRY.size, len(self.data))
+
+	@cached_property
+	def entries(self) -> array:
+		return unpack_big_endian_array('I', self.data[EP1_LIBRARY_HEADER.size:self.strtab_offset])
+
+	@cached_property
+	def offsets(self) -> array:
+		return self.entries[0::2]
+
+	@cached_property
+	def addresses(self) -> array:
+		return self.entries[1::2]
+
+	def is_resolvable(self, index: int) -> bool:
+		return self.strtab_offset + self.offsets[index] < len(self.data)
+
+	def raw_name(self, index: int) -> bytes:
+		start: int = self.strtab_offset + self.offsets[index]
+		end: int = self.map.find(b'\0', start)
+		return self.map[start:end if end != -1 else len(self.map)]
+
+	def value(self, index: int) -> int:
+		# Data addresses are shifted by the library writer, this shift is removed to compare them with EP2 ones.
+		address: int = self.addresses[index]
+		return address - self.data_shift if (address != 0xFFFFFFFF) and (address > self.data_shift) else address
+
+
+class LibraryBinView(LibraryView):
+	"""
+	EP2 "library.bin" file, the header is decoded on opening and every table is decoded on the first access: numbers by
+	"array" byteswapping, names by one "bytes.split()" call since they follow the entries order.
+	"""
+
+	def __init__(self, lib_p: Path) -> None:
+		super().__init__(lib_p, EP2_LIBRARY_HEADER.size)
+		magic, version, firmware, self.count, self.strtab_size, self.strtab_offset, self.consts, self.consts_offset = \
+			EP2_LIBRARY_HEADER.unpack_from(self.data)
+		self.magic: int = magic
+		self.version: str = version.decode('ascii', errors='replace').strip('\0')
+		self.firmware: str = firmware.decode('ascii', errors='replace').strip('\0')
+		if self.magic != EP2_LIBRARY_MAGIC:
+			self.close()
+			raise ValueError(f'library magic "{int2hex(self.magic)}" should be "{int2hex(EP2_LIBRARY_MAGIC)}"')
+
+	@property
+	def header(self) -> dict[str, any]:
+		return {
+			'magic': int2hex(self.magic),
+			'version': self.version,
+			'firmware': self.firmware,
+			'symCnt': self.count,
+			'strTabSz': self.strtab_size,
+			'strTabOff': self.strtab_offset,
+			'constCnt': self.consts,
+			'constOff': self.consts_offset
+		}
+
+	@cached_property
+	def entries(self) -> array:
+		return unpack_big_endian_array('I', self.data[EP2_LIBRARY_HEADER.size:self.strtab_offset])
+
+	@cached_property
+	def indexes(self) -> array:
+		return self.entries[0::2]
+
+	@cached_property
+	def addresses(self) -> array:
+		return self.entries[1::2]
+
+	@cached_property
+	def raw_names(self) -> list[bytes]:
+		# Only NUL-terminated names are taken, the tail after the last NUL is not a complete name.
+		return bytes(self.data[self.strtab_offset:self.consts_offset]).split(b'\0')[:-1]
+
+	def raw_name(self, index: int) -> bytes:
+		return self.raw_names[index]
+
+	@cached_property
+	def names(self) -> list[str]:
+		return [name.decode('ascii').strip() for name in self.raw_names]
+
+	@cached_property
+	def const_indexes(self) -> array:
+		return unpack_big_endian_array('H', self.data[self.consts_offset:self.consts_offset + self.consts * 2])
+
+	@cached_property
+	def const_values(self) -> array:
+		offset: int = self.consts_offset + self.consts * 2
+		return unpack_big_endian_array('I', self.data[offset:offset + self.consts * 4])
+
+
+def diff_library_symbols(s_symbols: dict[bytes, int], c_symbols: dict[bytes, int]) -> tuple[list[bytes], list[bytes]]:
+	"""
+	Names of the compared library entries which are missed in the source library, and names which values differ.
+	"""
+	missed: list[bytes] = []
+	mismatched: list[bytes] = []
+	for name, value in c_symbols.items():
+		s_value: int | None = s_symbols.get(name)
+		if s_value is None:
+			missed.append(name)
+		elif s_value != value:
+			mismatched.append(name)
+	return missed, mismatched
+
+
+def open_library_bin(lib_p: Path) -> LibraryBinView | None:
+	if check_files_if_exists([lib_p]) and check_files_extensions([lib_p], ['bin']):
+		try:
+			library: LibraryBinView = LibraryBinView(lib_p)
+			logging.info('Library Header:')
+			for key, value in library.header.items():
+				logging.info(f'\t{key}={value}')
+			return library
+		except (OSError, ValueError) as error:
+			logging.error(f'Cannot open "{lib_p}" library: {error}')
+	return None
+
+
+def open_elfloader_lib(lib_p: Path, argonlv: bool = False) -> ElfloaderLibView | None:
+	if check_files_if_exists([lib_p]) and check_files_extensions([lib_p], ['lib']):
+		try:
+			library: ElfloaderLibView = ElfloaderLibView(lib_p, argonlv)
+			logging.info(f'Library entries count: {len(library)}')
+			return library
+		except (OSError, ValueError) as error:
+			logging.error(f'Cannot open "{lib_p}" library: {error}')
+	return None
+
+
+def open_library_view(lib_p: Path, argonlv: bool = False) -> LibraryView | None:
+	if check_files_extensions([lib_p], ['lib'], False):
+		return open_elfloader_lib(lib_p, argonlv)
+	return open_library_bin(lib_p)
@@ -12,39 +12,50 @@ Version: 1.0
 """
 
 import re
+import time
 import logging
 
+from array import array
+from typing import Callable
+from typing import Iterator
+from typing import Sequence
 from pathlib import Path
 from datetime import datetime
 from argparse import Namespace
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
 
 from .constants import P2K_DIR_LIB
 from .constants import P2K_EP2_NMS_DEF
 from .constants import P2K_EP2_API_DEF
 from .constants import P2K_SDK_CONSTS_H
-from .constants import P2K_TOOL_POSTLINK
-from .constants import P2K_DIR_TOOL_KITCHEN
 from .constants import P2K_ARGON_PHONES
 from .hexer import int2hex
-from .hexer import hex2int
-from .hexer import hex2hex
 from .types import LibraryModel
-from .types import NamesDefs
+from .types import SymbolTable
+from .types import DefinitionsRegistry
+from .types import RegeneratorResult
 from .filesystem import check_files_if_exists
 from .filesystem import check_files_extensions
 from .filesystem import get_all_directories_in_directory
-from .filesystem import get_temporary_directory_path
-from .filesystem import move_file
-from .filesystem import compare_paths
-from .filesystem import delete_file
 from .firmware import parse_phone_firmware
 from .symbols import validate_sym_file
 from .symbols import replace_syms
-from .symbols import split_and_validate_line
 from .symbols import dump_sym_file_to_library_model
 from .symbols import dump_library_model_to_sym_file
-from .symbols import parse_sdk_const_header_to_list
-from .invoker import invoke_external_command_res
+from .symbols import load_definitions
+from .symcache import SymbolCache
+from .symcache import open_symbol_cache
+from .libbin import LibraryBinView
+from .libbin import ElfloaderLibView
+from .libbin import open_elfloader_lib
+from .libbin import open_library_bin
+from .libbin import pack_ep1_library
+from .libbin import pack_ep2_library
+from .libbin import pack_ep2_stub_library
+from .writer import write_lines_to_file
+from .utilities import ErrorCollector
+from .utilities import set_worker_logging_configuration
 from .types import ElfPack
 from .types import LibrarySort
 
@@ -69,7 +80,7 @@ def ep1_normalize_address(address: int, argonlv: bool) -> tuple[str, int]:
 
 def ep1_libgen_model_sort(model: LibraryModel, sort: LibrarySort) -> LibraryModel:
 	if sort != LibrarySort.NONE:
-		return sorted(model, key=lambda x: x[sort.value].lower())
+		return SymbolTable(model).sorted(sort).to_model()
 	return model
 
 
@@ -78,11 +89,7 @@ def ep1_libgen_model(p_sym_lib: Path, sort: LibrarySort) -> tuple[str, LibraryMo
 		model: LibraryModel = dump_sym_file_to_library_model(p_sym_lib)
 		if model is not None:
 			model = ep1_libgen_model_sort(model, sort)
-			entries: str = ''
-			for address, mode, name in model:
-				logging.debug(f'{name} {mode} {address}')
-				entries += ' ' + name
-			entries += ' '
+			entries: str = ' ' + ' '.join(name for address, mode, name in model) + ' '
 			if len(model) > 0 and len(entries.strip()) > 0:
 				return entries, model
 	return None
@@ -92,37 +99,40 @@ def ep1_libgen_library(p_bin_lib: Path, model: LibraryModel, functions: str, arg
 	entry_count: int = len(model)
 	data_shift: int = 0xC0000000 if argonlv else 0x30000000
 	if entry_count > 0:
-		with p_bin_lib.open(mode='wb') as f_o:
-			f_o.write(entry_count.to_bytes(4, byteorder='big'))
-
-			for address, mode, name in model:
-				offset: int = functions.find(' ' + name + ' ')
-				if offset != -1:
-					address_int: int = int(address, 16)
-					if mode == 'T':
-						address_int += 0x00000001
-					elif mode == 'D':
-						address_int += data_shift
-					f_o.write(offset.to_bytes(4, byteorder='big'))
-					try:
-						address_value_to_write = address_int.to_bytes(4, byteorder='big')
-					except OverflowError:
-						raw_address_int: int = 0xFFFFFFFF
-						logging.warning(f'32-bit int overflow on "{address} {mode} {name}" line.')
-						logging.warning(f'Overflowed value: {int2hex(address_int)}')
-						logging.warning(f'Will write default value: {int2hex(raw_address_int)}')
-						address_value_to_write = raw_address_int.to_bytes(4, byteorder='big')
-					f_o.write(address_value_to_write)
-				else:
-					logging.error(f'Function "{address_int} {mode} {name}" not found in the library model.')
-
-			for func in functions.split(' '):
-				func: str = func.strip()
-				if len(func) > 0:
-					f_o.write(func.encode('utf-8'))
-					f_o.write(0x00.to_bytes(1, byteorder='big'))
+		# String table is laid out in one pass, an offset of the first occurrence of a name is used for the entries.
+		names: list[bytes] = []
+		offsets: dict[str, int] = {}
+		offset: int = 0
+		for func in functions.split(' '):
+			func: str = func.strip()
+			if len(func) > 0:
+				encoded: bytes = func.encode('utf-8')
+				names.append(encoded)
+				offsets.setdefault(func, offset)
+				offset += len(encoded) + 1
+
+		entries: list[int] = []
+		for address, mode, name in model:
+			name_offset: int | None = offsets.get(name)
+			if name_offset is not None:
+				address_int: int = int(address, 16)
+				if mode == 'T':
+					address_int += 0x00000001
+				elif mode == 'D':
+					address_int += data_shift
+				if address_int > 0xFFFFFFFF:
+					raw_address_int: int = 0xFFFFFFFF
+					logging.warning(f'32-bit int overflow on "{address} {mode} {name}" line.')
+					logging.warning(f'Overflowed value: {int2hex(address_int)}')
+					logging.warning(f'Will write default value: {int2hex(raw_address_int)}')
+					address_int = raw_address_int
+				entries.extend((name_offset, address_int))
+			else:
+				logging.error(f'Function "{address} {mode} {name}" not found in the library model.')
 
-			return True
+		with p_bin_lib.open(mode='wb') as f_o:
+			f_o.write(pack_ep1_library(entry_count, entries, names))
+		return True
 	else:
 		logging.error('Library model is empty.')
 	return False
@@ -294,25 +304,21 @@ Lib:
 
 
 def ep1_libgen_symbols(p_lib: Path, p_sym: Path, sort: LibrarySort, phone: str, fw: str) -> bool:
-	if check_files_if_exists([p_lib]):
-		with (p_lib.open(mode='rb') as f_i):
-			cnt: int = int.from_bytes(f_i.read(4), byteorder='big')
-			logging.info(f'Library entries count: {cnt}')
-			ent: list[tuple[int, int]] = []
-			for i in range(0, cnt):
-				ent.append((int.from_bytes(f_i.read(4), byteorder='big'), int.from_bytes(f_i.read(4), byteorder='big')))
-			data: bytes = f_i.read()
-			ent_names: list[str] = [symbols.decode('ascii') for symbols in data.split(b'\x00') if symbols]
-			len_e: int = len(ent)
-			len_n: int = len(ent_names)
+	argonlv: bool = phone in P2K_ARGON_PHONES
+	library: ElfloaderLibView | None = open_elfloader_lib(p_lib, argonlv)
+	if library is not None:
+		with library:
+			cnt: int = len(library)
+			len_e: int = len(library.addresses)
+			len_n: int = sum(map(library.is_resolvable, range(len_e)))
 			logging.info(f'Library entries addresses: {len_e}')
 			logging.info(f'Library entries names: {len_n}')
 			if cnt == len_e == len_n:
 				logging.info(f'Library is valid, "cnt={cnt}", "len_e={len_e}", "len_n={len_n}" are equal.')
 				model: LibraryModel = []
-				for i in range(0, cnt):
-					mode, address = ep1_normalize_address(ent[i][1], phone in P2K_ARGON_PHONES)  # Second is address.
-					entry: tuple[str, str, str] = (int2hex(address), mode, ent_names[i])
+				for index, raw_address in enumerate(library.addresses):
+					mode, address = ep1_normalize_address(raw_address, argonlv)
+					entry: tuple[str, str, str] = (int2hex(address), mode, library.name(index))
 					if address == 0xFFFFFFFF:
 						logging.warning(f'Overflowed value on "{entry}" entry.')
 					model.append(entry)
@@ -328,14 +334,10 @@ def ep1_libgen_symbols(p_lib: Path, p_sym: Path, sort: LibrarySort, phone: str,
 
 def ep2_libgen_model_sort(model: LibraryModel, sort: LibrarySort) -> LibraryModel:
 	if sort != LibrarySort.NONE:
-		first_modes: set[str] = {'C'}
-
-		def custom_sorting_function(entry: tuple[str, str, str]) -> tuple[int, str]:
-			address, mode, name = entry
-			priority: int = 0 if mode in first_modes else 1
-			return priority, entry[sort.value].lower()
-
-		return sorted(model, key=custom_sorting_function)
+		table: SymbolTable = SymbolTable(model)
+		first_mode: int = ord('C')
+		view: list[int] = sorted(table.sort_view(sort), key=lambda index: table.modes[index] != first_mode)
+		return table.select(view).to_model()
 	return model
 
 
@@ -347,6 +349,27 @@ def ep2_libgen_model(p_sym_lib: Path, sort: LibrarySort) -> LibraryModel | None:
 	return None
 
 
+def ep2_libgen_api_names(p_def: Path = P2K_EP2_API_DEF) -> list[bytes]:
+	# Every non-empty line of the "ElfLoaderAPI2.def" file is a name of the ElfPack v2.0 API function.
+	return [name for name in p_def.read_bytes().replace(b'\r', b'\n').split(b'\n') if len(name) > 0]
+
+
+def ep2_libgen_consts(model: LibraryModel) -> list[tuple[int, int]] | None:
+	definitions: DefinitionsRegistry | None = load_definitions(P2K_SDK_CONSTS_H)
+	if definitions is None:
+		return None
+	consts: list[tuple[int, int]] = []
+	for address, mode, name in model:
+		if mode == 'C':
+			index: int | None = definitions.const_index(name)
+			if index is None:
+				logging.error(f'Constant ID "{name}" is undefined, assuming zero.')
+				index = 0
+			consts.append((index, int(address, 16)))
+	consts.sort(key=lambda const: const[0])
+	return consts
+
+
 def ep2_libgen_library(p_sym: Path, sort: LibrarySort, phone: str, firmware: str, p_out: Path) -> bool:
 	is_library_sa: bool = check_files_extensions([p_out], ['sa'], False)
 	is_library_bin: bool = check_files_extensions([p_out], ['bin'], False)
@@ -354,123 +377,82 @@ def ep2_libgen_library(p_sym: Path, sort: LibrarySort, phone: str, firmware: str
 		logging.error(f'Unknown library type "{p_out}", should be "*.sa" or "*.bin" extension.')
 		return False
 
-	if check_files_if_exists([p_sym, P2K_SDK_CONSTS_H, P2K_EP2_API_DEF, P2K_TOOL_POSTLINK]):
+	if check_files_if_exists([p_sym, P2K_SDK_CONSTS_H, P2K_EP2_API_DEF]) and validate_sym_file(p_sym):
 		model: LibraryModel = ep2_libgen_model(p_sym, sort)
-		if model is not None:
-			result: bool = False
-			sorted_sym_file: Path = get_temporary_directory_path() / 'Sorted.sym'
-			phone_bin_library: Path = P2K_DIR_TOOL_KITCHEN / 'std.lib'
-			sdk_stub_sa_library: Path = P2K_DIR_TOOL_KITCHEN / 'std.sa'
-			version: str = libgen_version()
-			if dump_library_model_to_sym_file(model, sorted_sym_file, phone, firmware, 'EP2', version):
-				if validate_sym_file(sorted_sym_file):
-					args: list[str] = [
-						str(P2K_TOOL_POSTLINK),
-						'-stdlib', str(sorted_sym_file),
-						'-def', str(P2K_EP2_API_DEF),
-						'-fw', firmware,
-						'-v', version,
-						'-header', str(P2K_SDK_CONSTS_H)
-					]
-					result = invoke_external_command_res([sorted_sym_file], args)
-					if result and check_files_if_exists([phone_bin_library, sdk_stub_sa_library]):
-						if is_library_bin:
-							move_file(phone_bin_library, p_out, False)
-						else:
-							move_file(sdk_stub_sa_library, p_out, False)
-					else:
-						logging.error(f'Cannot create "{phone_bin_library}" and "{sdk_stub_sa_library}" libraries.')
-			delete_file(sorted_sym_file, False)
-			delete_file(phone_bin_library, False)
-			if not compare_paths(sdk_stub_sa_library, p_out):
-				delete_file(sdk_stub_sa_library, False)
-			return result
-	return False
-
-
-def ep2_libgen_header(p_lib: Path) -> tuple[dict[str, any], int] | None:
-	if check_files_if_exists([p_lib]) and check_files_extensions([p_lib], ['bin']):
-		header: dict[str, any] = {}
-		magic: int = 0x7F4C4942
-		with p_lib.open(mode='rb') as f_i:
-			header['magic'] = int2hex(int.from_bytes(f_i.read(4), byteorder='big'))      # sizeof(uint32_t)
-			header['version'] = f_i.read(1 * 8).decode('ascii').strip('\0')              # sizeof(char) * 8
-			header['firmware'] = f_i.read(1 * 24).decode('ascii').strip('\0')            # sizeof(char) * 24
-			header['symCnt'] = int.from_bytes(f_i.read(4), byteorder='big')              # sizeof(uint32_t)
-			header['strTabSz'] = int.from_bytes(f_i.read(4), byteorder='big')            # sizeof(uint32_t)
-			header['strTabOff'] = int.from_bytes(f_i.read(4), byteorder='big')           # sizeof(uint32_t)
-			header['constCnt'] = int.from_bytes(f_i.read(4), byteorder='big')            # sizeof(uint32_t)
-			header['constOff'] = int.from_bytes(f_i.read(4), byteorder='big')            # sizeof(uint32_t)
-
-			logging.info('Library Header:')
-			for k, v in header.items():
-				logging.info(f'\t{k}={v}')
-
-			lib_magic: int = hex2int(header.get('magic'))
-			if lib_magic != magic:
-				logging.error(f'Library magic "{int2hex(lib_magic)}" should be "{magic}".')
+		if (model is None) or (len(model) == 0):
+			logging.error(f'Library model of "{p_sym}" is empty.')
+			return False
+		logging.info(f'Library "{p_out}" is for "{phone}" phone on "{firmware}" firmware.')
+		names: list[bytes] = []
+		addresses: list[int] = []
+		for address, mode, name in model:
+			if mode in ('A', 'D', 'T'):
+				names.append(name.encode('utf-8'))
+				addresses.append((int(address, 16) + (mode == 'T')) & 0xFFFFFFFF)
+		try:
+			if is_library_bin:
+				consts: list[tuple[int, int]] | None = ep2_libgen_consts(model)
+				if consts is None:
+					return False
+				library: bytearray = pack_ep2_library(names, addresses, consts, libgen_version(), firmware)
 			else:
-				return header, f_i.tell()
-	return None
+				api_names: list[bytes] = ep2_libgen_api_names()
+				library: bytearray = pack_ep2_stub_library(names + api_names, addresses + [1] * len(api_names))
+			with p_out.open(mode='wb') as f_o:
+				f_o.write(library)
+			return True
+		except (OSError, ValueError) as error:
+			logging.error(f'Cannot write "{p_out}" library: {error}')
+	return False
 
 
-def ep2_libgen_names_defines(a_mode: str) -> NamesDefs | None:
-	names_def: Path = P2K_EP2_NMS_DEF
-	if check_files_if_exists([names_def]) and check_files_extensions([names_def], ['def']):
-		list_names_def: NamesDefs = {}
-		with names_def.open(mode='r') as f_i:
-			for line in f_i.read().splitlines():
-				addr, mode, name = split_and_validate_line(line)
-				if (addr is not None) and (mode is not None) and (name is not None):
-					if mode == a_mode:
-						list_names_def[name] = addr
-			if len(list_names_def) > 0:
-				return list_names_def
-	return None
+def ep2_libgen_names_defines() -> DefinitionsRegistry | None:
+	return load_definitions(P2K_EP2_NMS_DEF)
 
 
-def ep2_libgen_entries(list_ia: list[tuple[int, int]], list_na: list[str], resolve_names: bool) -> LibraryModel | None:
-	len_ia: int = len(list_ia)
+def ep2_libgen_entries(list_a: Sequence[int], list_na: list[str], resolve_names: bool) -> LibraryModel | None:
+	len_a: int = len(list_a)
 	len_na: int = len(list_na)
-	if len_ia == len_na:
-		names: NamesDefs = {}
+	if len_a == len_na:
+		data_names: set[str] = set()
 		chunk_model: LibraryModel = []
 		if resolve_names:
-			names = ep2_libgen_names_defines('D')
-		for i in range(0, len_ia, 1):
-			address: int = list_ia[i][1]
+			names: DefinitionsRegistry | None = ep2_libgen_names_defines()
+			if names is None:
+				return None
+			data_names = names.data_names
+		for i in range(0, len_a, 1):
+			address: int = list_a[i]
 			mode: str = 'A'
 			name: str = list_na[i]
 			if address % 2 != 0:
 				mode = 'T'
 				address -= 1
-			if resolve_names:
-				for data_name, data_address in names.items():
-					if name == data_name:
-						mode = 'D'
-						break
+			if name in data_names:
+				mode = 'D'
 			chunk_model.append((int2hex(address), mode, name))
 		return chunk_model
 	return None
 
 
-def ep2_libgen_const_entries(list_ci: list[int], list_cv: list[int], resolve_names: bool) -> LibraryModel | None:
+def ep2_libgen_const_entries(
+	list_ci: Sequence[int], list_cv: Sequence[int], resolve_names: bool
+) -> LibraryModel | None:
 	len_ci: int = len(list_ci)
 	len_cv: int = len(list_cv)
 	if len_ci == len_cv:
-		names: NamesDefs = {}
+		names: DefinitionsRegistry | None = None
 		chunk_model: LibraryModel = []
 		if resolve_names:
-			names = ep2_libgen_names_defines('C')
+			names = ep2_libgen_names_defines()
+			if names is None:
+				return None
 		for i in range(0, len_ci, 1):
 			c_index: int = list_ci[i]
 			c_value: int = list_cv[i]
 			name: str = 'WARNING_WARNING_WARNING_UNKNOWN_CONST_NAME_INDEX_' + int2hex(c_index)
-			if resolve_names:
-				for const_name, const_index in names.items():
-					if hex2int(hex2hex(const_index, 4), 4) == c_index:
-						name = const_name
-						break
+			if names is not None:
+				name = names.const_name(c_index) or name
 			else:
 				name += int2hex(c_index, 4)
 			chunk_model.append((int2hex(c_value), 'C', name))
@@ -489,78 +471,49 @@ def ep2_libgen_combine_model_chunks(list_models: list[LibraryModel]) -> LibraryM
 
 
 def ep2_libgen_symbols(p_lib: Path, p_sym: Path, phone: str, sort: LibrarySort, resolve_names: bool) -> bool:
-	if check_files_if_exists([p_lib]) and check_files_extensions([p_lib], ['bin']):
-		header, header_offset = ep2_libgen_header(p_lib)
-		if header is not None:
-			with p_lib.open(mode='rb') as f_i:
-				entries_index_address: list[tuple[int, int]] = []
-				entries_name: list[str] = []
-				entries_const_index: list[int] = []
-				entries_const_value: list[int] = []
-
-				f_i.seek(header_offset)
-
-				# Indexes and addresses.
-				for i in range(header_offset, header['strTabOff'], 4 * 2):
-					index: int = int.from_bytes(f_i.read(4), 'big')
-					address: int = int.from_bytes(f_i.read(4), 'big')
-					logging.debug(f'Library entry index and address: "{int2hex(index)} {int2hex(address)}".')
-					entries_index_address.append((index, address))
-				logging.info(f'Found {len(entries_index_address)} indexes and addresses.')
-
-				# Entries names.
-				name_entry: str = ''
-				name_count: int = 0
-				for i in range(header['strTabOff'], header['constOff'], 1):
-					ch = f_i.read(1)
-					if ch != b'\x00':
-						name_entry += ch.decode('ascii')
-					else:
-						name_entry = name_entry.strip()
-						logging.debug(f'Library entry name "{name_entry}".')
-						entries_name.append(name_entry)
-						name_count += 1
-						name_entry = ''
-				logging.info(f'Found {len(entries_name)} names.')
-
-				# Validation #1.
-				sc_1: int = header.get('symCnt')
-				sc_2: int = len(entries_index_address)
-				sc_3: int = len(entries_name)
-				sc_4: int = name_count
-				if not (sc_1 == sc_2 == sc_3 == sc_4):
-					logging.error(f'Wrong size of index/address/name arrays: "{sc_1}", "{sc_2}", "{sc_3}", "{sc_4}".')
-					return False
+	library: LibraryBinView | None = open_library_bin(p_lib)
+	if library is not None:
+		with library:
+			# Indexes and addresses, entries names.
+			addresses: array = library.addresses
+			names: list[str] = library.names
+			logging.info(f'Found {len(addresses)} indexes and addresses.')
+			logging.info(f'Found {len(names)} names.')
+
+			# Validation #1.
+			sc_1: int = library.count
+			sc_2: int = len(library.indexes)
+			sc_3: int = len(addresses)
+			sc_4: int = len(names)
+			if not (sc_1 == sc_2 == sc_3 == sc_4):
+				logging.error(f'Wrong size of index/address/name arrays: "{sc_1}", "{sc_2}", "{sc_3}", "{sc_4}".')
+				return False
 
-				# Constants.
-				for i in range(0, header.get('constCnt'), 1):
-					index: int = int.from_bytes(f_i.read(2), 'big')  # sizeof(uint16_t)
-					logging.debug(f'Library const index "{int2hex(index)}".')
-					entries_const_index.append(index)
-				logging.info(f'Found {len(entries_const_index)} const indexes.')
-				for i in range(0, header.get('constCnt'), 1):
-					value: int = int.from_bytes(f_i.read(4), 'big')  # sizeof(uint32_t)
-					logging.debug(f'Library const value "{int2hex(value)}".')
-					entries_const_value.append(value)
-				logging.info(f'Found {len(entries_const_value)} const values.')
-
-				# Validation #2.
-				sc_6: int = header.get('constCnt')
-				sc_7: int = len(entries_const_index)
-				sc_8: int = len(entries_const_value)
-				if not (sc_6 == sc_7 == sc_8):
-					logging.error(f'Wrong size of const_index/const_values arrays: "{sc_6}", "{sc_7}", "{sc_8}".')
-					return False
+			# Constants.
+			const_indexes: array = library.const_indexes
+			const_values: array = library.const_values
+			logging.info(f'Found {len(const_indexes)} const indexes.')
+			logging.info(f'Found {len(const_values)} const values.')
+
+			# Validation #2.
+			sc_6: int = library.consts
+			sc_7: int = len(const_indexes)
+			sc_8: int = len(const_values)
+			if not (sc_6 == sc_7 == sc_8):
+				logging.error(f'Wrong size of const_index/const_values arrays: "{sc_6}", "{sc_7}", "{sc_8}".')
+				return False
 
-				# Resolve real entries names and sort model.
-				chk_n: LibraryModel = ep2_libgen_entries(entries_index_address, entries_name, resolve_names)
-				chk_c: LibraryModel = ep2_libgen_const_entries(entries_const_index, entries_const_value, resolve_names)
-				model: LibraryModel = ep2_libgen_combine_model_chunks([chk_n, chk_c])
-				model = ep2_libgen_model_sort(model, sort)
+			# Resolve real entries names and sort model.
+			chk_n: LibraryModel | None = ep2_libgen_entries(addresses, names, resolve_names)
+			chk_c: LibraryModel | None = ep2_libgen_const_entries(const_indexes, const_values, resolve_names)
+			if (chk_n is None) or (chk_c is None):
+				return False
+			model: LibraryModel = ep2_libgen_combine_model_chunks([chk_n, chk_c])
+			model = ep2_libgen_model_sort(model, sort)
 
-				# Save model to symbols file.
-				if dump_library_model_to_sym_file(model, p_sym, phone, header['firmware'], 'EP2', header['version']):
-					return validate_sym_file(p_sym)
+			# Save model to symbols file.
+			if dump_library_model_to_sym_file(model, p_sym, phone, library.firmware, 'EP2', library.version):
+				return validate_sym_file(p_sym)
 	return False
 
 
@@ -576,19 +529,14 @@ def ep2_libgen_generate_names_defines(sort: LibrarySort, out_p: Path) -> bool:
 		library_models: list[tuple[Path, LibraryModel]] = []
 		unique_data_names: set[str] = set()
 		const_names: list[tuple[Path, str]] = []
-		directories: list[Path] = get_all_directories_in_directory(P2K_DIR_LIB, True)
-		if directories is not None:
-			for directory in directories:
-				ep1_sym_file: Path = directory / 'elfloader.sym'
-				ep2_sym_file: Path = directory / 'library.sym'
-				ep1_model: LibraryModel = dump_sym_file_to_library_model(ep1_sym_file, True)
-				if ep1_model is not None:
-					logging.info(f'Will add "{ep1_sym_file}" to library models list.')
-					library_models.append((ep1_sym_file, ep1_model))
-				ep2_model: LibraryModel = dump_sym_file_to_library_model(ep2_sym_file, True)
-				if ep2_model is not None:
-					logging.info(f'Will add "{ep2_sym_file}" to library models list.')
-					library_models.append((ep2_sym_file, ep2_model))
+		cache: SymbolCache | None = open_symbol_cache(P2K_DIR_LIB)
+		if cache is not None:
+			with cache:
+				for path in cache.paths():
+					sym_file: Path = P2K_DIR_LIB / path
+					if sym_file.name in ('elfloader.sym', 'library.sym') and cache.is_valid(path):
+						logging.info(f'Will add "{sym_file}" to library models list.')
+						library_models.append((sym_file, cache.model(path)))
 		for path, model in library_models:
 			for address, mode, name in model:
 				if mode == 'C':
@@ -600,86 +548,145 @@ def ep2_libgen_generate_names_defines(sort: LibrarySort, out_p: Path) -> bool:
 		for data_name in unique_data_names:
 			names_def_model.append(('0xFFFFFFFF', 'D', data_name))
 
-		const_header_names_indexes: list[tuple[str, str]] = parse_sdk_const_header_to_list(P2K_SDK_CONSTS_H)
+		consts: DefinitionsRegistry | None = load_definitions(P2K_SDK_CONSTS_H)
+		if consts is None:
+			return False
 		# Validation.
 		for path, name in const_names:
-			contains: bool = False
-			for const_name, const_index in const_header_names_indexes:
-				if const_name.strip() == name.strip():
-					contains = True
-					break
-			if not contains:
+			if consts.const_index(name) is None:
 				logging.error(f'Unknown const value: "{name}" in "{path}" symbols file')
 				return False
 
-		for const_name, const_index in const_header_names_indexes:
-			const_name: str = const_name.strip()
-			const_index: str = int2hex(hex2int(const_index, 4))
-			names_def_model.append((const_index, 'C', const_name))
+		for const_name, const_index in consts.const_indexes.items():
+			names_def_model.append((int2hex(const_index), 'C', const_name))
 
 		names_def_model = ep2_libgen_model_sort(names_def_model, sort)
 		if names_def_model is not None:
 			try:
-				with out_p.open(mode='w', newline='\r\n') as f_o:
-					for addr, mode, name in names_def_model:
-						line: str = f'{addr} {mode} {name}'
-						f_o.write(line + '\n')
-						logging.debug(line)
-					return True
+				write_lines_to_file(out_p, [], (f'{addr} {mode} {name}' for addr, mode, name in names_def_model), True)
+				return True
 			except OSError as error:
 				logging.error(f'Cannot write "{out_p}" names defines file, error: {error}')
 	return False
 
 
-def libgen_regenerator(sort: LibrarySort, e: ElfPack) -> bool:
-	directories: list[Path] = get_all_directories_in_directory(P2K_DIR_LIB, True)
-	if directories is not None:
-		for directory in directories:
-			if e == ElfPack.EP1:
-				sym_file: Path = directory / 'elfloader.sym'
-				lib_file: Path = directory / 'elfloader.lib'
-			elif e == ElfPack.EP2:
-				sym_file: Path = directory / 'library.sym'
-				lib_file: Path = directory / 'library.bin'
-			else:
-				logging.error('Unknown ElfPack version.')
-				return False
+def libgen_regenerate_directory(directory: Path, sort: LibrarySort, e: ElfPack) -> bool:
+	if e == ElfPack.EP1:
+		sym_file: Path = directory / 'elfloader.sym'
+		lib_file: Path = directory / 'elfloader.lib'
+	else:
+		sym_file: Path = directory / 'library.sym'
+		lib_file: Path = directory / 'library.bin'
+
+	# Drop all "_testX", "_testXX" slugs from name.
+	pfw_chunk: str = re.sub(r'_test\d+', '', directory.name)
+	phone, firmware = parse_phone_firmware(pfw_chunk, False)
 
-			# Drop all "_testX", "_testXX" slugs from name.
-			pfw_chunk: str = re.sub(r'_test\d+', '', directory.name)
-			phone, firmware = parse_phone_firmware(pfw_chunk, False)
-
-			# Create Libraries.
-			if check_files_if_exists([sym_file], False):
-				if validate_sym_file(sym_file):
-					logging.info(f'Will create "{lib_file}" library from "{sym_file}" symbols file.')
-					if e == ElfPack.EP1:
-						functions, library_model = ep1_libgen_model(sym_file, sort)
-						if functions and library_model:
-							if not ep1_libgen_library(lib_file, library_model, functions, phone in P2K_ARGON_PHONES):
-								return False
-						else:
-							return False
-					elif e == ElfPack.EP2:
-						if not ep2_libgen_library(sym_file, sort, phone, firmware, lib_file):
-							return False
+	# Create Libraries.
+	if check_files_if_exists([sym_file], False):
+		if validate_sym_file(sym_file):
+			logging.info(f'Will create "{lib_file}" library from "{sym_file}" symbols file.')
+			if e == ElfPack.EP1:
+				functions, library_model = ep1_libgen_model(sym_file, sort)
+				if functions and library_model:
+					if not ep1_libgen_library(lib_file, library_model, functions, phone in P2K_ARGON_PHONES):
+						return False
 				else:
-					logging.error(f'Cannot open and check "{sym_file}" symbols file.')
+					logging.error(f'Library model of "{sym_file}" is empty.')
 					return False
+			elif not ep2_libgen_library(sym_file, sort, phone, firmware, lib_file):
+				return False
+		else:
+			logging.error(f'Cannot open and check "{sym_file}" symbols file.')
+			return False
 
-			# Create Symbols files.
-			if check_files_if_exists([lib_file], False):
-				logging.info(f'Will create "{sym_file}" symbols file from "{lib_file}" library.')
-				if e == ElfPack.EP1:
-					if not ep1_libgen_symbols(lib_file, sym_file, sort, phone, firmware):
-						return False
-				elif e == ElfPack.EP2:
-					if not ep2_libgen_symbols(lib_file, sym_file, phone, sort, True):
-						return False
-		return True
+	# Create Symbols files.
+	if check_files_if_exists([lib_file], False):
+		logging.info(f'Will create "{sym_file}" symbols file from "{lib_file}" library.')
+		if e == ElfPack.EP1:
+			return ep1_libgen_symbols(lib_file, sym_file, sort, phone, firmware)
+		return ep2_libgen_symbols(lib_file, sym_file, phone, sort, True)
+	return True
+
+
+def libgen_resort_directory(directory: Path, sort: LibrarySort, e: ElfPack) -> bool:
+	sym_file: Path = directory / ('elfloader.sym' if e == ElfPack.EP1 else 'library.sym')
+
+	# Drop all "_testX", "_testXX" slugs from name.
+	pfw_chunk: str = re.sub(r'_test\d+', '', directory.name)
+	phone, firmware = parse_phone_firmware(pfw_chunk, False)
+	version: str = libgen_version()
+
+	# Resort Symbols files.
+	if check_files_if_exists([sym_file], False):
+		logging.info(f'Will resort "{sym_file}" symbols file.')
+		if e == ElfPack.EP1:
+			functions, library_model = ep1_libgen_model(sym_file, sort)
+		else:
+			library_model: LibraryModel = ep2_libgen_model(sym_file, sort)
+
+		if library_model:
+			if not dump_library_model_to_sym_file(library_model, sym_file, phone, firmware, e.name, version):
+				return False
+
+		return validate_sym_file(sym_file)
+	return True
+
+
+def libgen_directory_worker(
+	task: Callable[[Path, LibrarySort, ElfPack], bool], directory: Path, sort: LibrarySort, e: ElfPack
+) -> RegeneratorResult:
+	"""
+	Run the task on one "res/<phone_fw>" directory in a worker process, the first logged error is kept as a reason.
+	"""
+	start: float = time.perf_counter()
+	with ErrorCollector() as errors:
+		try:
+			success: bool = task(directory, sort, e)
+		except Exception as error:  # One broken directory should not abort the others.
+			logging.error(f'Cannot process "{directory}" directory: {error}')
+			success: bool = False
+	error: str = '' if success else next(iter(errors.messages), 'Unknown error.')
+	return RegeneratorResult(directory.name, time.perf_counter() - start, success, error)
+
+
+def libgen_process_directories(
+	task: Callable[[Path, LibrarySort, ElfPack], bool], sort: LibrarySort, e: ElfPack
+) -> bool:
+	if e not in (ElfPack.EP1, ElfPack.EP2):
+		logging.error(f'Unknown ElfPack version: "{e.name}".')
+		return False
+	directories: list[Path] = get_all_directories_in_directory(P2K_DIR_LIB, True)
+	if directories is not None:
+		start: float = time.perf_counter()
+		level: int = logging.getLogger().getEffectiveLevel()
+		with ProcessPoolExecutor(initializer=set_worker_logging_configuration, initargs=(level,)) as executor:
+			results: list[Future] = [
+				executor.submit(libgen_directory_worker, task, directory, sort, e) for directory in directories
+			]
+			summary: list[RegeneratorResult] = [result.result() for result in results]
+		return log_regenerator_summary(summary, time.perf_counter() - start)
 	return False
 
 
+def log_regenerator_summary(summary: list[RegeneratorResult], seconds: float) -> bool:
+	width: int = max((len(result.directory) for result in summary), default=0)
+	failed: int = 0
+	logging.info('Summary:')
+	for result in summary:
+		if result.success:
+			logging.info(f'\t{result.directory:<{width}} OK   {result.seconds:7.3f}s')
+		else:
+			failed += 1
+			logging.error(f'\t{result.directory:<{width}} FAIL {result.seconds:7.3f}s {result.error}')
+	logging.info(f'Processed {len(summary)} directories in {seconds:.3f}s, {failed} failed.')
+	return failed == 0
+
+
+def libgen_regenerator(sort: LibrarySort, e: ElfPack) -> bool:
+	return libgen_process_directories(libgen_regenerate_directory, sort, e)
+
+
 def ep1_libgen_regenerator(sort: LibrarySort) -> bool:
 	return libgen_regenerator(sort, ElfPack.EP1)
 
@@ -689,42 +696,7 @@ def ep2_libgen_regenerator(sort: LibrarySort) -> bool:
 
 
 def libgen_resort_syms(sort: LibrarySort, e: ElfPack) -> bool:
-	directories: list[Path] = get_all_directories_in_directory(P2K_DIR_LIB, True)
-	if directories is not None:
-		for directory in directories:
-			if e == ElfPack.EP1:
-				sym_file: Path = directory / 'elfloader.sym'
-			elif e == ElfPack.EP2:
-				sym_file: Path = directory / 'library.sym'
-			else:
-				logging.error(f'Unknown ElfPack version: "{e.name}".')
-				return False
-
-			# Drop all "_testX", "_testXX" slugs from name.
-			pfw_chunk: str = re.sub(r'_test\d+', '', directory.name)
-			phone, firmware = parse_phone_firmware(pfw_chunk, False)
-			version: str = libgen_version()
-
-			# Resort Symbols files.
-			if check_files_if_exists([sym_file], False):
-				logging.info(f'Will resort "{sym_file}" symbols file.')
-				if e == ElfPack.EP1:
-					functions, library_model = ep1_libgen_model(sym_file, sort)
-					elfpack: str = ElfPack.EP1.name
-				elif e == ElfPack.EP2:
-					library_model: LibraryModel = ep2_libgen_model(sym_file, sort)
-					elfpack: str = ElfPack.EP2.name
-				else:
-					return False
-
-				if library_model:
-					if not dump_library_model_to_sym_file(library_model, sym_file, phone, firmware, elfpack, version):
-						return False
-
-				if not validate_sym_file(sym_file):
-					return False
-		return True
-	return False
+	return libgen_process_directories(libgen_resort_directory, sort, e)
 
 
 def ep1_libgen_resort(sort: LibrarySort) -> bool:
@@ -828,8 +800,9 @@ def libgen_gcc_sym(model: LibraryModel, p_out: Path, c_source: False) -> bool:
 	entry: str = '#define ADDR_{0:<40} = ({1} | {2}) /* {3} */' if c_source else '{0:<40} = ({1} | {2}); /* {3} */'
 	entry_count: int = len(model)
 	if entry_count > 0:
-		with p_out.open(mode='w', newline='\r\n') as f_o:
-			for address, mode, name in model:
-				f_o.write(entry.format(name, address, 1 if mode == 'T' else 0, mode) + '\n')
+		lines: Iterator[str] = (
+			entry.format(name, address, 1 if mode == 'T' else 0, mode) for address, mode, name in model
+		)
+		write_lines_to_file(p_out, [], lines)
 		return True
 	return False
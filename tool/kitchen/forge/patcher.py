@@ -23,12 +23,14 @@ from .hexer import arrange
 from .hexer import is_hex_string
 from .types import PatchDict
 from .types import PatchDictNone
+from .types import Pattern
 from .hexer import normalize_hex_address
+from .firmware import FirmwareView
 from .filesystem import check_files_if_exists
 from .filesystem import check_files_extensions
 from .types import CsConfigParser
 from .utilities import get_current_datetime_formatted
-from .constants import MAX_BINARY_CHUNK_READ
+from .patterns import PatternScanner
 
 
 def sort_patch_dict(unsorted: PatchDict) -> PatchDict:
@@ -81,13 +83,12 @@ def generate_fpa(fw: str, author: str, desc: str, patterns: PatchDict, fpa: Path
 
 def undo_data(addr: int, hex_data: str, undo: Path, log: bool = False) -> str | None:
 	if check_files_if_exists([undo]) and check_files_extensions([undo], ['bin', 'smg']):
-		with undo.open(mode='rb') as f_i:
+		with FirmwareView(undo) as firmware:
 			p_size: int = patch_size_of_hex_str(hex_data)
-			if check_if_address_beyond_file_size(addr, undo.stat().st_size, p_size):
+			if check_if_address_beyond_file_size(addr, len(firmware), p_size):
 				if log:
 					logging.info(f'Read: "{int2hex(addr)}" undo value, data size: "{int2hex(p_size)}, {p_size}".')
-				f_i.seek(addr)
-				undo_str: str = f_i.read(p_size).hex().upper()
+				undo_str: str = firmware.hex(addr, p_size)
 			else:
 				if log:
 					logging.warning(f'Read beyond: "{int2hex(addr)}", write "{int2hex(p_size)}, {p_size}" FF-bytes.')
@@ -211,14 +212,13 @@ def apply_fpa_patch(firmware: Path, fpa: Path, backup: bool, validating: bool, r
 		if validating:
 			undo_patches: PatchDictNone = get_fpa_patch_values(config, section_undo_patches, True)
 			if undo_patches is not None:
-				with firmware.open(mode='rb') as f_i:
+				with FirmwareView(firmware) as firmware_view:
 					for address, value in undo_patches.items():
 						p_addr: int = hex2int_r(address)
 						p_size: int = patch_size_of_hex_str(value)
 						undo: str = value.upper()
 						if check_if_address_beyond_file_size(p_addr, file_size, p_size):
-							f_i.seek(p_addr)
-							hex_data: str = f_i.read(patch_size_of_hex_str(value)).hex().upper()
+							hex_data: str = firmware_view.hex(p_addr, p_size)
 						else:
 							hex_data: str = 'FF' * p_size
 						if hex_data == undo:
@@ -305,33 +305,23 @@ def patch_binary_file(binary_file: Path, old_bytes: str, new_bytes: str, dry: bo
 			logging.warning(f'new_bytes: "{new_bytes}"')
 			return -1
 
-		found: int = 0
-		write_to: int = 0
-		position: int = 0
-		chunk_size: int = MAX_BINARY_CHUNK_READ
 		old_bytes_sequence: bytes = bytes.fromhex(old_bytes)
 		new_bytes_sequence: bytes = bytes.fromhex(new_bytes)
 		old_len: int = len(old_bytes_sequence)
 		new_len: int = len(new_bytes_sequence)
 
-		if old_len == new_len:
+		if old_len == 0 or binary_file.stat().st_size == 0:
+			logging.error(f'Nothing to patch, pattern "{old_bytes}" or "{binary_file}" file is empty.')
+		elif old_len == new_len:
+			pattern: Pattern = Pattern(old_bytes, 'D', 0, old_bytes_sequence, b'\xFF' * old_len, False, (0, 0))
+			with FirmwareView(binary_file) as firmware:
+				matches: list[int] = PatternScanner([pattern]).scan(firmware.data)[0]
 			with binary_file.open('rb+') as f_io:
-				while True:
-					chunk: bytes = f_io.read(chunk_size)
-					if not chunk:
-						break
-					idx: int = chunk.find(old_bytes_sequence)
-					if idx != -1:
-						found += 1
-						write_to = position + idx
-						logging.info(f'Match found on "{int2hex(write_to)}": "{old_bytes}".')
-					overlap_size: int = old_len - 1
-					if len(chunk) == chunk_size:
-						f_io.seek(position + chunk_size - overlap_size)
-						position += chunk_size - overlap_size
-					else:
-						break
+				for match in matches:
+					logging.info(f'Match found on "{int2hex(match)}": "{old_bytes}".')
+				found: int = len(matches)
 				if found == 1:
+					write_to: int = matches[0]
 					f_io.seek(write_to)
 					if not dry:
 						logging.info(f'Apply patch to "{binary_file}" file:')
@@ -11,107 +11,335 @@ Date: 15-Dec-2023
 Version: 1.0
 """
 
+import re
+import sys
+import hashlib
 import logging
 
 from pathlib import Path
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import count
+from itertools import compress
 
 from .hexer import int2hex
 from .hexer import hex2int
+from .types import Pattern
+from .types import BinaryImage
+from .types import PatternStatus
+from .types import RegionTable
 from .types import LibraryModel
 from .types import MemoryRegion
 from .types import PatternModel
+from .firmware import FirmwareView
+from .firmware import parse_phone_firmware
+from .firmware import detect_firmware_start
 from .firmware import determine_memory_region
 from .filesystem import check_files_if_exists
 from .filesystem import check_files_extensions
+from .filesystem import check_directories_if_exists
+from .filesystem import sort_paths_by_filename
 from .constants import P2K_TOOL_PAT
+from .constants import P2K_DIR_LIB
+from .constants import ADS_SYM_FILE_HEADER
+from .constants import INDEX_MIN_IMAGE_SIZE
+from .constants import MIN_UNIQUE_PATTERN_SIZE
+from .constants import P2K_REGION_TABLE_PATTERN
+from .constants import PATTERN_FILE_EXTENSION
+from .indexer import FirmwareIndex
+from .indexer import open_firmware_index
+from .ramtrans import RamTranslator
+from .ramtrans import parse_region_table
+from .ptc import dump_patterns_to_ptc_file
+from .ptc import load_patterns_from_ptc_file
 from .invoker import invoke_external_command_res
 from .symbols import combine_sym_str
 from .symbols import dump_sym_file_to_library_model
 from .utilities import get_current_datetime_formatted
 from .utilities import is_string_filled_by_character
+from .writer import LineWriter
+from .writer import get_forge_header
 
 
-# Generated by Qwen Chat: https://chat.qwen.ai/
-# Checks if opcode 2 or 4 byte B/BL/BLX/B.W/B.N.W branches for ARM and Thumb modes.
-def is_branch_opcode_arm_thumb(data: bytes, thumb_mode: bool = False, big_endian: bool = True) -> bool:
-	if thumb_mode:
-		if len(data) >= 2:
-			hi: int = data[0] if big_endian else data[1]
-			lo: int = data[1] if big_endian else data[0]
-
-			if (hi & 0xF8) in [0xF0, 0xF8]:
-				# B.W: 11110HxxxxxLLLLL
-				if (hi & 0xF8) == 0xF0 and (lo & 0x80) == 0x80:
-					return True
-				# BLX: 1111111100xxxxxxxxxx
-				elif hi == 0xFF and (lo & 0xC0) == 0xC0:
-					return True
-				# BL: 1111110xxxxxxxxx
-				elif (hi & 0xF8) == 0xF8:
-					return True
-				# B.N.W: 11110HxxxxxLLLLL
-				elif (hi & 0xF8) == 0xF0 and (lo & 0x80) == 0x00:
-					return True
-	else:
-		if len(data) >= 4:
-			if big_endian:
-				opcode: int = (data[0] << 24) | (data[1] << 16) | (data[2] << 8) | data[3]
-			else:
-				opcode: int = (data[3] << 24) | (data[2] << 16) | (data[1] << 8) | data[0]
-
-			# B: 0xEA000000
-			if (opcode & 0xFC000000) == 0xA0000000:
-				return True
-			# BL: 0xEB000000
-			elif (opcode & 0xFC000000) == 0xB0000000:
-				return True
+# Every 2-byte aligned slot of the data classified by its first byte: "B" is a possible branch opcode start.
+THUMB_BRANCH_SLOTS: bytes = bytes(ord('B') if byte >= 0xF0 else ord('-') for byte in range(0x100))
+ARM_BRANCH_SLOTS: bytes = bytes(ord('B') if (byte & 0xFC) in (0xA0, 0xB0) else ord('-') for byte in range(0x100))
+
+# A branch opcode takes two slots, a 16-bit Thumb one is checked only in the last slot of data.
+THUMB_BRANCH_REGEX: re.Pattern = re.compile(rb'B.|B\Z', re.DOTALL)
+ARM_BRANCH_REGEX: re.Pattern = re.compile(rb'B.', re.DOTALL)
+
+
+def mask_branch_opcodes(data: bytes | memoryview, thumb_mode: bool = False) -> str | None:
+	"""
+	Mask branch opcodes of the big-endian code by "??" wildcards, scanning 2-byte aligned slots from the start.
+	Thumb: a slot whose high byte is F0-FF starts a 4-byte B.W, BL or BLX opcode, in the last slot it is a 2-byte one.
+	ARM: a 4-byte word whose first byte is A0-A3 or B0-B3 is a B or BL opcode, these bits are tested like
+	"(opcode & 0xFC000000)" against 0xA0000000 and 0xB0000000.
+	Returns None for empty or fully masked data.
+	"""
+	if not data:
+		return None
+
+	slots: bytes = bytes(data[0:len(data) & ~1:2]).translate(THUMB_BRANCH_SLOTS if thumb_mode else ARM_BRANCH_SLOTS)
+	result: bytearray = bytearray(data.hex().upper(), 'ascii')
+	for match in (THUMB_BRANCH_REGEX if thumb_mode else ARM_BRANCH_REGEX).finditer(slots):
+		start: int = match.start() * 4
+		end: int = match.end() * 4
+		result[start:end] = b'?' * (end - start)
+
+	return result.decode('ascii') if result.count(b'?') != len(result) else None
 
-	return False
 
-# Generated by Qwen Chat: https://chat.qwen.ai/
 def mask_branch_instructions(hex_data: str, thumb_mode: bool = False) -> str | None:
 	if not hex_data:
 		return None
+	return mask_branch_opcodes(bytes.fromhex(hex_data), thumb_mode)
+
+
+def s16(value: int) -> int:
+	return ((value + 0x8000) & 0xFFFF) - 0x8000
+
+
+# Same parsing rules as in the "parseLine()" function of the "pat" utility.
+def parse_pattern_line(line: str) -> Pattern | None:
+	line: str = line.strip()
+	if len(line) == 0 or line.startswith('#'):
+		return None
+	splits: list[str] = line.split()
+	if len(splits) < 3 or splits[1] not in ('T', 'A', 'D'):
+		logging.debug(f'Skip pattern line: "{line}".')
+		return None
+	name, mode, *expression = splits
+	occurrence: int = 0
+	if len(expression) > 1 and len(expression[0]) < 4:
+		try:
+			occurrence = int(expression[0], 10)
+		except ValueError:
+			logging.error(f'Cannot parse occurrence number of "{line}" pattern line.')
+			return None
+		expression = expression[1:]
+	expression: str = ''.join(expression)
+	source: str = expression
+
+	load: bool = expression.startswith('[')
+	if load:
+		expression = expression[1:]
+	hex_text: str = re.match(r'[^+\-\]]*', expression).group()
+	hex_length: int = len(hex_text) // 2
+	if hex_length == 0:
+		logging.error(f'Empty pattern data in "{line}" pattern line.')
+		return None
+
+	# The "pat" utility puts offsets in order of appearance, not their position relative to the "[...]" brackets.
+	offsets: list[int] = [0, 0]
+	position: int = 0 if load else 1
+	for offset in re.findall(r'[+-][^+\-\]]+', expression[len(hex_text):]):
+		if position < len(offsets):
+			try:
+				offsets[position] = s16(int(offset, 16))
+			except ValueError:
+				logging.error(f'Cannot parse "{offset}" offset of "{line}" pattern line.')
+				return None
+		position += 1
+
+	text: bytearray = bytearray(hex_length)
+	mask: bytearray = bytearray(hex_length)
+	for i in range(hex_length):
+		hex_byte: str = hex_text[i * 2:i * 2 + 2]
+		if '?' not in hex_byte:
+			try:
+				text[i] = int(hex_byte, 16)
+			except ValueError:
+				logging.error(f'Wrong "{hex_byte}" HEX-value in "{line}" pattern line.')
+				return None
+			mask[i] = 0xFF
+
+	return Pattern(name, mode, occurrence, bytes(text), bytes(mask), load, (offsets[0], offsets[1]), source)
+
+
+def get_compiled_pattern_path(pat_p: Path) -> Path:
+	return pat_p.with_suffix(f'.{PATTERN_FILE_EXTENSION}')
+
+
+def load_pattern_file(pat_p: Path) -> list[Pattern] | None:
+	"""
+	Patterns are loaded from the compiled "*.ptc" file beside, it will be recompiled if the "*.pts" file has changed.
+	"""
+	if check_files_if_exists([pat_p]):
+		source: bytes = pat_p.read_bytes()
+		digest: bytes = hashlib.sha256(source).digest()
+		ptc_p: Path = get_compiled_pattern_path(pat_p)
+		patterns: list[Pattern] | None = load_patterns_from_ptc_file(ptc_p, digest)
+		if patterns is None:
+			logging.debug(f'Compile "{pat_p}" patterns file to "{ptc_p}".')
+			lines: list[str] = source.decode('ascii', 'replace').splitlines()
+			patterns = [pattern for pattern in map(parse_pattern_line, lines) if pattern]
+			if len(patterns) > 0:
+				dump_patterns_to_ptc_file(patterns, digest, ptc_p)
+		if len(patterns) > 0:
+			return patterns
+		logging.error(f'Patterns file "{pat_p}" is empty.')
+	return None
+
+
+def rate_anchor_window(window: bytes) -> int:
+	# Prefer windows of distinct bytes, filler 0x00 and 0xFF words are too frequent in firmware.
+	return len(set(window)) * 2 - window.count(0x00) - window.count(0xFF)
+
+
+def select_anchor_window(pattern: Pattern, residue: int) -> int | None:
+	best_offset: int | None = None
+	best_rate: int = -0xFF
+	for offset in range((4 - residue) % 4, len(pattern.text) - 3, 4):
+		if pattern.mask[offset:offset + 4] == b'\xFF\xFF\xFF\xFF':
+			rate: int = rate_anchor_window(pattern.text[offset:offset + 4])
+			if rate > best_rate:
+				best_offset, best_rate = offset, rate
+	return best_offset
+
+
+def compile_pattern_regex(pattern: Pattern) -> re.Pattern:
+	regex: bytes = b''.join(
+		re.escape(bytes([byte])) if mask else b'.' for byte, mask in zip(pattern.text, pattern.mask)
+	)
+	return re.compile(b'(?=' + regex + b')', re.DOTALL)
+
+
+class PatternScanner:
+	"""
+	All patterns compiled into one automaton for a single pass over the firmware image.
+
+	Every match of a pattern on any firmware offset fully covers at least one 4-byte aligned word of the image.
+	For each of 4 possible match alignments the pattern registers its best wildcard-free 4-byte window
+	in one word table, so the scan is a single walk on aligned words of the image with candidates checking.
+	With the persistent firmware index only positions of these words are checked, without the image walk.
+	Patterns which have no such windows, e.g. short or heavily masked ones, are scanned by their own regexps.
+	"""
+
+	def __init__(self, patterns: list[Pattern]) -> None:
+		self.patterns: list[Pattern] = patterns
+		self.anchors: dict[int, list[tuple[int, int]]] = {}
+		self.fallbacks: list[tuple[int, re.Pattern, set[int]]] = []
+		self.checks: list[tuple[int, int, int]] = []
+		for index, pattern in enumerate(patterns):
+			residues: set[int] = set()
+			for residue in range(4):
+				offset: int | None = select_anchor_window(pattern, residue)
+				if offset is None:
+					residues.add(residue)
+				else:
+					word: int = int.from_bytes(pattern.text[offset:offset + 4], sys.byteorder)
+					self.anchors.setdefault(word, []).append((index, offset))
+			if residues:
+				logging.debug(f'Pattern "{pattern.name}" will be scanned separately for {sorted(residues)} residues.')
+				self.fallbacks.append((index, compile_pattern_regex(pattern), residues))
+			mask: int = int.from_bytes(pattern.mask, 'big')
+			self.checks.append((len(pattern.text), mask, int.from_bytes(pattern.text, 'big') & mask))
+
+	def check(self, image: BinaryImage, matches: list[list[int]], word: int, position: int) -> None:
+		for pattern_index, offset in self.anchors[word]:
+			start: int = position - offset
+			length, mask, text = self.checks[pattern_index]
+			if 0 <= start and (start + length) <= len(image):
+				if (int.from_bytes(image[start:start + length], 'big') & mask) == text:
+					matches[pattern_index].append(start)
+
+	def scan(self, image: BinaryImage, index: FirmwareIndex | None = None) -> list[list[int]]:
+		matches: list[list[int]] = [[] for _ in self.patterns]
+		if index is not None:
+			for word in self.anchors:
+				for position in index.find_word(word):
+					self.check(image, matches, word, position)
+		else:
+			with memoryview(image) as view, view[:len(image) & ~3].cast('I') as words:
+				for position in compress(count(), map(self.anchors.__contains__, words)):
+					self.check(image, matches, words[position], position * 4)
+		for pattern_index, regex, residues in self.fallbacks:
+			for match in regex.finditer(image):
+				if (match.start() % 4) in residues:
+					matches[pattern_index].append(match.start())
+		for found in matches:
+			found.sort()
+		return matches
+
+
+def scan_firmware_image(
+	scanner: PatternScanner, image: BinaryImage, image_p: Path, use_index: bool = False
+) -> list[list[int]]:
+	# The "*.idx" index file is written beside the firmware, so it is used only on request for repeated scans.
+	if use_index and len(image) >= INDEX_MIN_IMAGE_SIZE:
+		index: FirmwareIndex | None = open_firmware_index(image, image_p)
+		if index is not None:
+			with index:
+				return scanner.scan(image, index)
+	return scanner.scan(image)
+
+
+def select_pattern_match(pattern: Pattern, matches: list[int]) -> int | None:
+	if pattern.count == 0:
+		return matches[0] if len(matches) == 1 else None
+	return matches[pattern.count - 1] if len(matches) >= pattern.count else None
+
+
+def load_pattern_pointers(image: BinaryImage, addresses: set[int]) -> dict[int, int | None]:
+	pointers: dict[int, int | None] = {}
+	for address in sorted(addresses):
+		if 0 <= address <= len(image) - 4:
+			pointers[address] = int.from_bytes(image[address:address + 4], 'big')
+		else:
+			pointers[address] = None
+	return pointers
+
+
+def evaluate_patterns(
+	patterns: list[Pattern], matches: list[list[int]], image: BinaryImage, base: int
+) -> list[int | None]:
+	"""
+	Evaluation plan of pattern expressions like "[80A842B0D1062006+0x24]+0x10" after the firmware scan:
+	select matches and apply first offsets, read all pointers at once with repeated ones read once, add the rest.
+	"""
+	addresses: list[int | None] = []
+	for pattern, found in zip(patterns, matches):
+		match: int | None = select_pattern_match(pattern, found)
+		addresses.append(None if match is None else match + pattern.offsets[0])
+	pointers: dict[int, int | None] = load_pattern_pointers(
+		image, {address for pattern, address in zip(patterns, addresses) if pattern.load and address is not None}
+	)
+	values: list[int | None] = []
+	for pattern, address in zip(patterns, addresses):
+		if address is not None and pattern.load:
+			if pointers[address] is None:
+				logging.warning(f'Pattern "{pattern.name}" pointer {int2hex(address)} is out of firmware bounds.')
+			address = pointers[address]
+		elif address is not None:
+			address += base
+		values.append(None if address is None else (address + pattern.offsets[1]) & 0xFFFFFFFF)
+	return values
+
+
+def resolve_pattern_value(pattern: Pattern, matches: list[int], image: BinaryImage, base: int) -> int | None:
+	return evaluate_patterns([pattern], [matches], image, base)[0]
 
-	i = 0
-	result = []
-	byte_list = bytes.fromhex(hex_data)
-	while i < len(byte_list):
-		# Skip odd addresses.
-		if i % 2 != 0:
-			result.append(f'{byte_list[i]:02X}')
-			i += 1
-			continue
-
-		matched = False
-
-		# Check 32-bit opcode first.
-		if i + 4 <= len(byte_list):
-			chunk = byte_list[i:i+4]
-			if is_branch_opcode_arm_thumb(chunk, thumb_mode):
-				result.extend(['??', '??', '??', '??'])
-				i += 4
-				matched = True
-
-		# If not matched, check 16-bit opcode anyway.
-		elif not matched and i + 2 <= len(byte_list):
-			chunk = byte_list[i:i+2]
-			if is_branch_opcode_arm_thumb(chunk, thumb_mode):
-				result.extend(['??', '??'])
-				i += 2
-				matched = True
-
-		# If not matched anyway, just append bytes.
-		if not matched:
-			result.append(f"{byte_list[i]:02X}")
-			i += 1
-
-	result_str: str = ''.join(result)
-
-	return result_str if any(char != '?' for char in result_str) else None
-
-
-def pat_find(pat_p: Path, cgs_p: Path, base_address: int, ram_trans: bool, out_p: Path) -> bool:
+
+def dump_pattern_values_to_sym_file(patterns: list[Pattern], values: list[int | None], out_p: Path) -> bool:
+	try:
+		with LineWriter(out_p) as writer:
+			writer.write_line(ADS_SYM_FILE_HEADER)
+			for pattern, value in zip(patterns, values):
+				if value is not None:
+					writer.write_line(f'{int2hex(value)} {pattern.mode} {pattern.name}')
+				else:
+					logging.warning(f'Function "{pattern.name} {pattern.mode}" not found!')
+					writer.write_line(f'# NOT_FOUND: {pattern.mode} {pattern.name}')
+		return True
+	except OSError as error:
+		logging.error(f'Cannot write "{out_p}" symbols file: {error}')
+	return False
+
+
+def pat_find_external(pat_p: Path, cgs_p: Path, base_address: int, ram_trans: bool, out_p: Path) -> bool:
 	args: list[str] = [
 		str(P2K_TOOL_PAT),
 		'-ram-trans' if ram_trans else '-no-ram-trans',
@@ -123,56 +351,378 @@ def pat_find(pat_p: Path, cgs_p: Path, base_address: int, ram_trans: bool, out_p
 	return invoke_external_command_res([pat_p, cgs_p], args)
 
 
+def get_pattern_status(pattern: Pattern, matches: list[int], value: int | None) -> PatternStatus:
+	if value is not None:
+		return PatternStatus.FOUND
+	elif pattern.count == 0 and len(matches) > 1:
+		return PatternStatus.AMBIGUOUS
+	return PatternStatus.MISSING
+
+
+def find_ram_translator(
+	image: BinaryImage, image_p: Path, base_address: int, use_index: bool = False
+) -> RamTranslator | None:
+	pattern: Pattern = parse_pattern_line(P2K_REGION_TABLE_PATTERN)
+	matches: list[int] = scan_firmware_image(PatternScanner([pattern]), image, image_p, use_index)[0]
+	value: int | None = resolve_pattern_value(pattern, matches, image, base_address)
+	if value is None:
+		logging.warning(f'Cannot find region table in "{image_p.name}" firmware, {len(matches)} matches.')
+		return None
+	regions: RegionTable | None = parse_region_table(image, (value - base_address) & 0xFFFFFFFF)
+	if regions is None:
+		return None
+	logging.info(f'Found region table with {len(regions)} regions on {int2hex(value)} address.')
+	return RamTranslator(regions)
+
+
+def resolve_firmware_patterns(
+	scanner: PatternScanner, cgs_p: Path, base_address: int, ram_trans: bool = False, use_index: bool = False
+) -> tuple[list[int | None], list[PatternStatus]]:
+	patterns: list[Pattern] = scanner.patterns
+	with FirmwareView(cgs_p) as firmware:
+		matches: list[list[int]] = scan_firmware_image(scanner, firmware.data, cgs_p, use_index)
+		values: list[int | None] = evaluate_patterns(patterns, matches, firmware.data, base_address)
+		if ram_trans:
+			translator: RamTranslator | None = find_ram_translator(firmware.data, cgs_p, base_address, use_index)
+			if translator is not None:
+				values = translator.translate_all(values)
+	statuses: list[PatternStatus] = [
+		get_pattern_status(pattern, found, value) for pattern, found, value in zip(patterns, matches, values)
+	]
+	return values, statuses
+
+
+def resolve_pattern_lines(
+	lines: list[str], cgs_p: Path, base_address: int, ram_trans: bool = False
+) -> list[str] | None:
+	if not check_files_if_exists([cgs_p]):
+		return None
+	patterns: list[Pattern] = [pattern for pattern in map(parse_pattern_line, lines) if pattern is not None]
+	if len(patterns) != len(lines):
+		logging.error('Cannot parse some of pattern lines.')
+		return None
+	symbols: list[str] = []
+	values, _ = resolve_firmware_patterns(PatternScanner(patterns), cgs_p, base_address, ram_trans)
+	for pattern, value in zip(patterns, values):
+		if value is None:
+			logging.error(f'Pattern "{pattern.name} {pattern.mode}" not found in "{cgs_p.name}" firmware.')
+			return None
+		symbols.append(combine_sym_str(int2hex(value), pattern.mode, pattern.name))
+	return symbols
+
+
+def pat_find(
+	pat_p: Path, cgs_p: Path, base_address: int, ram_trans: bool, out_p: Path, use_index: bool = False
+) -> bool:
+	if not check_files_if_exists([pat_p, cgs_p]):
+		return False
+	patterns: list[Pattern] | None = load_pattern_file(pat_p)
+	if patterns is None:
+		return False
+	base: str = int2hex(base_address)
+	logging.info(f'Will find {len(patterns)} patterns of "{pat_p}" in "{cgs_p}" firmware, base {base}.')
+	values, _ = resolve_firmware_patterns(PatternScanner(patterns), cgs_p, base_address, ram_trans, use_index)
+	logging.info(f'Found {sum(value is not None for value in values)} of {len(patterns)} patterns.')
+	return dump_pattern_values_to_sym_file(patterns, values, out_p)
+
+
+def pat_find_firmware(
+	scanner: PatternScanner, cgs_p: Path, base_address: int | None, ram_trans: bool, out_p: Path,
+	use_index: bool = False
+) -> list[PatternStatus] | None:
+	if base_address is None:
+		try:
+			model: LibraryModel | None = dump_sym_file_to_library_model(get_firmware_library_sym(cgs_p))
+		except ValueError as error:
+			logging.error(f'Cannot get library symbols file of "{cgs_p.name}" firmware, {error}')
+			return None
+		if model:
+			with FirmwareView(cgs_p) as firmware:
+				base_address = detect_firmware_start(firmware.data, model)
+		if base_address is None:
+			logging.error(f'Cannot detect start address of "{cgs_p.name}" firmware, please set it explicitly.')
+			return None
+	values, statuses = resolve_firmware_patterns(scanner, cgs_p, base_address, ram_trans, use_index)
+	if not dump_pattern_values_to_sym_file(scanner.patterns, values, out_p):
+		return None
+	return statuses
+
+
+def dump_pattern_statuses_to_summary_file(
+	patterns: list[Pattern], firmwares: dict[Path, list[PatternStatus] | None], out_p: Path
+) -> bool:
+	marks: dict[PatternStatus, str] = {
+		PatternStatus.FOUND: '+', PatternStatus.MISSING: '-', PatternStatus.AMBIGUOUS: '!'
+	}
+	columns: list[list[PatternStatus]] = [statuses for statuses in firmwares.values() if statuses is not None]
+	width: int = max(len(f'{pattern.name} {pattern.mode}') for pattern in patterns)
+	try:
+		with out_p.open(mode='w', newline='\r\n') as f_o:
+			f_o.write('# Summary of patterns search: "+" found, "-" missing, "!" ambiguous, "x" failed firmware.\n')
+			f_o.write(f'# Timestamp: {get_current_datetime_formatted()}\n\n')
+			for number, (cgs_p, statuses) in enumerate(firmwares.items(), start=1):
+				found: str = 'failed'
+				if statuses is not None:
+					found = f'{statuses.count(PatternStatus.FOUND)}/{len(patterns)} found'
+				f_o.write(f'# {number:3d}: {cgs_p.name}, {found}\n')
+			f_o.write('\n')
+			for index, pattern in enumerate(patterns):
+				row: str = ''.join(
+					'x' if statuses is None else marks[statuses[index]] for statuses in firmwares.values()
+				)
+				missed: int = sum(statuses[index] != PatternStatus.FOUND for statuses in columns)
+				f_o.write(f'{f"{pattern.name} {pattern.mode}":<{width}} {row} {missed}\n')
+		return True
+	except OSError as error:
+		logging.error(f'Cannot write "{out_p}" summary file: {error}')
+	return False
+
+
+def pat_find_directory(
+	pat_p: Path, cgs_dir: Path, base_address: int | None, ram_trans: bool, out_dir: Path, use_index: bool = False
+) -> bool:
+	"""
+	Resolve one patterns file against every firmware in the directory, firmware files are scanned in parallel.
+	The "*.idx" index files are written beside firmware files only with use_index.
+	"""
+	if not check_files_if_exists([pat_p]) or not check_directories_if_exists([cgs_dir, out_dir]):
+		return False
+	patterns: list[Pattern] | None = load_pattern_file(pat_p)
+	if patterns is None:
+		return False
+	cgs_ps: list[Path] = sort_paths_by_filename(
+		[path for path in cgs_dir.iterdir() if path.is_file() and path.suffix.lower() in ('.smg', '.bin')], True
+	)
+	if not cgs_ps:
+		logging.error(f'There are no firmware files in "{cgs_dir}" directory.')
+		return False
+	logging.info(f'Will find {len(patterns)} patterns of "{pat_p}" in {len(cgs_ps)} firmware files.')
+	scanner: PatternScanner = PatternScanner(patterns)
+	with ProcessPoolExecutor() as executor:
+		results: dict[Path, Future] = {
+			cgs_p: executor.submit(
+				pat_find_firmware, scanner, cgs_p, base_address, ram_trans, out_dir / f'{cgs_p.stem}.sym', use_index
+			)
+			for cgs_p in cgs_ps
+		}
+		firmwares: dict[Path, list[PatternStatus] | None] = {
+			cgs_p: result.result() for cgs_p, result in results.items()
+		}
+	for cgs_p, statuses in firmwares.items():
+		if statuses is None:
+			logging.warning(f'Firmware "{cgs_p.name}" failed.')
+		else:
+			found: int = statuses.count(PatternStatus.FOUND)
+			ambiguous: int = statuses.count(PatternStatus.AMBIGUOUS)
+			logging.info(f'Firmware "{cgs_p.name}": found {found}, ambiguous {ambiguous} of {len(patterns)} patterns.')
+	return dump_pattern_statuses_to_summary_file(patterns, firmwares, out_dir / 'Summary.txt')
+
+
 def pat_append(pat_p: Path, name: str, mode: str, pattern: str) -> None:
 	with pat_p.open(mode='a', newline='\r\n') as f_o:
 		logging.info(f'Will write "{name} {mode} {pattern}" to "{pat_p}" pattern file.')
 		f_o.write(f'{name} {mode} {pattern}')
 
 
-def sym2pat(sym_p: Path, pat_p: Path, fw_p: Path, offset: int, size: int, irom: bool, argonlv: bool) -> bool:
+def find_pattern_matches(image: BinaryImage, index: FirmwareIndex | None, hex_data: str) -> list[int]:
+	return PatternScanner([parse_pattern_line(f'Pattern D {hex_data}')]).scan(image, index)[0]
+
+
+def select_unique_pattern(
+	image: BinaryImage, index: FirmwareIndex | None, position: int, max_size: int, thumb_mode: bool
+) -> tuple[str | None, list[int]]:
+	"""
+	Binary search of the shortest pattern from the given firmware position which has only one match in the firmware.
+	"""
+	sizes: list[int] = list(range(min(MIN_UNIQUE_PATTERN_SIZE, max_size), max_size, 4)) + [max_size]
+	unique: tuple[str | None, list[int]] | None = None
+	low, high = 0, len(sizes) - 1
+	while low <= high:
+		middle: int = (low + high) // 2
+		hex_data: str | None = mask_branch_opcodes(image[position:position + sizes[middle]], thumb_mode)
+		matches: list[int] = find_pattern_matches(image, index, hex_data) if hex_data else []
+		if len(matches) == 1:
+			unique = hex_data, matches
+			high = middle - 1
+		else:
+			low = middle + 1
+	if unique is None:
+		hex_data: str | None = mask_branch_opcodes(image[position:position + max_size], thumb_mode)
+		return hex_data, find_pattern_matches(image, index, hex_data) if hex_data else []
+	return unique
+
+
+def sym2pat(
+	sym_p: Path, pat_p: Path, fw_p: Path, offset: int, size: int, irom: bool, argonlv: bool,
+	unique: bool = False, ram_trans: bool = False, use_index: bool = False
+) -> bool:
 	files_are_here: bool = check_files_if_exists([sym_p, fw_p])
 	sym_extension_is_ok: bool = check_files_extensions([sym_p], ['sym'])
 	fw_extension_is_ok: bool = check_files_extensions([fw_p], ['bin', 'smg'])
 	if files_are_here and sym_extension_is_ok and fw_extension_is_ok:
 		model: LibraryModel = dump_sym_file_to_library_model(sym_p, True)
 		if model:
-			with fw_p.open(mode='rb') as f_i, pat_p.open(mode='w', newline='\r\n') as f_o:
-				f_o.write('# Patterns file was generated by "forge" library.\n')
-				f_o.write('# Source Code: https://github.com/MotoFanRu/P2K-ELF-SDK\n')
-				f_o.write(f'# File: {fw_p.name}\n')
-				f_o.write(f'# Offset: {int2hex(offset)}, {offset}\n')
-				f_o.write(f'# Size: {int2hex(size)}, {size}\n')
-				f_o.write(f'# Timestamp: {get_current_datetime_formatted()}\n\n')
-				for addr, mode, name in model:
-					symbol: str = combine_sym_str(addr, mode, name)
-					if mode != 'C':
+			ambiguous: list[str] = []
+			with FirmwareView(fw_p) as firmware, LineWriter(pat_p) as writer:
+				# IRAM entries are copied from ROM on start, their ROM sources are found by "pat -ram-trans".
+				translator: RamTranslator | None = None
+				if ram_trans and not irom:
+					translator = find_ram_translator(firmware.data, fw_p, offset, use_index)
+					translator = translator.inverted() if translator is not None else None
+				indexed: bool = use_index and unique and len(firmware) >= INDEX_MIN_IMAGE_SIZE
+				with (open_firmware_index(firmware.data, fw_p) if indexed else None) or nullcontext() as index:
+					fields: list[tuple[str, str]] = [
+						('File', fw_p.name),
+						('Offset', f'{int2hex(offset)}, {offset}'),
+						('Size', f'{int2hex(size)}, {size}{", minimal unique" if unique else ""}')
+					]
+					if translator is not None:
+						fields.append(('RAM-Trans', 'IRAM entries are generated from ROM, use RAM-Trans to find them.'))
+					writer.write_lines(get_forge_header('Patterns file', fields))
+					for addr, mode, name in model:
+						symbol: str = combine_sym_str(addr, mode, name)
+						if mode == 'C':
+							logging.warning(f'Skip CONST entry: "{symbol}".')
+							continue
 						address: int = hex2int(addr)
 						mem_reg: MemoryRegion = determine_memory_region(address, argonlv)
+						source: int = translator.translate(address) if translator is not None else address
 						if (irom and mem_reg == MemoryRegion.IROM) or (not irom and mem_reg == MemoryRegion.ROM):
-							if irom:
-								f_i.seek(address)  # Offset is "0" here.
-							else:
-								f_i.seek(address - offset)
-							thumb_mode: bool = mode == 'T'
-							hex_data_spaced: str = f_i.read(size).hex(' ').upper()
-							hex_data: str = mask_branch_instructions(hex_data_spaced, thumb_mode)
-							if not hex_data or not hex_data_spaced or is_string_filled_by_character(hex_data, 'F'):
-								desc: str = 'because FF-empty, probably Elf Loader API?'
-								logging.warning(f'Skip {mem_reg.name} entry: "{symbol}", {desc}')
-							else:
-								logging.info(f'Write {mem_reg.name} entry: "{symbol}", pattern: {hex_data}.')
-								f_o.write(f'# Entry: {symbol}\n')
-								f_o.write(f'# Data: {hex_data_spaced}\n')
-								f_o.write(f'{name} {mode} {hex_data}\n')
-								f_o.write('\n')
+							position: int = address if irom else address - offset  # IROM offset is "0".
+						elif mem_reg == MemoryRegion.IRAM and source != address:
+							position: int = source - offset
 						elif mem_reg == MemoryRegion.IRAM:
-							desc: str = 'disable RAM-Trans while symbols file generation.'
+							desc: str = 'use RAM-Trans to generate it from ROM.'
 							logging.warning(f'Skip {mem_reg.name} entry: "{symbol}", {desc}')
+							continue
 						else:
 							logging.warning(f'Skip {mem_reg.name} entry: "{symbol}".')
+							continue
+						thumb_mode: bool = mode == 'T'
+						matches: list[int] = []
+						if unique and position >= 0:
+							hex_data, matches = select_unique_pattern(firmware.data, index, position, size, thumb_mode)
+							data: memoryview = firmware.read(position, len(hex_data) // 2 if hex_data else size)
+						else:
+							data: memoryview = firmware.read(position, size)
+							hex_data: str = mask_branch_opcodes(data, thumb_mode)
+						hex_data_spaced: str = data.hex(' ').upper()
+						if not hex_data or not hex_data_spaced or is_string_filled_by_character(hex_data, 'F'):
+							desc: str = 'because FF-empty, probably Elf Loader API?'
+							logging.warning(f'Skip {mem_reg.name} entry: "{symbol}", {desc}')
+							continue
+						logging.info(f'Write {mem_reg.name} entry: "{symbol}", pattern: {hex_data}.')
+						writer.write_line(f'# Entry: {symbol}')
+						if mem_reg == MemoryRegion.IRAM:
+							writer.write_line(f'# Source: {int2hex(source)}')
+						writer.write_line(f'# Data: {hex_data_spaced}')
+						if unique and len(matches) != 1 and position in matches:
+							# Keep the occurrence number to resolve the symbol on this firmware at least.
+							ambiguous.append(symbol)
+							logging.warning(f'Pattern of "{symbol}" entry has {len(matches)} matches.')
+							writer.write_line(f'# Ambiguous: {len(matches)} matches')
+							writer.write_line(combine_pat_str(name, mode, matches.index(position) + 1, hex_data))
+						else:
+							writer.write_line(f'{name} {mode} {hex_data}')
+						writer.write_line()
+			if ambiguous:
+				logging.warning(f'Cannot make {len(ambiguous)} patterns unique within {size} bytes:')
+				for symbol in ambiguous:
+					logging.warning(f'\t{symbol}')
+			return True
+	return False
+
+
+def get_firmware_library_sym(fw_p: Path) -> Path:
+	phone, firmware = parse_phone_firmware(fw_p.name)
+	return P2K_DIR_LIB / f'{phone}_{firmware}' / 'elfloader.sym'
+
+
+def extract_symbol_patterns(
+	fw_p: Path, sym_p: Path, names: list[str], size: int, offset: int | None
+) -> tuple[int, dict[str, str]] | None:
+	"""
+	Masked patterns of the given functions from one firmware image, addresses are taken from its library symbols file.
+	"""
+	model: LibraryModel | None = dump_sym_file_to_library_model(sym_p)
+	if not model:
+		logging.error(f'Cannot find library symbols file "{sym_p}" for "{fw_p.name}" firmware.')
+		return None
+	wanted: set[str] = set(names)
+	patterns: dict[str, str] = {}
+	with FirmwareView(fw_p) as firmware:
+		start: int | None = offset if offset is not None else detect_firmware_start(firmware.data, model)
+		if start is None:
+			logging.error(f'Cannot detect start address of "{fw_p.name}" firmware.')
+			return None
+		for addr, mode, name in model:
+			address: int = hex2int(addr)
+			mem_reg: MemoryRegion = determine_memory_region(address, start == 0xA0080000)
+			if name in wanted and mode in ('T', 'A') and mem_reg == MemoryRegion.ROM:
+				hex_data: str | None = mask_branch_opcodes(firmware.read(address - start, size), mode == 'T')
+				if hex_data:
+					patterns[name] = hex_data
+	return start, patterns
+
+
+def generalize_patterns(patterns: list[str]) -> str | None:
+	length: int = min(len(pattern) for pattern in patterns)
+	result: list[str] = []
+	for i in range(0, length, 2):
+		hex_bytes: set[str] = {pattern[i:i + 2] for pattern in patterns}
+		result.append(hex_bytes.pop() if len(hex_bytes) == 1 else '??')
+	result_str: str = ''.join(result).rstrip('?')
+	return result_str if result_str else None
+
+
+def mine_patterns(sym_p: Path, fw_ps: list[Path], pat_p: Path, size: int, offset: int | None = None) -> bool:
+	"""
+	Generalized pattern of every function from the symbols file: bytes which differ between firmwares are wildcarded.
+	"""
+	files_are_here: bool = check_files_if_exists([sym_p, *fw_ps])
+	fw_extensions_are_ok: bool = check_files_extensions(fw_ps, ['bin', 'smg'])
+	if files_are_here and fw_extensions_are_ok and check_files_extensions([sym_p], ['sym']):
+		model: LibraryModel | None = dump_sym_file_to_library_model(sym_p)
+		if model:
+			names: list[str] = [name for _, mode, name in model if mode in ('T', 'A')]
+			lib_sym_ps: dict[Path, Path] = {}
+			for fw_p in fw_ps:
+				try:
+					lib_sym_ps[fw_p] = get_firmware_library_sym(fw_p)
+				except ValueError as error:
+					logging.error(f'Skip "{fw_p.name}" firmware, {error}')
+			with ProcessPoolExecutor() as executor:
+				results: dict[Path, Future] = {
+					fw_p: executor.submit(extract_symbol_patterns, fw_p, lib_sym_p, names, size, offset)
+					for fw_p, lib_sym_p in lib_sym_ps.items()
+				}
+				firmwares: list[tuple[Path, int, dict[str, str]]] = []
+				for fw_p, result in results.items():
+					extracted: tuple[int, dict[str, str]] | None = result.result()
+					if extracted is not None:
+						firmwares.append((fw_p, *extracted))
+			if not firmwares:
+				logging.error('Cannot extract symbols from any firmware.')
+				return False
+			with LineWriter(pat_p) as writer:
+				fields: list[tuple[str, str]] = [
+					*[('File', f'{fw_p.name}, offset: {int2hex(start)}') for fw_p, start, _ in firmwares],
+					('Size', f'{int2hex(size)}, {size}')
+				]
+				writer.write_lines(get_forge_header('Patterns file', fields))
+				for _, mode, name in model:
+					found: list[str] = [patterns[name] for _, _, patterns in firmwares if name in patterns]
+					pattern: str | None = generalize_patterns(found) if found else None
+					if pattern is None or is_string_filled_by_character(pattern, 'F'):
+						logging.warning(f'Skip "{name}" entry, no common pattern in {len(firmwares)} firmwares.')
 					else:
-						logging.warning(f'Skip CONST entry: "{symbol}".')
-				return True
+						logging.info(f'Write "{name}" entry from {len(found)} firmwares, pattern: {pattern}.')
+						writer.write_lines([
+							f'# Entry: {name}, firmwares: {len(found)}/{len(firmwares)}',
+							f'{name} {mode} {pattern}',
+							''
+						])
+			return True
 	return False
 
 
@@ -181,6 +731,7 @@ def combine_pat_str(name, mode, count, pattern) -> str:
 
 
 def generate_pattern_model(pat: Path, sort_by_name: bool) -> PatternModel | None:
+	# Rows are kept as written in the patterns file, the compiled "*.ptc" patterns normalize counts and skip bad lines.
 	if check_files_if_exists([pat]) and check_files_extensions([pat], ['pts']):
 		patterns: PatternModel = []
 		with pat.open(mode='r') as f_i:
@@ -0,0 +1,82 @@
+# forge/ptc.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import os
+import struct
+import logging
+
+from pathlib import Path
+
+from .types import Pattern
+from .constants import PATTERN_FILE_MAGIC
+from .constants import PATTERN_FILE_VERSION
+
+# Magic, version, SHA-256 digest of the source "*.pts" file, and count of patterns.
+PTC_HEADER: struct.Struct = struct.Struct('<4sH32sI')
+
+# Lengths of name, expression, and pattern data, mode, load flag, occurrence number, and both offsets.
+PTC_RECORD: struct.Struct = struct.Struct('<HHHcBHhh')
+
+
+def dump_patterns_to_ptc_file(patterns: list[Pattern], digest: bytes, ptc_p: Path) -> bool:
+	blob: bytearray = bytearray(PTC_HEADER.pack(PATTERN_FILE_MAGIC, PATTERN_FILE_VERSION, digest, len(patterns)))
+	for pattern in patterns:
+		name: bytes = pattern.name.encode('utf-8')
+		expression: bytes = pattern.expression.encode('utf-8')
+		blob += PTC_RECORD.pack(
+			len(name), len(expression), len(pattern.text), pattern.mode.encode('ascii'),
+			pattern.load, pattern.count, *pattern.offsets
+		)
+		blob += name + expression + pattern.text + pattern.mask
+	temporary_p: Path = ptc_p.with_name(f'{ptc_p.name}.tmp')
+	try:
+		temporary_p.write_bytes(blob)
+		os.replace(temporary_p, ptc_p)
+		return True
+	except OSError as error:
+		logging.warning(f'Cannot write "{ptc_p}" compiled patterns file: {error}')
+		temporary_p.unlink(missing_ok=True)
+	return False
+
+
+def load_patterns_from_ptc_file(ptc_p: Path, digest: bytes) -> list[Pattern] | None:
+	try:
+		blob: bytes = ptc_p.read_bytes()
+	except OSError:
+		return None
+	if len(blob) < PTC_HEADER.size:
+		return None
+	magic, version, source_digest, count = PTC_HEADER.unpack_from(blob)
+	if magic != PATTERN_FILE_MAGIC or version != PATTERN_FILE_VERSION or source_digest != digest:
+		return None
+	patterns: list[Pattern] = []
+	offset: int = PTC_HEADER.size
+	try:
+		for _ in range(count):
+			record: tuple = PTC_RECORD.unpack_from(blob, offset)
+			name_size, expression_size, size, mode, load, occurrence, offset_0, offset_1 = record
+			offset += PTC_RECORD.size
+			name: str = blob[offset:offset + name_size].decode('utf-8')
+			offset += name_size
+			expression: str = blob[offset:offset + expression_size].decode('utf-8')
+			offset += expression_size
+			text: bytes = blob[offset:offset + size]
+			mask: bytes = blob[offset + size:offset + size * 2]
+			offset += size * 2
+			patterns.append(Pattern(
+				name, mode.decode('ascii'), occurrence, text, mask, bool(load), (offset_0, offset_1), expression
+			))
+	except (struct.error, UnicodeDecodeError):
+		logging.warning(f'Compiled patterns file "{ptc_p}" is broken.')
+		return None
+	return patterns if offset == len(blob) else None
@@ -0,0 +1,74 @@
+# forge/ramtrans.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import logging
+
+from bisect import bisect_right
+
+from .hexer import int2hex
+from .types import BinaryImage
+from .types import RegionTable
+
+
+def parse_region_table(image: BinaryImage, table_offset: int) -> RegionTable | None:
+	"""
+	Same as "RamTransInit()" of the "pat" utility: the table header keeps start and end offsets of the
+	"src, dst, size" 32-bit big-endian entries, entries of zero size are dropped.
+	"""
+	if not (0 <= table_offset <= len(image) - 8):
+		logging.error(f'Region table offset {int2hex(table_offset)} is out of firmware bounds.')
+		return None
+	start: int = int.from_bytes(image[table_offset:table_offset + 4], 'big')
+	end: int = int.from_bytes(image[table_offset + 4:table_offset + 8], 'big')
+	count: int = ((end - start) & 0xFFFFFFFF) // 12
+	entries_offset: int = table_offset + start
+	if not (0 <= entries_offset and entries_offset + count * 12 <= len(image)):
+		logging.error(f'Region table entries at {int2hex(entries_offset)} are out of firmware bounds.')
+		return None
+	regions: RegionTable = []
+	for i in range(entries_offset, entries_offset + count * 12, 12):
+		src: int = int.from_bytes(image[i + 0:i + 4], 'big')
+		dst: int = int.from_bytes(image[i + 4:i + 8], 'big')
+		size: int = int.from_bytes(image[i + 8:i + 12], 'big')
+		if size != 0:
+			regions.append((src, dst, size))
+	return regions
+
+
+class RamTranslator:
+	"""
+	Interval index of the region table: the address space is split into sorted segments by all region bounds,
+	every segment keeps the shift of the first region in the table order covering it, like the "pat" utility does.
+	"""
+
+	def __init__(self, regions: RegionTable) -> None:
+		self.regions: RegionTable = regions
+		ranges: list[tuple[int, int, int]] = [
+			(src, src + size, dst - src) for src, dst, size in regions if src + size <= 0x100000000
+		]
+		self.bounds: list[int] = sorted({bound for start, end, _ in ranges for bound in (start, end)})
+		self.shifts: list[int | None] = []
+		for bound in self.bounds:
+			self.shifts.append(next((shift for start, end, shift in ranges if start <= bound < end), None))
+
+	def translate(self, address: int) -> int:
+		index: int = bisect_right(self.bounds, address) - 1
+		if index >= 0 and self.shifts[index] is not None:
+			return (address + self.shifts[index]) & 0xFFFFFFFF
+		return address
+
+	def translate_all(self, addresses: list[int | None]) -> list[int | None]:
+		return [None if address is None else self.translate(address) for address in addresses]
+
+	def inverted(self) -> 'RamTranslator':
+		return RamTranslator([(dst, src, size) for src, dst, size in self.regions])
@@ -0,0 +1,105 @@
+# forge/symbolizer.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import re
+import logging
+
+from array import array
+from pathlib import Path
+from bisect import bisect_right
+
+from .types import LibrarySort
+from .types import SymbolTable
+from .symbols import load_symbol_table
+from .constants import SYMBOLIZER_MAX_SIZE
+from .filesystem import check_files_if_exists
+
+
+class AddressIndex:
+	"""
+	Sorted addresses of the code and data symbols, constants are skipped since their values are not locations.
+	The size of every symbol is estimated as a distance to the next symbol, limited by "max_size" if it is set.
+	The last symbol has no next one, so its size is "max_size" or SYMBOLIZER_MAX_SIZE for the unlimited zero.
+	"""
+
+	def __init__(self, table: SymbolTable, max_size: int = SYMBOLIZER_MAX_SIZE) -> None:
+		self.addresses: array = array('I')
+		self.names: list[str] = []
+		self.sizes: array = array('I')
+		constant: int = ord('C')
+		for index in table.sort_view(LibrarySort.ADDR):
+			if table.modes[index] != constant:
+				self.addresses.append(table.addresses[index])
+				self.names.append(table.names[index])
+		last_size: int = max_size if max_size > 0 else SYMBOLIZER_MAX_SIZE
+		for index, address in enumerate(self.addresses):
+			size: int = (self.addresses[index + 1] - address) if (index + 1 < len(self.addresses)) else last_size
+			self.sizes.append(min(size, max_size) if max_size > 0 else size)
+
+	def __len__(self) -> int:
+		return len(self.addresses)
+
+	def lookup(self, address: int) -> tuple[str, int] | None:
+		index: int = bisect_right(self.addresses, address) - 1
+		if index >= 0:
+			offset: int = address - self.addresses[index]
+			if offset < self.sizes[index] or offset == 0:
+				return self.names[index], offset
+		return None
+
+	def lookup_all(self, addresses: list[int]) -> list[tuple[str, int] | None]:
+		return [self.lookup(address) for address in addresses]
+
+	def symbolize(self, address: int) -> str | None:
+		symbol: tuple[str, int] | None = self.lookup(address)
+		if symbol is not None:
+			name, offset = symbol
+			return f'{name}+0x{offset:X}' if offset != 0 else name
+		return None
+
+
+def open_address_index(sym_p: Path, max_size: int = SYMBOLIZER_MAX_SIZE) -> AddressIndex | None:
+	if check_files_if_exists([sym_p]):
+		table: SymbolTable | None = load_symbol_table(sym_p)
+		if table is not None:
+			index: AddressIndex = AddressIndex(table, max_size)
+			if len(index) > 0:
+				return index
+			logging.error(f'Symbols file "{sym_p}" has no code or data symbols.')
+	return None
+
+
+def symbolize_text(index: AddressIndex, text: str) -> str:
+	"""
+	Every 32-bit hex word like "0x10C1ACCC" or "10C1ACCC" in the address lists, hex dumps or crash logs
+	is suffixed by the "<symbol+offset>" tag.
+	"""
+	def replace(match: re.Match) -> str:
+		symbol: str | None = index.symbolize(int(match.group(1), 16))
+		return f'{match.group(0)} <{symbol}>' if symbol is not None else match.group(0)
+
+	return re.sub(r'\b(?:0[xX])?([0-9A-Fa-f]{8})\b', replace, text)
+
+
+def symbolize_file(sym_p: Path, in_p: Path, out_p: Path, max_size: int = SYMBOLIZER_MAX_SIZE) -> bool:
+	index: AddressIndex | None = open_address_index(sym_p, max_size)
+	if (index is not None) and check_files_if_exists([in_p]):
+		try:
+			with in_p.open(mode='r') as f_i, out_p.open(mode='w', newline='\r\n') as f_o:
+				for line in f_i:
+					f_o.write(symbolize_text(index, line.rstrip('\r\n')) + '\n')
+			logging.info(f'Symbolized "{in_p}" file with "{sym_p}" symbols to "{out_p}" file.')
+			return True
+		except OSError as error:
+			logging.error(f'Cannot symbolize "{in_p}" file to "{out_p}" file: {error}')
+	return False
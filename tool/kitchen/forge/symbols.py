@@ -11,122 +11,153 @@ Date: 15-Dec-2023
 Version: 1.0
 """
 
+import os
+import heapq
 import logging
 
 from pathlib import Path
+from operator import itemgetter
+from itertools import groupby
 
 from .types import Symbol
 from .hexer import hex2int
 from .hexer import hex2hex
 from .types import LibraryModel
+from .types import SymbolTable
+from .types import DefinitionsRegistry
 from .constants import ADS_SYM_FILE_HEADER
+from .constants import ADS_SYM_FILE_MODES
 from .filesystem import check_files_if_exists
 from .filesystem import check_files_extensions
-from .utilities import get_current_datetime_formatted
+from .writer import LineWriter
+from .writer import get_forge_header
+from .writer import get_sym_file_header
+from .writer import write_lines_to_file
+
+# Parsed symbol files memoized by their resolved path and parse flags, validated by mtime and size.
+sym_file_cache: dict[tuple[Path, bool, bool], tuple[int, int, SymbolTable]] = {}
+defs_file_cache: dict[Path, tuple[int, int, DefinitionsRegistry]] = {}
 
 
 def split_and_validate_line(line: str, strict: bool = True) -> Symbol:
 	try:
-		modes: set[str] = {'A', 'C', 'D', 'T'}
 		line: str = line.strip()
 		if len(line) != 0 and not line.startswith('#'):
 			address, mode, name = line.split()
 			if mode != 'C':
 				hex2int(address, strict=strict)
-			if mode in modes:
-				if len(name.strip()) >= 1:
-					return address, mode, name
-				else:
-					raise ValueError(f'Too short or empty function name of "{address} {mode} {name}" entry.')
-			else:
-				if strict:
-					raise ValueError(f'Unknown mode here: "{address} {mode} {name}", available only "{modes}" modes.')
+			if mode in ADS_SYM_FILE_MODES:
+				return address, mode, name
+			elif strict:
+				raise ValueError(
+					f'Unknown mode here: "{address} {mode} {name}", available only "{set(ADS_SYM_FILE_MODES)}" modes.'
+				)
 	except ValueError as error:
 		logging.debug(f'Parse error: "{error}".')
 	return None, None, None
 
 
-def create_combined_sym_file(files: list[Path], out_p: Path) -> bool:
-	if check_files_if_exists(files) and check_files_extensions(files, ['sym']):
-		with out_p.open(mode='w', newline='\r\n') as f_o:
-			f_o.write(f'{ADS_SYM_FILE_HEADER}\n')
-			f_o.write('# SYMDEFS ADS HEADER\n\n\n\n')
-			for file in files:
-				with file.open(mode='r') as f_i:
-					f_o.write(f'# {file.name}\n')
-					f_o.write(f_i.read())
-					f_o.write('\n\n\n')
-			return True
-	return False
+def merge_sym_files(files: list[Path], out_p: Path, prefer_first: bool = False) -> LibraryModel | None:
+	"""
+	Every input file is read once and its entries are sorted by names, then sorted streams are joined by the k-way
+	merge. Identical entries are deduplicated, duplicate names of different values are reported with their files.
+	With "prefer_first" such duplicates are only warned and the entry of the earlier file wins, for overriding files.
+	"""
+	if not (check_files_if_exists(files) and check_files_extensions(files, ['sym'])):
+		return None
+	streams: list[list[tuple[str, int, str, str]]] = []
+	missed: dict[str, str] = {}
+	try:
+		for index, file in enumerate(files):
+			entries: list[tuple[str, int, str, str]] = []
+			with file.open(mode='r') as f_i:
+				for line in f_i:
+					line: str = line.strip()
+					if line.startswith('# NOT_FOUND: '):
+						mode, name = line.replace('# NOT_FOUND: ', '').split(' ')
+						missed.setdefault(name, mode)
+						continue
+					address, mode, name = split_and_validate_line(line)
+					if name is not None:
+						entries.append((name, index, hex2hex(address, 8), mode))
+			entries.sort()
+			streams.append(entries)
+	except (OSError, ValueError) as error:
+		logging.error(f'Cannot parse "{files}" symbols files: {error}')
+		return None
+
+	model: LibraryModel = []
+	conflicts: int = 0
+	for name, group in groupby(heapq.merge(*streams), key=itemgetter(0)):
+		kept: list[tuple[str, int, str, str]] = []
+		for entry in group:
+			_, index, address, mode = entry
+			if any((address == k_address) and (mode == k_mode) for _, _, k_address, k_mode in kept):
+				logging.debug(f'Skip duplicate "{address} {mode} {name}" entry of "{files[index]}" file.')
+				continue
+			for _, k_index, k_address, k_mode in kept:
+				first: str = f'\t{k_address} {k_mode} {name} in "{files[k_index]}"'
+				second: str = f'\t{address} {mode} {name} in "{files[index]}"'
+				if (k_mode == 'C') ^ (mode == 'C'):  # XOR here, CONST names may be same as other names.
+					logging.warning(f'Duplicate SYM values in "{out_p}" symbols file:')
+					logging.warning(first)
+					logging.warning(second)
+				elif prefer_first:
+					logging.warning(f'Overridden SYM values in "{out_p}" symbols file, the first one is kept:')
+					logging.warning(first)
+					logging.warning(second)
+					break
+				else:
+					logging.error(f'Conflicting SYM values in "{out_p}" symbols file:')
+					logging.error(first)
+					logging.error(second)
+					conflicts += 1
+					break
+			else:
+				kept.append(entry)
+		model.extend((address, mode, name) for name, _, address, mode in kept)
+	if conflicts > 0:
+		logging.error(f'Cannot combine "{out_p}" symbols file, found {conflicts} conflicts.')
+		return None
+
+	names: set[str] = {name for _, _, name in model}
+	missed_model: list[tuple[str, str]] = [(mode, name) for name, mode in missed.items() if name not in names]
+	for mode, name in missed_model:
+		logging.warning(f'Missed: {mode} {name}')
+
+	try:
+		with LineWriter(out_p) as writer:
+			writer.write_lines(get_sym_file_header([*[f'# {file.name}' for file in files], '']))
+			writer.write_lines(f'{address} {mode} {name}' for address, mode, name in model)
+			writer.write_lines(f'# NOT_FOUND: {mode} {name}' for mode, name in missed_model)
+		return model
+	except OSError as error:
+		logging.error(f'Cannot write "{out_p}" symbols file: {error}')
+	return None
+
+
+def create_combined_sym_file(files: list[Path], out_p: Path, prefer_first: bool = False) -> bool:
+	return merge_sym_files(files, out_p, prefer_first) is not None
 
 
 def validate_sym_file(in_p: Path) -> bool:
 	if check_files_if_exists([in_p]) and check_files_extensions([in_p], ['sym']):
-		symbols: dict[str, tuple[str, str]] = {}
-		missed: list[tuple[str, str]] = []
-		index: int = 0
-		with in_p.open(mode='r') as f_i:
-			for line in f_i.read().splitlines():
-				line: str = line.strip()
-				if (index == 0) and line != ADS_SYM_FILE_HEADER:
-					logging.error(f'Symbols file "{in_p}" does not contains "{ADS_SYM_FILE_HEADER}" at first line.')
-					return False
-				if len(line) != 0 and not line.startswith('#'):
-					address, mode, name = split_and_validate_line(line)
-					if name is not None:
-						if not symbols.get(name, None):
-							symbols[name] = address, mode
-						else:
-							first_address, first_mode = symbols[name]
-							if (first_mode == 'C') ^ (mode == 'C'):  # XOR here, CONST names may be same as other names.
-								logging.warning(f'Duplicate SYM values in "{in_p}" symbols file:')
-								logging.warning(f'\t{first_address} {first_mode} {name}')
-								logging.warning(f'\t{address} {mode} {name}')
-							else:
-								logging.error(f'Duplicate SYM values in "{in_p}" symbols file:')
-								logging.error(f'\t{first_address} {first_mode} {name}')
-								logging.error(f'\t{address} {mode} {name}')
-								return False
-				elif line.startswith('# NOT_FOUND: '):
-					mode, name = line.replace('# NOT_FOUND: ', '').split(' ')
-					logging.debug(line)
-					missed.append((name, mode))
-				index += 1
-		logging.info(f'Checking missing symbols in "{in_p}" file.')
-		for name, mode in missed:
-			if not symbols.get(name, None):
-				logging.warning(f'Missed: {mode} {name}')
-		return True
+		return parse_sym_file(in_p, True) is not None
 	return False
 
 
 def get_function_address_from_sym_file(in_p: Path, func: str) -> int:
-	with in_p.open(mode='r') as f_i:
-		for line in f_i.read().splitlines():
-			address, mode, name = split_and_validate_line(line)
-			if name == func:
-				return (int(address, 16) + 1) if mode == 'T' else int(address, 16)
-	return 0x00000000
+	lookup: SymbolLookup | None = open_symbol_lookup(in_p)
+	return lookup.resolve(func) if (lookup is not None) else 0x00000000
 
 
 def dump_library_model_to_sym_file(model: LibraryModel, out_p: Path, phone: str, fw: str, ep: str, ver: str) -> bool:
 	if len(model) > 0:
 		try:
-			with out_p.open(mode='w', newline='\r\n') as f_o:
-				f_o.write(f'{ADS_SYM_FILE_HEADER}\n')
-				f_o.write('# SYMDEFS ADS HEADER\n\n')
-				f_o.write('# Symbol listing was generated by "forge" library.\n')
-				f_o.write('# Source Code: https://github.com/MotoFanRu/P2K-ELF-SDK\n')
-				f_o.write(f'# ElfPack: {ep}\n')
-				f_o.write(f'# Phone: {phone}\n')
-				f_o.write(f'# Firmware: {fw}\n')
-				f_o.write(f'# Version: {ver}\n')
-				f_o.write(f'# Timestamp: {get_current_datetime_formatted()}\n\n')
-				for addr, mode, name in model:
-					line: str = f'{addr} {mode} {name}'
-					f_o.write(line + '\n')
-					logging.debug(line)
-				return True
+			fields: list[tuple[str, str]] = [('ElfPack', ep), ('Phone', phone), ('Firmware', fw), ('Version', ver)]
+			header: list[str] = get_sym_file_header(get_forge_header('Symbol listing', fields))
+			write_lines_to_file(out_p, header, (f'{addr} {mode} {name}' for addr, mode, name in model), True)
+			return True
 		except OSError as error:
 			logging.error(f'Cannot write "{out_p}" symbols file: {error}')
 	else:
@@ -134,25 +165,122 @@ def dump_library_model_to_sym_file(model: LibraryModel, out_p: Path, phone: str,
 	return False
 
 
-def dump_sym_file_to_library_model(in_p: Path, validate: bool = False, strict: bool = True) -> LibraryModel | None:
+def check_sym_file_symbol(
+	in_p: Path, symbols: dict[str, tuple[str, str]], address: str, mode: str, name: str
+) -> bool:
+	if name not in symbols:
+		symbols[name] = address, mode
+		return True
+	first_address, first_mode = symbols[name]
+	if (first_mode == 'C') ^ (mode == 'C'):  # XOR here, CONST names may be same as other names.
+		logging.warning(f'Duplicate SYM values in "{in_p}" symbols file:')
+		logging.warning(f'\t{first_address} {first_mode} {name}')
+		logging.warning(f'\t{address} {mode} {name}')
+		return True
+	logging.error(f'Duplicate SYM values in "{in_p}" symbols file:')
+	logging.error(f'\t{first_address} {first_mode} {name}')
+	logging.error(f'\t{address} {mode} {name}')
+	return False
+
+
+def read_sym_file(in_p: Path, validate: bool, strict: bool) -> SymbolTable | None:
+	table: SymbolTable = SymbolTable()
+	symbols: dict[str, tuple[str, str]] = {}
+	missed: list[tuple[str, str]] = []
+	with in_p.open(mode='r') as f_i:
+		for index, line in enumerate(f_i):
+			line: str = line.strip()
+			if validate and (index == 0) and (line != ADS_SYM_FILE_HEADER):
+				logging.error(f'Symbols file "{in_p}" does not contains "{ADS_SYM_FILE_HEADER}" at first line.')
+				return None
+			if len(line) == 0:
+				continue
+			if line.startswith('#'):
+				if validate and line.startswith('# NOT_FOUND: '):
+					mode, name = line.replace('# NOT_FOUND: ', '').split(' ')
+					logging.debug(line)
+					missed.append((name, mode))
+				continue
+			address, mode, name = split_and_validate_line(line, validate or strict)
+			if name is not None:
+				if validate and not check_sym_file_symbol(in_p, symbols, address, mode, name):
+					return None
+			elif validate and not strict:
+				address, mode, name = split_and_validate_line(line, strict)
+			if name is not None:
+				value: int = int(address, 16)
+				if value > 0xFFFFFFFF:
+					raise ValueError(f'value "{address}" exceeds the maximum for size "8"')
+				table.append(value, mode, name)
+	if validate:
+		logging.info(f'Checking missing symbols in "{in_p}" file.')
+		for name, mode in missed:
+			if name not in symbols:
+				logging.warning(f'Missed: {mode} {name}')
+	return table
+
+
+def load_symbol_table(in_p: Path, validate: bool = False, strict: bool = True) -> SymbolTable | None:
 	if not check_files_if_exists([in_p], False):
 		return None
-	if validate:
-		if not validate_sym_file(in_p):
-			return None
+	if validate and not check_files_extensions([in_p], ['sym']):
+		return None
 	try:
-		model: LibraryModel = []
-		with in_p.open(mode='r') as f_i:
-			for line in f_i.read().splitlines():
-				address, mode, name = split_and_validate_line(line, strict)
-				if (address is not None) and (mode is not None) and (name is not None):
-					model.append((hex2hex(address, 8), mode, name))
-			return model
+		stat: os.stat_result = in_p.stat()
+		key: tuple[Path, bool, bool] = in_p.resolve(), validate, strict
+		cached: tuple[int, int, SymbolTable] | None = sym_file_cache.get(key)
+		if (cached is not None) and (cached[0] == stat.st_mtime_ns) and (cached[1] == stat.st_size):
+			return cached[2].copy()
+		table: SymbolTable | None = read_sym_file(in_p, validate, strict)
+		if table is not None:
+			sym_file_cache[key] = stat.st_mtime_ns, stat.st_size, table
+			return table.copy()
 	except OSError as error:
 		logging.error(f'Cannot parse "{in_p}" symbols file: {error}')
 	return None
 
 
+class SymbolLookup:
+	"""
+	Name to address resolver over the loaded symbols file, the first symbol of the same name wins.
+	Addresses of the Thumb "T" functions are returned with the Thumb bit set, missing names are resolved to 0.
+	"""
+
+	def __init__(self, table: SymbolTable) -> None:
+		self.table: SymbolTable = table
+
+	def __contains__(self, name: str) -> bool:
+		return self.table.find(name) is not None
+
+	def resolve(self, name: str) -> int:
+		index: int | None = self.table.find(name)
+		if index is None:
+			return 0x00000000
+		address: int = self.table.address(index)
+		return (address + 1) if self.table.mode(index) == 'T' else address
+
+	def resolve_all(self, names: list[str]) -> dict[str, int]:
+		return {name: self.resolve(name) for name in names}
+
+
+def open_symbol_lookup(in_p: Path) -> SymbolLookup | None:
+	table: SymbolTable | None = load_symbol_table(in_p)
+	return SymbolLookup(table) if (table is not None) else None
+
+
+def parse_sym_file(in_p: Path, validate: bool = False, strict: bool = True) -> LibraryModel | None:
+	table: SymbolTable | None = load_symbol_table(in_p, validate, strict)
+	return table.to_model() if (table is not None) else None
+
+
+def clear_sym_file_cache() -> None:
+	sym_file_cache.clear()
+
+
+def dump_sym_file_to_library_model(in_p: Path, validate: bool = False, strict: bool = True) -> LibraryModel | None:
+	return parse_sym_file(in_p, validate, strict)
+
+
 def remove_comments_in_header_line(line: str) -> str:
 	comment_offset: int = line.find('//')
 	return line[:comment_offset].rstrip() if (comment_offset != -1) else line
@@ -198,17 +326,76 @@ def parse_sdk_const_header_to_list(in_p: Path) -> list[tuple[str, str]] | None:
 	return None
 
 
+def read_sdk_const_header(in_p: Path) -> DefinitionsRegistry | None:
+	const_defines: list[tuple[str, str]] | None = parse_sdk_const_header_to_list(in_p)
+	if const_defines is not None:
+		registry: DefinitionsRegistry = DefinitionsRegistry()
+		for name, index in const_defines:
+			try:
+				registry.add_const(name, hex2int(index, 4))
+			except ValueError as error:
+				logging.error(f'Wrong "{name}" const index in "{in_p}" header file: {error}')
+				return None
+		return registry
+	return None
+
+
+def read_names_defines_file(in_p: Path) -> DefinitionsRegistry | None:
+	registry: DefinitionsRegistry = DefinitionsRegistry()
+	with in_p.open(mode='r') as f_i:
+		for line in f_i:
+			address, mode, name = split_and_validate_line(line)
+			if (address is not None) and (mode is not None) and (name is not None):
+				if mode == 'C':
+					try:
+						registry.add_const(name, hex2int(hex2hex(address, 4), 4))
+					except ValueError as error:
+						logging.error(f'Wrong "{name}" const index in "{in_p}" names defines file: {error}')
+						return None
+				elif mode == 'D':
+					registry.add_data(name)
+	return registry if len(registry) > 0 else None
+
+
+def load_definitions(in_p: Path) -> DefinitionsRegistry | None:
+	"""
+	Constants of the "consts.h" header or data and constants of the "EntriesNames.def" file, parsed once while the
+	file is not changed. The returned registry is shared between callers and should not be modified.
+	"""
+	if not (check_files_if_exists([in_p]) and check_files_extensions([in_p], ['h', 'def'])):
+		return None
+	try:
+		stat: os.stat_result = in_p.stat()
+		key: Path = in_p.resolve()
+		cached: tuple[int, int, DefinitionsRegistry] | None = defs_file_cache.get(key)
+		if (cached is not None) and (cached[0] == stat.st_mtime_ns) and (cached[1] == stat.st_size):
+			return cached[2]
+		registry: DefinitionsRegistry | None = (
+			read_sdk_const_header(in_p) if in_p.suffix == '.h' else read_names_defines_file(in_p)
+		)
+		if registry is not None:
+			defs_file_cache[key] = stat.st_mtime_ns, stat.st_size, registry
+		return registry
+	except OSError as error:
+		logging.error(f'Cannot parse "{in_p}" definitions file: {error}')
+	return None
+
+
+def clear_definitions_cache() -> None:
+	defs_file_cache.clear()
+
+
 def combine_sym_str(addr: str, mode: str, name: str) -> str:
 	return f'{addr} {mode} {name}'
 
 
 def replace_syms(patches: list[str], in_p: Path, phone: str, firmware: str, ep: str, version: str) -> bool:
 	if check_files_if_exists([in_p]) and check_files_extensions([in_p], ['sym']):
-		model_patches: LibraryModel = []
+		model_patches: dict[str, tuple[str, str, str]] = {}
 		for patch in patches:
 			addr, mode, name = split_and_validate_line(patch)
 			if (addr is not None) and (mode is not None) and (name is not None):
-				model_patches.append((addr, mode, name))
+				model_patches[name] = (addr, mode, name)
 		if len(model_patches) > 0:
 			model_library_patched: LibraryModel = []
 			model_library_original: LibraryModel = dump_sym_file_to_library_model(in_p, True)
@@ -216,37 +403,29 @@ def replace_syms(patches: list[str], in_p: Path, phone: str, firmware: str, ep:
 				logging.error('Original library model is empty.')
 				return False
 
-			# Apply all patches.
+			# Apply all patches, the first symbol of the same name is kept.
+			names_present: set[str] = set()
 			for addr_original, mode_original, name_original in model_library_original:
-				index: int = 0
-				for addr_patch, mode_patch, name_patch in model_patches:
-					if name_patch.strip() == name_original.strip():
-						patched_sym: str = combine_sym_str(addr_patch, mode_patch, name_patch)
-						original_sym: str = combine_sym_str(addr_original, mode_original, name_original)
-						if (addr_patch != addr_original) or (mode_patch != mode_original):
-							logging.info(f'Will apply "{original_sym}" => "{patched_sym}" patch.')
-							model_library_patched[index] = (addr_patch, mode_patch, name_patch)
-						else:
-							logging.warning(f'Patch "{original_sym}" => "{patched_sym}" already applied.')
-					else:
-						name_is_present: bool = False
-						for addr_patched, mode_patched, name_patched in model_library_patched:
-							if name_original.strip() == name_patched.strip():
-								name_is_present = True
-						if not name_is_present:
-							model_library_patched.append((addr_original, mode_original, name_original))
-					index = len(model_library_patched) - 1
+				if name_original in names_present:
+					continue
+				names_present.add(name_original)
+				patch: tuple[str, str, str] | None = model_patches.get(name_original)
+				if patch is not None:
+					addr_patch, mode_patch, name_patch = patch
+					patched_sym: str = combine_sym_str(addr_patch, mode_patch, name_patch)
+					original_sym: str = combine_sym_str(addr_original, mode_original, name_original)
+					if (addr_patch != addr_original) or (mode_patch != mode_original):
+						logging.info(f'Will apply "{original_sym}" => "{patched_sym}" patch.')
+						model_library_patched.append(patch)
+						continue
+					logging.warning(f'Patch "{original_sym}" => "{patched_sym}" already applied.')
+				model_library_patched.append((addr_original, mode_original, name_original))
 
 			# Add missing patches as symbols.
-			for addr_patch, mode_patch, name_patch in model_patches:
-				name_is_present: bool = False
-				for addr_original, mode_original, name_original in model_library_original:
-					if name_original.strip() == name_patch.strip():
-						name_is_present = True
-				if not name_is_present:
-					patched_sym: str = combine_sym_str(addr_patch, mode_patch, name_patch)
-					logging.info(f'Will add "{patched_sym}" patch as a symbol.')
-					model_library_patched.append((addr_patch, mode_patch, name_patch))
+			for name_patch, patch in model_patches.items():
+				if name_patch not in names_present:
+					logging.info(f'Will add "{combine_sym_str(*patch)}" patch as a symbol.')
+					model_library_patched.append(patch)
 
 			if len(model_library_patched) > 0:
 				return dump_library_model_to_sym_file(model_library_patched, in_p, phone, firmware, ep, version)
@@ -258,20 +437,33 @@ def replace_syms(patches: list[str], in_p: Path, phone: str, firmware: str, ep:
 	return False
 
 
+def format_nm_line_to_sym(line: str) -> str | None:
+	address, mode, name = split_and_validate_line(line, False)
+	if (address is not None) and (mode is not None) and (name is not None):
+		try:
+			return f'{hex2hex(address, 8)} {mode} {name}'
+		except ValueError as error:
+			logging.debug(f'Parse error: "{error}".')
+	return None
+
+
+def write_nm_line_to_sym(line: str, writer: LineWriter) -> bool:
+	entry: str | None = format_nm_line_to_sym(line)
+	if entry is not None:
+		writer.write_line(entry)
+		return True
+	return False
+
+
 def convert_nm_to_sym(in_p: Path, out_p: Path) -> bool:
 	if not check_files_if_exists([in_p], False):
 		return False
 	try:
-		model: LibraryModel = []
-		with in_p.open(mode='r') as f_i, out_p.open(mode='w', newline='\r\n') as f_o:
-			for line in f_i.read().splitlines():
-				address, mode, name = split_and_validate_line(line, False)
-				if (address is not None) and (mode is not None) and (name is not None):
-					model.append((hex2hex(address, 8), mode, name))
-			if model:
-				for addr, mode, name in model:
-					line: str = f'{addr} {mode} {name}'
-					f_o.write(line + '\n')
+		with in_p.open(mode='r') as f_i:
+			entries: int = write_lines_to_file(out_p, [], filter(None, map(format_nm_line_to_sym, f_i)))
+		if entries > 0:
+			return True
+		logging.error(f'No symbols found in "{in_p}" file.')
 	except OSError as error:
 		logging.error(f'Cannot parse "{in_p}" symbols file and write "{out_p}" file: {error}')
-	return None
+	return False
@@ -0,0 +1,205 @@
+# forge/symcache.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import os
+import sys
+import mmap
+import struct
+import hashlib
+import logging
+
+from array import array
+from pathlib import Path
+
+from .types import LibraryModel
+from .types import SymbolTable
+from .types import SymbolCacheEntry
+from .symbols import load_symbol_table
+from .constants import P2K_DIR_LIB
+from .constants import SYMBOL_CACHE_FILE_NAME
+from .constants import SYMBOL_CACHE_FILE_MAGIC
+from .constants import SYMBOL_CACHE_FILE_VERSION
+
+# Magic, version, byte order of the address arrays, and count of the symbols files.
+SYMBOL_CACHE_HEADER: struct.Struct = struct.Struct('<4sHHI')
+
+# Path length, SHA-256 digest, mtime and size of the symbols file, offset of its data, count of symbols, names pool
+# size, and flag of the passed validation.
+SYMBOL_CACHE_ENTRY: struct.Struct = struct.Struct('<H32sQQQIIB')
+
+
+def get_symbol_cache_path(lib_dir: Path = P2K_DIR_LIB) -> Path:
+	return lib_dir / SYMBOL_CACHE_FILE_NAME
+
+
+def pack_symbol_table(table: SymbolTable) -> tuple[bytes, int]:
+	pool: bytes = '\0'.join(table.names).encode('utf-8')
+	return table.addresses.tobytes() + bytes(table.modes) + pool, len(pool)
+
+
+class SymbolCache:
+	"""
+	Memory-mapped snapshot of all "*.sym" files of the "res" directory, every file is stored as an array of 32-bit
+	addresses, an array of mode bytes, and a pool of NUL-separated names.
+	"""
+
+	def __init__(self, cache_p: Path) -> None:
+		self.cache_file = cache_p.open(mode='rb')
+		self.cache_map: mmap.mmap = mmap.mmap(self.cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+		self.entries: dict[str, SymbolCacheEntry] = {}
+		try:
+			magic, version, byteorder, count = SYMBOL_CACHE_HEADER.unpack_from(self.cache_map)
+			if magic != SYMBOL_CACHE_FILE_MAGIC or version != SYMBOL_CACHE_FILE_VERSION:
+				raise ValueError('unknown magic or version')
+			if byteorder != (sys.byteorder == 'little'):
+				raise ValueError('other byte order')
+			offset: int = SYMBOL_CACHE_HEADER.size
+			for _ in range(count):
+				path_size, *entry = SYMBOL_CACHE_ENTRY.unpack_from(self.cache_map, offset)
+				offset += SYMBOL_CACHE_ENTRY.size
+				path: str = self.cache_map[offset:offset + path_size].decode('utf-8')
+				offset += path_size
+				digest, mtime, size, data, symbols, pool, valid = entry
+				if data + symbols * 5 + pool > len(self.cache_map):
+					raise ValueError(f'data of "{path}" is out of bounds')
+				self.entries[path] = digest, mtime, size, data, symbols, pool, bool(valid)
+		except (struct.error, UnicodeDecodeError, ValueError):
+			self.close()
+			raise
+
+	def __enter__(self) -> 'SymbolCache':
+		return self
+
+	def __exit__(self, *args) -> None:
+		self.close()
+
+	def __contains__(self, path: str) -> bool:
+		return path in self.entries
+
+	def __len__(self) -> int:
+		return len(self.entries)
+
+	def close(self) -> None:
+		self.cache_map.close()
+		self.cache_file.close()
+
+	def paths(self) -> list[str]:
+		return sorted(self.entries)
+
+	def is_valid(self, path: str) -> bool:
+		entry: SymbolCacheEntry | None = self.entries.get(path)
+		return (entry is not None) and entry[6]
+
+	def blob(self, path: str) -> bytes:
+		digest, mtime, size, data, symbols, pool, valid = self.entries[path]
+		return self.cache_map[data:data + symbols * 5 + pool]
+
+	def table(self, path: str) -> SymbolTable | None:
+		entry: SymbolCacheEntry | None = self.entries.get(path)
+		if entry is None:
+			return None
+		digest, mtime, size, data, symbols, pool, valid = entry
+		addresses: array = array('I')
+		addresses.frombytes(self.cache_map[data:data + symbols * 4])
+		modes: bytearray = bytearray(self.cache_map[data + symbols * 4:data + symbols * 5])
+		names: list[str] = self.cache_map[data + symbols * 5:data + symbols * 5 + pool].decode('utf-8').split('\0')
+		return SymbolTable.from_arrays(addresses, modes, names if symbols > 0 else [])
+
+	def model(self, path: str) -> LibraryModel | None:
+		table: SymbolTable | None = self.table(path)
+		return table.to_model() if (table is not None) else None
+
+
+def try_open_symbol_cache(cache_p: Path) -> SymbolCache | None:
+	if cache_p.is_file():
+		try:
+			return SymbolCache(cache_p)
+		except (OSError, ValueError, struct.error, UnicodeDecodeError) as error:
+			logging.info(f'Symbols cache "{cache_p}" is broken and will be rebuilt: {error}')
+	return None
+
+
+def update_symbol_cache(lib_dir: Path = P2K_DIR_LIB, cache_p: Path | None = None) -> bool:
+	"""
+	Only new and changed symbols files are parsed again, a file is considered as changed when its mtime or size
+	differs and its SHA-256 digest does not match to the cached one.
+	"""
+	cache_p: Path = cache_p or get_symbol_cache_path(lib_dir)
+	records: list[tuple[str, SymbolCacheEntry, bytes]] = []
+	changed: bool = False
+	cache: SymbolCache | None = try_open_symbol_cache(cache_p)
+	try:
+		files: list[Path] = sorted(lib_dir.glob('*/*.sym'))
+		paths: list[str] = [file.relative_to(lib_dir).as_posix() for file in files]
+		if (cache is None) or (set(paths) != set(cache.entries)):
+			changed = True
+		for file, path in zip(files, paths):
+			stat: os.stat_result = file.stat()
+			entry: SymbolCacheEntry | None = cache.entries.get(path) if (cache is not None) else None
+			if (entry is not None) and (entry[1] == stat.st_mtime_ns) and (entry[2] == stat.st_size):
+				records.append((path, entry, cache.blob(path)))
+				continue
+			changed = True
+			digest: bytes = hashlib.sha256(file.read_bytes()).digest()
+			if (entry is not None) and (entry[0] == digest):
+				records.append((path, (digest, stat.st_mtime_ns, stat.st_size, *entry[3:]), cache.blob(path)))
+				continue
+			logging.info(f'Will cache "{file}" symbols file.')
+			table: SymbolTable | None = load_symbol_table(file, True)
+			valid: bool = table is not None
+			if not valid:
+				table = load_symbol_table(file)
+			if table is None:
+				logging.warning(f'Cannot cache "{file}" symbols file.')
+				continue
+			blob, pool = pack_symbol_table(table)
+			records.append((path, (digest, stat.st_mtime_ns, stat.st_size, 0, len(table), pool, valid), blob))
+	except OSError as error:
+		logging.error(f'Cannot read symbols files of "{lib_dir}" directory: {error}')
+		return False
+	finally:
+		if cache is not None:
+			cache.close()
+	if not changed:
+		return True
+
+	encoded: list[bytes] = [path.encode('utf-8') for path, _, _ in records]
+	data: int = SYMBOL_CACHE_HEADER.size + sum(SYMBOL_CACHE_ENTRY.size + len(path) for path in encoded)
+	temporary_p: Path = cache_p.with_name(f'{cache_p.name}.tmp')
+	try:
+		with temporary_p.open(mode='wb') as f_o:
+			f_o.write(SYMBOL_CACHE_HEADER.pack(
+				SYMBOL_CACHE_FILE_MAGIC, SYMBOL_CACHE_FILE_VERSION, sys.byteorder == 'little', len(records)
+			))
+			for path, (_, (digest, mtime, size, _, symbols, pool, valid), blob) in zip(encoded, records):
+				f_o.write(SYMBOL_CACHE_ENTRY.pack(len(path), digest, mtime, size, data, symbols, pool, valid))
+				f_o.write(path)
+				data += len(blob)
+			for _, _, blob in records:
+				f_o.write(blob)
+		os.replace(temporary_p, cache_p)
+		return True
+	except OSError as error:
+		logging.error(f'Cannot write "{cache_p}" symbols cache: {error}')
+		temporary_p.unlink(missing_ok=True)
+	return False
+
+
+def open_symbol_cache(lib_dir: Path = P2K_DIR_LIB, cache_p: Path | None = None) -> SymbolCache | None:
+	cache_p: Path = cache_p or get_symbol_cache_path(lib_dir)
+	if update_symbol_cache(lib_dir, cache_p):
+		try:
+			return SymbolCache(cache_p)
+		except (OSError, ValueError, struct.error, UnicodeDecodeError) as error:
+			logging.error(f'Cannot open "{cache_p}" symbols cache: {error}')
+	return None
@@ -28,7 +28,10 @@ from .constants import P2K_EP2_GCC_NM
 from .constants import P2K_EP2_GCC_AR
 from .constants import P2K_EP2_GCC_STRIP
 from .invoker import invoke_external_command_res
+from .invoker import invoke_external_command_stream
 from .invoker import invoke_custom_arguments
+from .symbols import write_nm_line_to_sym
+from .writer import LineWriter
 from .filesystem import check_files_if_exists
 
 
@@ -233,6 +236,25 @@ def ep2_gcc_nm(p_in: Path, p_out: Path) -> bool:
 	return invoke_external_command_res([p_in], args, p_out)
 
 
+def ep2_gcc_nm_to_sym(p_in: Path, p_out: Path) -> bool:
+	args: list[str] = [ str(P2K_EP2_GCC_NM), str(p_in) ]
+	try:
+		with LineWriter(p_out) as writer:
+			entries: int = 0
+
+			def write_line(line: str) -> None:
+				nonlocal entries
+				entries += write_nm_line_to_sym(line, writer)
+
+			if invoke_external_command_stream([p_in], args, write_line):
+				if entries > 0:
+					return True
+				logging.error(f'No symbols found in "{p_in}" file.')
+	except OSError as error:
+		logging.error(f'Cannot write "{p_out}" symbols file: {error}')
+	return False
+
+
 def ep2_gcc_ar(p_in: list[Path], p_out: Path) -> bool:
 	logging.info(f'Packing "{p_out}" static library...')
 	args: list[str] = [
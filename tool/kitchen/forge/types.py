@@ -11,18 +11,51 @@ Date: 15-Dec-2023
 Version: 1.0
 """
 
+import sys
+import mmap
 import configparser
 
+from array import array
 from enum import Enum
+from typing import Iterator
 from typing import TypeAlias
+from typing import NamedTuple
 
 
 PatchDict: TypeAlias = dict[str, str]
 PatchDictNone: TypeAlias = dict[str, str] | None
 Symbol: TypeAlias = tuple[str | None, str | None, str | None]
 LibraryModel: TypeAlias = list[tuple[str, str, str]]
-NamesDefs: TypeAlias = dict[str, str]
 PatternModel: TypeAlias = list[tuple[str, str, str, str]]
+BinaryImage: TypeAlias = bytes | bytearray | memoryview | mmap.mmap
+RegionTable: TypeAlias = list[tuple[int, int, int]]
+SymbolCacheEntry: TypeAlias = tuple[bytes, int, int, int, int, int, bool]  # Digest, mtime, size, data, count, pool, OK.
+
+
+# Pattern compiled from the "*.pts" file line, like "Ram D 1 [80A842B0D1062006+0x26]+0x10".
+class Pattern(NamedTuple):
+	name: str
+	mode: str
+	count: int                # Required occurrence number, 0 means a single unique match.
+	text: bytes               # Pattern bytes, wildcard "??" bytes are zeroed.
+	mask: bytes               # Pattern mask, 0xFF for the defined bytes and 0x00 for wildcards.
+	load: bool                # Pattern is in "[...]" brackets, dereference 32-bit big-endian pointer.
+	offsets: tuple[int, int]  # Offsets applied before and after loading or adding firmware base.
+	expression: str = ''      # Source text of the pattern expression.
+
+
+# Result of one "res/<phone_fw>" directory processed by the libraries regenerator.
+class RegeneratorResult(NamedTuple):
+	directory: str
+	seconds: float
+	success: bool
+	error: str = ''  # First error logged while the directory was processed.
+
+
+class PatternStatus(Enum):
+	FOUND: int = 0
+	MISSING: int = 1
+	AMBIGUOUS: int = 2  # More than one match for pattern without occurrence number.
 
 
 class ElfPack(Enum):
@@ -45,6 +78,121 @@ class LibrarySort(Enum):
 	NONE: int = 3
 
 
+# Compact symbols storage: 32-bit addresses array, one byte per mode and interned names.
+class SymbolTable:
+	def __init__(self, model: LibraryModel | None = None) -> None:
+		self.addresses: array = array('I')
+		self.modes: bytearray = bytearray()
+		self.names: list[str] = []
+		self.indexes: dict[str, int] = {}        # First index of every name, like the first entry in the "*.sym" file.
+		self.views: dict[LibrarySort, array] = {}
+		if model is not None:
+			self.extend(model)
+
+	def __len__(self) -> int:
+		return len(self.names)
+
+	def __getitem__(self, index: int) -> tuple[str, str, str]:
+		return f'0x{self.addresses[index]:08X}', chr(self.modes[index]), self.names[index]
+
+	def __iter__(self) -> Iterator[tuple[str, str, str]]:
+		for address, mode, name in zip(self.addresses, self.modes, self.names):
+			yield f'0x{address:08X}', chr(mode), name
+
+	def append(self, address: int, mode: str, name: str) -> None:
+		name: str = sys.intern(name)
+		self.indexes.setdefault(name, len(self.names))
+		self.addresses.append(address)
+		self.modes.append(ord(mode))
+		self.names.append(name)
+		self.views.clear()
+
+	def extend(self, model: LibraryModel) -> None:
+		for address, mode, name in model:
+			self.append(int(address, 16), mode, name)
+
+	def find(self, name: str) -> int | None:
+		return self.indexes.get(name)
+
+	def address(self, index: int) -> int:
+		return self.addresses[index]
+
+	def mode(self, index: int) -> str:
+		return chr(self.modes[index])
+
+	def sort_view(self, sort: LibrarySort) -> array:
+		view: array | None = self.views.get(sort)
+		if view is None:
+			indexes: range = range(len(self.names))
+			if sort == LibrarySort.ADDR:
+				view = array('I', sorted(indexes, key=self.addresses.__getitem__))
+			elif sort == LibrarySort.MODE:
+				view = array('I', sorted(indexes, key=self.modes.__getitem__))
+			elif sort == LibrarySort.NAME:
+				view = array('I', sorted(indexes, key=lambda index: self.names[index].lower()))
+			else:
+				view = array('I', indexes)
+			self.views[sort] = view
+		return view
+
+	def select(self, indexes: array | list[int]) -> 'SymbolTable':
+		table: SymbolTable = SymbolTable()
+		for index in indexes:
+			table.append(self.addresses[index], chr(self.modes[index]), self.names[index])
+		return table
+
+	def sorted(self, sort: LibrarySort) -> 'SymbolTable':
+		return self.select(self.sort_view(sort))
+
+	@staticmethod
+	def from_arrays(addresses: array, modes: bytearray, names: list[str]) -> 'SymbolTable':
+		table: SymbolTable = SymbolTable()
+		table.addresses = addresses
+		table.modes = modes
+		table.names = [sys.intern(name) for name in names]
+		for index, name in enumerate(table.names):
+			table.indexes.setdefault(name, index)
+		return table
+
+	def copy(self) -> 'SymbolTable':
+		table: SymbolTable = SymbolTable()
+		table.addresses = self.addresses[:]
+		table.modes = self.modes[:]
+		table.names = self.names[:]
+		table.indexes = self.indexes.copy()
+		return table
+
+	def to_model(self) -> LibraryModel:
+		return list(self)
+
+
+# Names of the EP2 entries which cannot be restored from the "library.bin" file: data entries and constants.
+class DefinitionsRegistry:
+	def __init__(self) -> None:
+		self.const_indexes: dict[str, int] = {}
+		self.const_names: dict[int, str] = {}
+		self.data_names: set[str] = set()
+
+	def __len__(self) -> int:
+		return len(self.const_indexes) + len(self.data_names)
+
+	def add_const(self, name: str, index: int) -> None:
+		self.const_indexes[name] = index
+		self.const_names.setdefault(index, name)
+
+	def add_data(self, name: str) -> None:
+		self.data_names.add(name)
+
+	def const_name(self, index: int) -> str | None:
+		return self.const_names.get(index)
+
+	def const_index(self, name: str) -> int | None:
+		return self.const_indexes.get(name)
+
+	def is_data(self, name: str) -> bool:
+		return name in self.data_names
+
+
 # Case-sensitive config parser.
 class CsConfigParser(configparser.ConfigParser):
 	def optionxform(self, option: any) -> any:
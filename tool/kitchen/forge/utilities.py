@@ -48,6 +48,26 @@ def log_result(result: bool) -> bool:
 	return result
 
 
+class ErrorCollector(logging.Handler):
+	"""
+	Messages of the error records which are logged while the collector is attached to the root logger.
+	"""
+
+	def __init__(self) -> None:
+		super().__init__(logging.ERROR)
+		self.messages: list[str] = []
+
+	def __enter__(self) -> 'ErrorCollector':
+		logging.getLogger().addHandler(self)
+		return self
+
+	def __exit__(self, *args) -> None:
+		logging.getLogger().removeHandler(self)
+
+	def emit(self, record: logging.LogRecord) -> None:
+		self.messages.append(record.getMessage())
+
+
 def dump_text_file_to_debug_log(text_file: Path, strip_lines: bool = True) -> None:
 	if check_files_if_exists([text_file]):
 		with text_file.open(mode='r') as f_i:
@@ -71,5 +91,11 @@ def set_logging_configuration(verbose: bool) -> None:
 	)
 
 
+def set_worker_logging_configuration(level: int) -> None:
+	# Worker processes started by "spawn" or "forkserver" do not inherit the logging configuration of the parent.
+	set_logging_configuration(level <= logging.DEBUG)
+	logging.getLogger().setLevel(level)
+
+
 def is_string_filled_by_character(arg_string: str, arg_char: str) -> bool:
 	return set(arg_string) == {arg_char}
@@ -0,0 +1,93 @@
+# forge/writer.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import logging
+
+from typing import TextIO
+from typing import Iterable
+from pathlib import Path
+from itertools import islice
+
+from .constants import ADS_SYM_FILE_HEADER
+from .constants import MAX_TEXT_CHUNK_LINES
+from .utilities import get_current_datetime_formatted
+
+
+class LineWriter:
+	"""
+	Buffered text file writer, lines are collected into chunks and every chunk is flushed by one "writelines()" call.
+	Written lines are logged only if "log_lines" is set and debug logging is enabled, so no formatting is wasted.
+	"""
+
+	def __init__(self, out_p: Path, mode: str = 'w', log_lines: bool = False) -> None:
+		self.file: TextIO = out_p.open(mode=mode, newline='\r\n')
+		self.chunk: list[str] = []
+		self.lines: int = 0
+		self.log_lines: bool = log_lines and logging.getLogger().isEnabledFor(logging.DEBUG)
+
+	def __enter__(self) -> 'LineWriter':
+		return self
+
+	def __exit__(self, *args) -> None:
+		self.close()
+
+	def write_line(self, line: str = '') -> None:
+		self.chunk.append(f'{line}\n')
+		self.lines += 1
+		if self.log_lines:
+			logging.debug(line)
+		if len(self.chunk) >= MAX_TEXT_CHUNK_LINES:
+			self.flush()
+
+	def write_lines(self, lines: Iterable[str]) -> int:
+		count: int = self.lines
+		iterator = iter(lines)
+		while chunk := list(islice(iterator, MAX_TEXT_CHUNK_LINES)):
+			if self.log_lines:
+				for line in chunk:
+					logging.debug(line)
+			self.chunk.extend(f'{line}\n' for line in chunk)
+			self.lines += len(chunk)
+			if len(self.chunk) >= MAX_TEXT_CHUNK_LINES:
+				self.flush()
+		return self.lines - count
+
+	def flush(self) -> None:
+		self.file.writelines(self.chunk)
+		self.chunk.clear()
+
+	def close(self) -> None:
+		try:
+			self.flush()
+		finally:
+			self.file.close()
+
+
+def write_lines_to_file(out_p: Path, header: Iterable[str], lines: Iterable[str], log_lines: bool = False) -> int:
+	with LineWriter(out_p, log_lines=log_lines) as writer:
+		writer.write_lines(header)
+		return writer.write_lines(lines)
+
+
+def get_forge_header(title: str, fields: Iterable[tuple[str, str]] = ()) -> list[str]:
+	return [
+		f'# {title} was generated by "forge" library.',
+		'# Source Code: https://github.com/MotoFanRu/P2K-ELF-SDK',
+		*[f'# {key}: {value}' for key, value in fields],
+		f'# Timestamp: {get_current_datetime_formatted()}',
+		''
+	]
+
+
+def get_sym_file_header(comments: Iterable[str] = ()) -> list[str]:
+	return [ADS_SYM_FILE_HEADER, '# SYMDEFS ADS HEADER', '', *comments]
@@ -14,5 +14,13 @@ Version: 1.0
 from .test_filesystem import TestFileSystem
 from .test_firmware import TestFirmware
 from .test_hexer import TestHexer
+from .test_libgen import TestLibgen
+from .test_libbin import TestLibraryBin
+from .test_patterns import TestPatterns
+from .test_portkit import TestPortKit
+from .test_ramtrans import TestRamTrans
+from .test_symcache import TestSymbolCache
+from .test_symbolizer import TestSymbolizer
 from .test_symbols import TestSymbols
 from .test_utilities import TestUtilities
+from .test_writer import TestWriter
@@ -11,9 +11,14 @@ Date: 15-Dec-2023
 Version: 1.0
 """
 
+import tempfile
 import unittest
 
+from pathlib import Path
+
 from forge import MemoryRegion
+from forge import FirmwareView
+from forge import detect_firmware_start
 from forge import determine_soc
 from forge import parse_phone_firmware
 from forge import parse_minor_major_firmware
@@ -94,3 +99,27 @@ class TestFirmware(unittest.TestCase):
 		self.assertEqual(determine_memory_region(0x30000000), MemoryRegion.UNKNOWN)
 		self.assertEqual(determine_memory_region(0x40000000), MemoryRegion.UNKNOWN)
 		self.assertEqual(determine_memory_region(0xFFFFFFFF), MemoryRegion.UNKNOWN)
+
+	def test_firmware_view(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			firmware_p: Path = Path(temp) / 'E1_R373_G_0E.30.49R.smg'
+			firmware_p.write_bytes(bytes.fromhex('00112233445566778899'))
+			with FirmwareView(firmware_p) as firmware:
+				self.assertEqual(len(firmware), 10)
+				self.assertEqual(firmware.hex(2, 4), '22334455')
+				self.assertEqual(firmware.hex(8, 4), '8899')
+				self.assertEqual(firmware.hex(16, 4), '')
+				self.assertEqual(firmware.read(-1, 4).tobytes(), b'')
+			firmware_p.write_bytes(b'')
+			with FirmwareView(firmware_p) as firmware:
+				self.assertEqual(len(firmware), 0)
+
+	def test_detect_firmware_start(self) -> None:
+		data: bytearray = bytearray(0x20000)
+		data[0x1000:0x1002] = b'\xB5\xF0'
+		data[0x2000:0x2004] = b'\xE9\x2D\x40\x00'
+		model: list[tuple[str, str, str]] = [
+			('0x10093000', 'T', 'A'), ('0x10094000', 'A', 'B'), ('0x10093002', 'D', 'C')
+		]
+		self.assertEqual(detect_firmware_start(data, model), 0x10092000)
+		self.assertIsNone(detect_firmware_start(data, [('0x10093002', 'T', 'A')]))
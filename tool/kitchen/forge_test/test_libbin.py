@@ -0,0 +1,115 @@
+# forge_test/test_libbin.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import struct
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from forge import LibraryBinView
+from forge import open_library_bin
+from forge import ElfloaderLibView
+from forge import pack_ep1_library
+from forge import pack_ep2_library
+from forge import pack_ep2_stub_library
+from forge import diff_library_symbols
+from forge import EP2_LIBRARY_MAGIC
+from forge import P2K_DIR_EP2_LIB
+
+
+class TestLibraryBin(unittest.TestCase):
+	def test_library_bin_view(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			lib_p: Path = Path(temp) / 'library.bin'
+			entries: bytes = struct.pack('>IIII', 0, 0x10C1ACCD, 1, 0x12345678)
+			names: bytes = b'memcpy\0 Data \0'
+			consts: bytes = struct.pack('>HHII', 0x2103, 0x1000, 0x0000001A, 0xFFFFFFFF)
+			strtab_offset: int = 56 + len(entries)
+			header: bytes = struct.pack(
+				'>I8s24sIIIII', EP2_LIBRARY_MAGIC, b'1.0', b'R373_G_0E.30.49R', 2,
+				len(names), strtab_offset, 2, strtab_offset + len(names)
+			)
+			lib_p.write_bytes(header + entries + names + consts)
+
+			with open_library_bin(lib_p) as library:
+				self.assertEqual(len(library), 2)
+				self.assertEqual(library.version, '1.0')
+				self.assertEqual(library.firmware, 'R373_G_0E.30.49R')
+				self.assertEqual(list(library.indexes), [0, 1])
+				self.assertEqual(list(library.addresses), [0x10C1ACCD, 0x12345678])
+				self.assertEqual(library.names, ['memcpy', 'Data'])
+				self.assertEqual(list(library.const_indexes), [0x2103, 0x1000])
+				self.assertEqual(list(library.const_values), [0x0000001A, 0xFFFFFFFF])
+				self.assertEqual(library.header['constOff'], strtab_offset + len(names))
+
+			lib_p.write_bytes(b'\0' * len(header))
+			with self.assertRaises(ValueError):
+				LibraryBinView(lib_p)
+			self.assertIsNone(open_library_bin(lib_p))
+
+	def test_elfloader_lib_view(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			ep1_p: Path = Path(temp) / 'elfloader.lib'
+			ep2_p: Path = Path(temp) / 'library.bin'
+			names: list[bytes] = [b'memcpy', b'Data', b'memcpy']
+			ep1_p.write_bytes(pack_ep1_library(3, [0, 0x10C1ACCD, 7, 0x30000010, 0, 0x10C1ACCD], names))
+			entries: bytes = struct.pack('>IIII', 0, 0x10C1ACCD, 1, 0x00000020)
+			strtab: bytes = b'memcpy\0Data\0'
+			ep2_p.write_bytes(struct.pack(
+				'>I8s24sIIIII', EP2_LIBRARY_MAGIC, b'1.0', b'R373_G_0E.30.49R', 2,
+				len(strtab), 56 + len(entries), 0, 56 + len(entries) + len(strtab)
+			) + entries + strtab)
+
+			with ElfloaderLibView(ep1_p) as ep1, LibraryBinView(ep2_p) as ep2:
+				self.assertEqual(len(ep1), 3)
+				self.assertEqual(list(ep1.offsets), [0, 7, 0])
+				self.assertEqual(ep1.raw_name(1), b'Data')
+				self.assertEqual(ep1.names, ['memcpy', 'Data', 'memcpy'])
+				self.assertEqual(ep1.symbols(), {b'memcpy': 0x10C1ACCD, b'Data': 0x00000010})
+				self.assertEqual(diff_library_symbols(ep1.symbols(), ep2.symbols()), ([], [b'Data']))
+				self.assertEqual(diff_library_symbols(ep2.symbols(), {b'free': 0x10C1AC01}), ([b'free'], []))
+
+	def test_pack_ep2_library(self) -> None:
+		library: bytearray = pack_ep2_library([b'memcpy', b'Data'], [0x10C1ACCD, 0x00000020], [], '1.0', 'R373')
+		self.assertEqual(struct.unpack_from('<I8s24sIIIII', library), (
+			EP2_LIBRARY_MAGIC, b'1.0'.ljust(8, b'\0'), b'R373'.ljust(24, b'\0'), 2, 12, 72, 0, 84
+		))
+		library = pack_ep2_library([b'memcpy'], [0x10C1ACCD], [(0x1000, 0x1A), (0x2103, 0xFFFFFFFF)], '1.0', 'R373')
+		self.assertEqual(
+			library[56:], struct.pack('>II7sHHII', 0, 0x10C1ACCD, b'memcpy', 0x1000, 0x2103, 0x1A, 0xFFFFFFFF)
+		)
+		with tempfile.TemporaryDirectory() as temp:
+			lib_p: Path = Path(temp) / 'library.bin'
+			lib_p.write_bytes(library)
+			with LibraryBinView(lib_p) as view:
+				self.assertEqual(view.names, ['memcpy'])
+				self.assertEqual(list(view.addresses), [0x10C1ACCD])
+				self.assertEqual(list(view.const_indexes), [0x1000, 0x2103])
+				self.assertEqual(list(view.const_values), [0x1A, 0xFFFFFFFF])
+
+	def test_pack_ep2_stub_library_res(self) -> None:
+		stub_p: Path = P2K_DIR_EP2_LIB / 'std.sa'
+		if not stub_p.is_file():
+			self.skipTest(f'No "{stub_p}" stub library.')
+		stub: bytes = stub_p.read_bytes()
+		sections: list[tuple[int, ...]] = [struct.unpack_from('>10I', stub, 52 + index * 40) for index in range(5)]
+		dynsym, dynsym_size, dynstr, dynstr_size = sections[2][4], sections[2][5], sections[3][4], sections[3][5]
+		strtab: bytes = stub[dynstr:dynstr + dynstr_size]
+		names: list[bytes] = []
+		addresses: list[int] = []
+		for offset in range(dynsym + 16, dynsym + dynsym_size, 16):
+			name_offset, address = struct.unpack_from('>II', stub, offset)
+			names.append(strtab[name_offset:strtab.index(b'\0', name_offset)])
+			addresses.append(address)
+		self.assertEqual(pack_ep2_stub_library(names, addresses), stub)
@@ -0,0 +1,166 @@
+# forge_test/test_libgen.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import re
+import logging
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from forge import LibrarySort
+from forge import ep1_libgen_model
+from forge import ep1_libgen_library
+from forge import ep1_libgen_symbols
+from forge import ep2_libgen_library
+from forge import ep2_libgen_api_names
+from forge import pack_ep2_stub_library
+from forge import LibraryBinView
+from forge import ElfPack
+from forge import RegeneratorResult
+from forge import libgen_directory_worker
+from forge import libgen_process_directories
+from forge import log_regenerator_summary
+from forge import libgen_regenerate_directory
+from forge import parse_phone_firmware
+from forge import P2K_DIR_LIB
+from forge import P2K_ARGON_PHONES
+
+
+def touch_directory_except_e1(directory: Path, sort: LibrarySort, e: ElfPack) -> bool:
+	# Worker task which keeps the "res" directory untouched and breaks on every E1 firmware directory.
+	if directory.name.startswith('E1_'):
+		raise ValueError('Broken directory.')
+	return directory.is_dir()
+
+
+class TestLibgen(unittest.TestCase):
+	def test_ep1_libgen_library(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			sym_p: Path = Path(temp) / 'elfloader.sym'
+			lib_p: Path = Path(temp) / 'elfloader.lib'
+			sym_p.write_text('0x10C1ACCC T memcpy\n0x10C1AC00 A cpy\n0x00000010 D Data\n0x00000001 C cpy\n')
+			functions, model = ep1_libgen_model(sym_p, LibrarySort.NONE)
+			self.assertEqual(functions, ' memcpy cpy Data cpy ')
+			self.assertTrue(ep1_libgen_library(lib_p, model, functions, False))
+			self.assertEqual(
+				lib_p.read_bytes(),
+				bytes.fromhex('00000004 00000000 10C1ACCD 00000007 10C1AC00 0000000B 30000010 00000007 00000001') +
+				b'memcpy\0cpy\0Data\0cpy\0'
+			)
+
+	def test_ep1_libgen_library_res(self) -> None:
+		libraries: list[Path] = sorted(P2K_DIR_LIB.glob('*/elfloader.lib'))
+		if not libraries:
+			self.skipTest(f'No "elfloader.lib" libraries in "{P2K_DIR_LIB}" directory.')
+		logging.disable(logging.CRITICAL)
+		try:
+			with tempfile.TemporaryDirectory() as temp:
+				sym_p: Path = Path(temp) / 'elfloader.sym'
+				lib_p: Path = Path(temp) / 'elfloader.lib'
+				for library in libraries:
+					with self.subTest(library=library.parent.name):
+						phone, firmware = parse_phone_firmware(re.sub(r'_test\d+', '', library.parent.name), False)
+						self.assertTrue(ep1_libgen_symbols(library, sym_p, LibrarySort.NONE, phone, firmware))
+						functions, model = ep1_libgen_model(sym_p, LibrarySort.NONE)
+						self.assertTrue(ep1_libgen_library(lib_p, model, functions, phone in P2K_ARGON_PHONES))
+						self.assertEqual(lib_p.read_bytes(), library.read_bytes())
+		finally:
+			logging.disable(logging.NOTSET)
+
+	def test_ep2_libgen_library_res(self) -> None:
+		libraries: list[Path] = sorted(P2K_DIR_LIB.glob('*/library.bin'))
+		if not libraries:
+			self.skipTest(f'No "library.bin" libraries in "{P2K_DIR_LIB}" directory.')
+		logging.disable(logging.CRITICAL)
+		try:
+			with tempfile.TemporaryDirectory() as temp:
+				lib_p: Path = Path(temp) / 'library.bin'
+				stub_p: Path = Path(temp) / 'std.sa'
+				api_names: list[bytes] = ep2_libgen_api_names()
+				for library in libraries:
+					with self.subTest(library=library.parent.name):
+						with LibraryBinView(library) as view:
+							version, firmware = view.version, view.firmware
+							names, addresses = view.raw_names, list(view.addresses)
+						sym_p: Path = library.with_suffix('.sym')
+						self.assertTrue(ep2_libgen_library(sym_p, LibrarySort.NONE, 'Phone', firmware, lib_p))
+						generated: bytearray = bytearray(lib_p.read_bytes())
+						generated[4:12] = version.encode('ascii').ljust(8, b'\0')
+						self.assertEqual(generated, library.read_bytes())
+						self.assertTrue(ep2_libgen_library(sym_p, LibrarySort.NONE, 'Phone', firmware, stub_p))
+						self.assertEqual(stub_p.read_bytes()[:7], b'\x7FELF\x01\x02\x01')
+						# Entries of "library.bin" go first, then ElfLoader API functions with placeholder address 1.
+						self.assertEqual(
+							stub_p.read_bytes(),
+							pack_ep2_stub_library(names + api_names, addresses + [1] * len(api_names))
+						)
+		finally:
+			logging.disable(logging.NOTSET)
+
+	def test_libgen_directory_worker(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			directory: Path = Path(temp) / 'E1_R373_G_0E.30.49R'
+			directory.mkdir()
+			sym_p: Path = directory / 'elfloader.sym'
+			sym_p.write_text('#<SYMDEFS>#symdef-file\n0x10C1ACCC T memcpy\n0x00000010 D Data\n')
+			result: RegeneratorResult = libgen_directory_worker(
+				libgen_regenerate_directory, directory, LibrarySort.NONE, ElfPack.EP1
+			)
+			self.assertEqual((result.directory, result.success, result.error), (directory.name, True, ''))
+			self.assertTrue((directory / 'elfloader.lib').is_file())
+
+			sym_p.write_text('0x10C1ACCC T memcpy\n')
+			with self.assertLogs(level=logging.ERROR):
+				result = libgen_directory_worker(libgen_regenerate_directory, directory, LibrarySort.NONE, ElfPack.EP1)
+			self.assertFalse(result.success)
+			self.assertIn('#<SYMDEFS>#symdef-file', result.error)
+
+	def test_libgen_process_directories(self) -> None:
+		directories: list[str] = sorted(path.name for path in P2K_DIR_LIB.iterdir() if path.is_dir())
+		broken: list[str] = [directory for directory in directories if directory.startswith('E1_')]
+		if not broken or len(broken) == len(directories):
+			self.skipTest(f'No E1 and other firmware directories in "{P2K_DIR_LIB}" directory.')
+		with self.assertLogs(level=logging.INFO) as logs:
+			self.assertFalse(libgen_process_directories(touch_directory_except_e1, LibrarySort.NONE, ElfPack.EP1))
+		lines: list[list[str]] = [
+			record.getMessage().split() for record in logs.records if record.getMessage().startswith('\t')
+		]
+		self.assertEqual([line[0] for line in lines], directories)
+		for line in lines:
+			self.assertEqual(line[1], 'FAIL' if line[0] in broken else 'OK')
+			error: str = f'Cannot process "{P2K_DIR_LIB / line[0]}" directory: Broken directory.'
+			self.assertEqual(' '.join(line[3:]), error if line[0] in broken else '')
+		self.assertIn(f'Processed {len(directories)} directories in', logs.records[-1].getMessage())
+		self.assertIn(f'{len(broken)} failed.', logs.records[-1].getMessage())
+
+	def test_log_regenerator_summary(self) -> None:
+		summary: list[RegeneratorResult] = [
+			RegeneratorResult('C650_R365_G_0B.D3.08R', 0.5, True, ''),
+			RegeneratorResult('E1_R373_G_0E.30.49R', 0.25, False, 'Cannot parse symbols file.'),
+			RegeneratorResult('V600_TRIPLETS', 1.0, True, ''),
+		]
+		with self.assertLogs(level=logging.INFO) as logs:
+			self.assertFalse(log_regenerator_summary(summary, 1.5))
+		self.assertEqual(
+			[(record.levelno, record.getMessage()) for record in logs.records],
+			[
+				(logging.INFO, 'Summary:'),
+				(logging.INFO, '\tC650_R365_G_0B.D3.08R OK     0.500s'),
+				(logging.ERROR, '\tE1_R373_G_0E.30.49R   FAIL   0.250s Cannot parse symbols file.'),
+				(logging.INFO, '\tV600_TRIPLETS         OK     1.000s'),
+				(logging.INFO, 'Processed 3 directories in 1.500s, 1 failed.'),
+			]
+		)
+		with self.assertLogs(level=logging.INFO):
+			self.assertTrue(log_regenerator_summary(summary[:1], 0.5))
@@ -0,0 +1,213 @@
+# forge_test/test_patterns.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import logging
+import random
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from forge import Pattern
+from forge import PatternScanner
+from forge import parse_pattern_line
+from forge import mask_branch_opcodes
+from forge import select_unique_pattern
+from forge import generalize_patterns
+from forge import evaluate_patterns
+from forge import get_index_path
+from forge import open_firmware_index
+from forge import load_pattern_file
+from forge import get_compiled_pattern_path
+from forge import resolve_pattern_value
+from forge import pat_find
+from forge import pat_find_directory
+from forge import INDEX_MIN_IMAGE_SIZE
+
+
+class TestPatterns(unittest.TestCase):
+	def test_parse_pattern_line(self) -> None:
+		self.assertEqual(
+			parse_pattern_line('memcpy T B5F0??1C'),
+			Pattern('memcpy', 'T', 0, b'\xB5\xF0\x00\x1C', b'\xFF\xFF\x00\xFF', False, (0, 0), 'B5F0??1C')
+		)
+		self.assertEqual(
+			parse_pattern_line('Ram D 2 [80A8+0x26]+0x10'),
+			Pattern('Ram', 'D', 2, b'\x80\xA8', b'\xFF\xFF', True, (0x26, 0x10), '[80A8+0x26]+0x10')
+		)
+		self.assertEqual(
+			parse_pattern_line('Func A 4A03-0x4'),
+			Pattern('Func', 'A', 0, b'\x4A\x03', b'\xFF\xFF', False, (0, -4), '4A03-0x4')
+		)
+		self.assertIsNone(parse_pattern_line('# Comment'))
+		self.assertIsNone(parse_pattern_line('Func Z 4A03'))
+		self.assertIsNone(parse_pattern_line(' '))
+
+	def test_load_pattern_file(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			pat_p: Path = Path(temp) / 'General_P2K_LTE2.pts'
+			pat_p.write_text('# Comment\nmemcpy T B5F0??1C\nRam D 2 [80A8+0x26]+0x10\n')
+			patterns: list[Pattern] = load_pattern_file(pat_p)
+			self.assertEqual([pattern.name for pattern in patterns], ['memcpy', 'Ram'])
+			self.assertTrue(get_compiled_pattern_path(pat_p).is_file())
+			self.assertEqual(load_pattern_file(pat_p), patterns)
+			pat_p.write_text('memset T B5F0\n')
+			self.assertEqual([pattern.name for pattern in load_pattern_file(pat_p)], ['memset'])
+
+	def test_mask_branch_opcodes(self) -> None:
+		self.assertEqual(mask_branch_opcodes(bytes.fromhex('B5F0F7FF1C041C2F'), True), 'B5F0????????1C2F')
+		self.assertEqual(mask_branch_opcodes(bytes.fromhex('B500F7FF'), True), 'B500????')
+		self.assertEqual(mask_branch_opcodes(bytes.fromhex('1C04F7'), True), '1C04F7')
+		self.assertEqual(
+			mask_branch_opcodes(bytes.fromhex('E92D4000A0000012E1A00000'), False), 'E92D4000????????E1A00000'
+		)
+		self.assertEqual(mask_branch_opcodes(bytes.fromhex('E92DB000'), False), 'E92DB000')
+		self.assertIsNone(mask_branch_opcodes(bytes.fromhex('F000F800'), True))
+		self.assertIsNone(mask_branch_opcodes(b'', True))
+
+	def test_pattern_scanner(self) -> None:
+		patterns: list[Pattern] = [
+			parse_pattern_line('Aligned T 1122334455667788'),
+			parse_pattern_line('Unaligned T 33445566??88'),
+			parse_pattern_line('Short T 99AA'),
+			parse_pattern_line('Twice T 2 DEADBEEF'),
+			parse_pattern_line('Missed T CAFEBABE'),
+		]
+		image: bytes = bytes(8) + bytes.fromhex('1122334455667788') + bytes(3) + bytes.fromhex('99AA') + bytes(3)
+		image += bytes.fromhex('DEADBEEF') + bytes(1) + bytes.fromhex('DEADBEEF') + bytes(3)
+		matches: list[list[int]] = PatternScanner(patterns).scan(image)
+		self.assertEqual(matches, [[8], [10], [19], [24, 29], []])
+		values: list[int | None] = [
+			resolve_pattern_value(pattern, found, image, 0x10000000) for pattern, found in zip(patterns, matches)
+		]
+		self.assertEqual(values, [0x10000008, 0x1000000A, 0x10000013, 0x1000001D, None])
+
+	def test_resolve_pattern_value(self) -> None:
+		image: bytes = bytes.fromhex('0000000012345678')
+		self.assertEqual(resolve_pattern_value(parse_pattern_line('X D [00+0x4]+0x10'), [0], image, 0), 0x12345688)
+		self.assertEqual(resolve_pattern_value(parse_pattern_line('X D [00+0x8]'), [0], image, 0), None)
+		self.assertEqual(resolve_pattern_value(parse_pattern_line('X D 00'), [0, 1], image, 0), None)
+
+	def test_pattern_scanner_index(self) -> None:
+		patterns: list[Pattern] = [
+			parse_pattern_line('Aligned T 1122334455667788'),
+			parse_pattern_line('Unaligned T 33445566??88'),
+			parse_pattern_line('Zeros T 00000000'),
+		]
+		image: bytearray = bytearray(random.Random(0).randbytes(0x1000))
+		image[0x100:0x108] = bytes.fromhex('1122334455667788')
+		image[0x201:0x209] = bytes.fromhex('1122334455667788')
+		with tempfile.TemporaryDirectory() as temp:
+			image_p: Path = Path(temp) / 'E1_R373_G_0E.30.49R.smg'
+			image_p.write_bytes(image)
+			with open_firmware_index(image, image_p) as index:
+				self.assertEqual(PatternScanner(patterns).scan(image, index), PatternScanner(patterns).scan(image))
+			self.assertTrue(get_index_path(image_p).is_file())
+			image[0x300:0x304] = bytes(4)
+			with open_firmware_index(image, image_p) as index:
+				self.assertEqual(PatternScanner(patterns).scan(image, index), [[0x100, 0x201], [0x102, 0x203], [0x300]])
+
+	def test_select_unique_pattern(self) -> None:
+		image: bytearray = bytearray(random.Random(0).randbytes(0x1000))
+		image[0x800:0x810] = image[0x100:0x110]
+		self.assertEqual(
+			select_unique_pattern(image, None, 0x200, 0x20, False), (image[0x200:0x208].hex().upper(), [0x200])
+		)
+		hex_data, matches = select_unique_pattern(image, None, 0x100, 0x20, False)
+		self.assertEqual((len(hex_data), matches), (0x14 * 2, [0x100]))
+		hex_data, matches = select_unique_pattern(image, None, 0x100, 0x10, False)
+		self.assertEqual((len(hex_data), matches), (0x10 * 2, [0x100, 0x800]))
+
+	def test_evaluate_patterns(self) -> None:
+		image: bytes = bytes.fromhex('AABBCCDD12345678DEADBEEF')
+		patterns: list[Pattern] = [
+			parse_pattern_line('A D [AABB+0x4]'),
+			parse_pattern_line('B D [CCDD+0x2]+0x10'),
+			parse_pattern_line('C D AABB-0x2'),
+			parse_pattern_line('D D [DEADBEEF]'),
+			parse_pattern_line('E D [DEAD]'),
+		]
+		matches: list[list[int]] = [[0], [2], [0], [8], []]
+		self.assertEqual(
+			evaluate_patterns(patterns, matches, image, 0x10000000),
+			[0x12345678, 0x12345688, 0x0FFFFFFE, 0xDEADBEEF, None]
+		)
+
+	def test_generalize_patterns(self) -> None:
+		self.assertEqual(generalize_patterns(['B5F0??1C2F00', 'B5F1??1C2F']), 'B5????1C2F')
+		self.assertEqual(generalize_patterns(['B5F01C', 'B5F01C']), 'B5F01C')
+		self.assertEqual(generalize_patterns(['B5F0AA', 'B5F0BB']), 'B5F0')
+		self.assertIsNone(generalize_patterns(['AA', 'BB']))
+
+	def test_pat_find(self) -> None:
+		logging.disable(logging.CRITICAL)
+		try:
+			with tempfile.TemporaryDirectory() as temp:
+				pat_p: Path = Path(temp) / 'General_P2K_LTE2.pts'
+				pat_p.write_text('Func T B5F0??1C\nData D AABBCCDD\n')
+				cgs_p: Path = Path(temp) / 'E1_R373_G_0E.30.49R.smg'
+				image: bytearray = bytearray(INDEX_MIN_IMAGE_SIZE)
+				image[0x200:0x204] = bytes.fromhex('B5F0121C')
+				cgs_p.write_bytes(image)
+				sym_p: Path = Path(temp) / 'Functions.sym'
+				for use_index in (False, True):
+					with self.subTest(use_index=use_index):
+						self.assertTrue(pat_find(pat_p, cgs_p, 0x10080000, False, sym_p, use_index))
+						self.assertEqual(
+							sym_p.read_text().splitlines()[1:], ['0x10080200 T Func', '# NOT_FOUND: D Data']
+						)
+						self.assertEqual(get_index_path(cgs_p).is_file(), use_index)
+		finally:
+			logging.disable(logging.NOTSET)
+
+	def test_pat_find_directory(self) -> None:
+		logging.disable(logging.CRITICAL)
+		try:
+			with tempfile.TemporaryDirectory() as temp:
+				pat_p: Path = Path(temp) / 'General_P2K_LTE2.pts'
+				pat_p.write_text('Func T B5F0??1C\nData D AABBCCDD\n')
+				cgs_dir: Path = Path(temp) / 'cg'
+				out_dir: Path = Path(temp) / 'output'
+				cgs_dir.mkdir()
+				out_dir.mkdir()
+				first: bytearray = bytearray(INDEX_MIN_IMAGE_SIZE)
+				first[0x200:0x204] = bytes.fromhex('B5F0121C')
+				first[0x400:0x404] = bytes.fromhex('AABBCCDD')
+				second: bytearray = bytearray(INDEX_MIN_IMAGE_SIZE)
+				second[0x200:0x204] = bytes.fromhex('B5F0121C')
+				second[0x600:0x604] = bytes.fromhex('B5F0341C')
+				(cgs_dir / 'C650_R365_G_0B.D3.08R.smg').write_bytes(first)
+				(cgs_dir / 'E1_R373_G_0E.30.49R.bin').write_bytes(second)
+
+				self.assertTrue(pat_find_directory(pat_p, cgs_dir, 0x10080000, False, out_dir))
+				self.assertEqual(
+					(out_dir / 'C650_R365_G_0B.D3.08R.sym').read_text().splitlines()[1:],
+					['0x10080200 T Func', '0x10080400 D Data']
+				)
+				self.assertEqual(
+					(out_dir / 'E1_R373_G_0E.30.49R.sym').read_text().splitlines()[1:],
+					['# NOT_FOUND: T Func', '# NOT_FOUND: D Data']
+				)
+				summary: list[str] = (out_dir / 'Summary.txt').read_text().splitlines()
+				self.assertEqual(summary[3:5], [
+					'#   1: C650_R365_G_0B.D3.08R.smg, 2/2 found',
+					'#   2: E1_R373_G_0E.30.49R.bin, 0/2 found'
+				])
+				self.assertEqual(summary[-2:], ['Func T +! 1', 'Data D +- 1'])
+				self.assertFalse(any(path.suffix == '.idx' for path in cgs_dir.iterdir()))
+
+				self.assertTrue(pat_find_directory(pat_p, cgs_dir, 0x10080000, False, out_dir, True))
+				self.assertEqual((out_dir / 'Summary.txt').read_text().splitlines()[-2:], summary[-2:])
+				self.assertTrue(get_index_path(cgs_dir / 'E1_R373_G_0E.30.49R.bin').is_file())
+		finally:
+			logging.disable(logging.NOTSET)
@@ -0,0 +1,74 @@
+# forge_test/test_portkit.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import logging
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from forge import Pattern
+from forge import SymbolLookup
+from forge import parse_pattern_line
+from forge import open_symbol_lookup
+from forge import ADS_SYM_FILE_HEADER
+
+from ep1_portkit import PATCH_PATTERNS
+from ep1_portkit import EP1_PFW_VARIANTS
+from ep1_portkit import apply_patches
+
+
+def write_pattern_fixture(image: bytearray, pattern: Pattern, value: int, base: int) -> None:
+	# Pattern bytes are put where they resolve to the value, loading patterns get their pointer at fixed 0x100 match.
+	if pattern.load:
+		match: int = 0x100
+		image[match:match + len(pattern.text)] = pattern.text
+		pointer: int = match + pattern.offsets[0]
+		image[pointer:pointer + 4] = (value - pattern.offsets[1]).to_bytes(4, 'big')
+	else:
+		match: int = value - base - pattern.offsets[0] - pattern.offsets[1]
+		image[match:match + len(pattern.text)] = pattern.text
+
+
+class TestPortKit(unittest.TestCase):
+	def test_apply_patches(self) -> None:
+		logging.disable(logging.CRITICAL)
+		try:
+			with tempfile.TemporaryDirectory() as temp:
+				fw_p: Path = Path(temp) / 'firmware.bin'
+				sym_p: Path = Path(temp) / 'Combined.sym'
+				for pfw, entries in PATCH_PATTERNS.items():
+					with self.subTest(firmware=pfw):
+						phone, firmware = pfw.split('_', 1)
+						base: int = EP1_PFW_VARIANTS[firmware]['addr_start']
+						patterns: list[Pattern] = [parse_pattern_line(line) for line, _ in entries]
+						sizes: list[int] = [
+							0 if pattern.load else value - base for pattern, (_, value) in zip(patterns, entries)
+						]
+						image: bytearray = bytearray(max(sizes) + 0x1000)
+						for pattern, (_, value) in zip(patterns, entries):
+							write_pattern_fixture(image, pattern, value, base)
+						fw_p.write_bytes(image)
+						names: str = ''.join(f'0x00000000 D {pattern.name}\n' for pattern in patterns)
+						sym_p.write_text(f'{ADS_SYM_FILE_HEADER}\n0x10080000 A Start\n{names}')
+
+						self.assertTrue(apply_patches(phone, firmware, sym_p, fw_p, base))
+						lookup: SymbolLookup = open_symbol_lookup(sym_p)
+						for pattern, (_, value) in zip(patterns, entries):
+							self.assertEqual(lookup.resolve(pattern.name), value)
+
+						fw_p.write_bytes(bytes(len(image)))
+						self.assertFalse(apply_patches(phone, firmware, sym_p, fw_p, base))
+				self.assertTrue(apply_patches('C650', 'R365_G_0B.D3.08R', sym_p, fw_p, 0x10080000))
+		finally:
+			logging.disable(logging.NOTSET)
@@ -0,0 +1,42 @@
+# forge_test/test_ramtrans.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import unittest
+
+from forge import RamTranslator
+from forge import parse_region_table
+
+
+class TestRamTrans(unittest.TestCase):
+	def test_parse_region_table(self) -> None:
+		image: bytes = bytes(4) + bytes.fromhex('0000000800000030')
+		image += bytes.fromhex('10100000 03F00000 00001000'.replace(' ', ''))
+		image += bytes.fromhex('10200000 12000000 00000000'.replace(' ', ''))
+		image += bytes.fromhex('10300000 03F00800 00000800'.replace(' ', ''))
+		self.assertEqual(
+			parse_region_table(image, 4),
+			[(0x10100000, 0x03F00000, 0x1000), (0x10300000, 0x03F00800, 0x800)]
+		)
+		self.assertIsNone(parse_region_table(image, 0x100))
+
+	def test_ram_translator(self) -> None:
+		translator: RamTranslator = RamTranslator([
+			(0x10100000, 0x03F00000, 0x1000),
+			(0x10100800, 0x12000000, 0x1000),
+			(0x10300000, 0x03F01000, 0x800),
+		])
+		self.assertEqual(
+			translator.translate_all([0x10100000, 0x10100FFF, 0x10101000, 0x10101800, 0x10300010, 0x10000000, None]),
+			[0x03F00000, 0x03F00FFF, 0x12000800, 0x10101800, 0x03F01010, 0x10000000, None]
+		)
+		self.assertEqual(translator.inverted().translate(0x03F01010), 0x10300010)
@@ -0,0 +1,56 @@
+# forge_test/test_symbolizer.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import unittest
+
+from forge import SymbolTable
+from forge import AddressIndex
+from forge import symbolize_text
+
+
+class TestSymbolizer(unittest.TestCase):
+	def setUp(self) -> None:
+		self.table: SymbolTable = SymbolTable([
+			('0x10C1ACCC', 'T', 'memcpy'),
+			('0x00000010', 'C', 'CONST'),
+			('0x10080000', 'A', 'Start'),
+			('0x10C1AD00', 'T', 'memset'),
+		])
+
+	def test_lookup(self) -> None:
+		index: AddressIndex = AddressIndex(self.table)
+		self.assertEqual(len(index), 3)
+		self.assertEqual(index.lookup(0x10080000), ('Start', 0))
+		self.assertEqual(index.lookup(0x10C1ACCD), ('memcpy', 1))
+		self.assertEqual(index.lookup(0x10C1ACFF), ('memcpy', 0x33))
+		self.assertEqual(index.lookup(0x10C1AD40), ('memset', 0x40))
+		self.assertIsNone(index.lookup(0x00000010))
+		self.assertEqual(index.lookup_all([0x10C1ACCC, 0x10000000]), [('memcpy', 0), None])
+
+	def test_lookup_max_size(self) -> None:
+		index: AddressIndex = AddressIndex(self.table, 0x20)
+		self.assertEqual(index.lookup(0x10C1ACEB), ('memcpy', 0x1F))
+		self.assertIsNone(index.lookup(0x10C1ACEC))
+		self.assertIsNone(index.lookup(0x10C1AD20))
+
+	def test_lookup_last_symbol(self) -> None:
+		self.assertEqual(AddressIndex(self.table).lookup(0x10C2ACFF), ('memset', 0xFFFF))
+		self.assertIsNone(AddressIndex(self.table).lookup(0x10C2AD00))
+		self.assertIsNone(AddressIndex(self.table, 0).lookup(0xFFFFFFFF))
+		self.assertEqual(AddressIndex(self.table, 0).lookup(0x10C1ACCB), ('Start', 0xB9ACCB))
+
+	def test_symbolize_text(self) -> None:
+		index: AddressIndex = AddressIndex(self.table)
+		self.assertEqual(symbolize_text(index, 'LR=0x10C1ACD1'), 'LR=0x10C1ACD1 <memcpy+0x5>')
+		self.assertEqual(symbolize_text(index, '10C1AD00: 00 00'), '10C1AD00 <memset>: 00 00')
+		self.assertEqual(symbolize_text(index, 'PC=0x00000010 R0=1234'), 'PC=0x00000010 R0=1234')
@@ -11,9 +11,25 @@ Date: 15-Dec-2023
 Version: 1.0
 """
 
+import os
+import tempfile
 import unittest
 
+from pathlib import Path
+
+from forge import LibrarySort
+from forge import SymbolTable
+from forge import DefinitionsRegistry
+from forge import parse_sym_file
+from forge import replace_syms
+from forge import merge_sym_files
+from forge import convert_nm_to_sym
+from forge import SymbolLookup
+from forge import open_symbol_lookup
+from forge import get_function_address_from_sym_file
 from forge import split_and_validate_line
+from forge import load_definitions
+from forge import ADS_SYM_FILE_HEADER
 
 
 class TestSymbols(unittest.TestCase):
@@ -27,3 +43,136 @@ class TestSymbols(unittest.TestCase):
 		self.assertEqual(split_and_validate_line('0x10C1ACCC T '), (None, None, None))
 		self.assertEqual(split_and_validate_line('A A A'), (None, None, None))
 		self.assertEqual(split_and_validate_line(' '), (None, None, None))
+
+	def test_parse_sym_file(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			sym_p: Path = Path(temp) / 'library.sym'
+			sym_p.write_text(f'{ADS_SYM_FILE_HEADER}\n# Comment\n\n0x10C1ACCC T memcpy\n0x00000001 C CONST\n')
+			model = [('0x10C1ACCC', 'T', 'memcpy'), ('0x00000001', 'C', 'CONST')]
+			self.assertEqual(parse_sym_file(sym_p, True), model)
+			parse_sym_file(sym_p, True).clear()
+			self.assertEqual(parse_sym_file(sym_p, True), model)
+			sym_p.write_text(f'{ADS_SYM_FILE_HEADER}\n0x10C1ACCC T memcpy\n0x10C1ACCD T memcpy\n')
+			os.utime(sym_p, ns=(0, 0))
+			self.assertIsNone(parse_sym_file(sym_p, True))
+			self.assertEqual(len(parse_sym_file(sym_p)), 2)
+			sym_p.write_text('0x10C1ACCC T memcpy\n')
+			self.assertIsNone(parse_sym_file(sym_p, True))
+			self.assertEqual(parse_sym_file(sym_p), [('0x10C1ACCC', 'T', 'memcpy')])
+
+	def test_symbol_table(self) -> None:
+		model = [('0x10C1ACCC', 'T', 'memcpy'), ('0x00000001', 'C', 'CONST'), ('0x03FC0000', 'D', 'Buffer')]
+		table: SymbolTable = SymbolTable(model)
+		self.assertEqual(len(table), 3)
+		self.assertEqual(table.to_model(), model)
+		self.assertEqual(table[2], ('0x03FC0000', 'D', 'Buffer'))
+		self.assertEqual(table.find('memcpy'), 0)
+		self.assertIsNone(table.find('memset'))
+		self.assertEqual(table.address(table.find('Buffer')), 0x03FC0000)
+		self.assertEqual(table.mode(table.find('CONST')), 'C')
+		self.assertEqual(list(table.sort_view(LibrarySort.ADDR)), [1, 2, 0])
+		self.assertEqual(list(table.sort_view(LibrarySort.MODE)), [1, 2, 0])
+		self.assertEqual(list(table.sort_view(LibrarySort.NAME)), [2, 1, 0])
+		self.assertEqual(table.sorted(LibrarySort.NAME).to_model(), [model[2], model[1], model[0]])
+		copy: SymbolTable = table.copy()
+		copy.append(0x10C1ACD0, 'T', 'memset')
+		self.assertEqual((len(table), len(copy)), (3, 4))
+
+	def test_replace_syms(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			sym_p: Path = Path(temp) / 'library.sym'
+			sym_p.write_text(
+				f'{ADS_SYM_FILE_HEADER}\n'
+				'0x10000000 T first\n0x10000010 T second\n0x10000020 A third\n0x00000001 C third\n'
+			)
+			patches: list[str] = ['0x10000030 T second', '0x10000020 A third', '0x10000040 A fourth', 'Z']
+			self.assertTrue(replace_syms(patches, sym_p, 'E1', 'R373_G_0E.30.49R', 'EP2', '1.0'))
+			self.assertEqual(parse_sym_file(sym_p), [
+				('0x10000000', 'T', 'first'),
+				('0x10000030', 'T', 'second'),
+				('0x10000020', 'A', 'third'),
+				('0x10000040', 'A', 'fourth')
+			])
+			self.assertFalse(replace_syms(['Z'], sym_p, 'E1', 'R373_G_0E.30.49R', 'EP2', '1.0'))
+
+	def test_symbol_lookup(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			sym_p: Path = Path(temp) / 'Register.sym'
+			sym_p.write_text(f'{ADS_SYM_FILE_HEADER}\n0x10C1ACCC T Register\n0x10080000 A Start\n0x10080010 A Start\n')
+			lookup: SymbolLookup = open_symbol_lookup(sym_p)
+			self.assertEqual(lookup.resolve('Register'), 0x10C1ACCD)
+			self.assertEqual(lookup.resolve('Start'), 0x10080000)
+			self.assertEqual(lookup.resolve('AutorunMain'), 0x00000000)
+			self.assertNotIn('AutorunMain', lookup)
+			self.assertEqual(lookup.resolve_all(['Register', 'Start']), {'Register': 0x10C1ACCD, 'Start': 0x10080000})
+			self.assertEqual(get_function_address_from_sym_file(sym_p, 'Register'), 0x10C1ACCD)
+
+	def test_merge_sym_files(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			functions_p: Path = Path(temp) / 'Functions.sym'
+			platform_p: Path = Path(temp) / 'Platform.sym'
+			combined_p: Path = Path(temp) / 'Combined.sym'
+			functions_p.write_text(
+				f'{ADS_SYM_FILE_HEADER}\n0x10C1ACCC T memcpy\n# NOT_FOUND: T memset\n# NOT_FOUND: A Start\n'
+			)
+			platform_p.write_text(
+				f'{ADS_SYM_FILE_HEADER}\n0x10080000 A Start\n0x10C1ACCC T memcpy\n0x00000001 C Start\n'
+			)
+			self.assertEqual(merge_sym_files([functions_p, platform_p], combined_p), [
+				('0x00000001', 'C', 'Start'),
+				('0x10080000', 'A', 'Start'),
+				('0x10C1ACCC', 'T', 'memcpy')
+			])
+			self.assertEqual(len(parse_sym_file(combined_p, True)), 3)
+			self.assertIn('# NOT_FOUND: T memset', combined_p.read_text())
+			platform_p.write_text(f'{ADS_SYM_FILE_HEADER}\n0x10C1ACD0 T memcpy\n')
+			with self.assertLogs(level='ERROR') as logs:
+				self.assertIsNone(merge_sym_files([functions_p, platform_p], combined_p))
+			self.assertTrue(any(str(platform_p) in line for line in logs.output))
+
+	def test_merge_sym_files_prefer_first(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			append_p: Path = Path(temp) / 'Append.sym'
+			combined_p: Path = Path(temp) / 'Combined.sym'
+			append_p.write_text(f'{ADS_SYM_FILE_HEADER}\n0x10C1ACD0 T memcpy\n')
+			combined_p.write_text(f'{ADS_SYM_FILE_HEADER}\n0x10C1ACCC T memcpy\n0x10080000 A Start\n')
+			with self.assertLogs(level='WARNING') as logs:
+				self.assertEqual(merge_sym_files([append_p, combined_p], combined_p, True), [
+					('0x10080000', 'A', 'Start'),
+					('0x10C1ACD0', 'T', 'memcpy')
+				])
+			self.assertTrue(any('Overridden' in line for line in logs.output))
+			self.assertEqual(len(parse_sym_file(combined_p, True)), 2)
+
+	def test_convert_nm_to_sym(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			nm_p: Path = Path(temp) / 'ElfPack.nm'
+			sym_p: Path = Path(temp) / 'ElfPack.sym'
+			nm_p.write_text('10080000 T Start\n10080010 t local\n         U undefined\n10C1ACCC D Data\n')
+			self.assertTrue(convert_nm_to_sym(nm_p, sym_p))
+			self.assertEqual(sym_p.read_text().splitlines(), ['0x10080000 T Start', '0x10C1ACCC D Data'])
+			nm_p.write_text('         U undefined\n')
+			self.assertFalse(convert_nm_to_sym(nm_p, sym_p))
+
+	def test_load_definitions(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			def_p: Path = Path(temp) / 'EntriesNames.def'
+			header_p: Path = Path(temp) / 'consts.h'
+			def_p.write_text('0x00002103 C AUDIO_STATUS\n0xFFFFFFFF D _region_table\n0x10C1ACCC T memcpy\n')
+			header_p.write_text('#define _CONSTS_H_\n#define EV_DEVICE_ATTACH 0x1000 // Comment.\n')
+
+			names: DefinitionsRegistry = load_definitions(def_p)
+			self.assertIs(load_definitions(def_p), names)
+			self.assertEqual(names.const_name(0x2103), 'AUDIO_STATUS')
+			self.assertEqual(names.const_index('AUDIO_STATUS'), 0x2103)
+			self.assertIsNone(names.const_name(0x1000))
+			self.assertTrue(names.is_data('_region_table'))
+			self.assertFalse(names.is_data('memcpy'))
+
+			consts: DefinitionsRegistry = load_definitions(header_p)
+			self.assertEqual(consts.const_indexes, {'EV_DEVICE_ATTACH': 0x1000})
+			self.assertEqual(consts.data_names, set())
+
+			def_p.write_text('0x00002106 C CALL_MISSED_STATUS\n')
+			os.utime(def_p, ns=(0, 0))
+			self.assertEqual(load_definitions(def_p).const_indexes, {'CALL_MISSED_STATUS': 0x2106})
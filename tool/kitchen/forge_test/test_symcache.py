@@ -0,0 +1,53 @@
+# forge_test/test_symcache.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from forge import SymbolCache
+from forge import open_symbol_cache
+from forge import ADS_SYM_FILE_HEADER
+
+
+class TestSymbolCache(unittest.TestCase):
+	def test_symbol_cache(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			lib_dir: Path = Path(temp)
+			(lib_dir / 'E1_R373_G_0E.30.49R').mkdir()
+			(lib_dir / 'C650_R365_G_0B.D3.08R').mkdir()
+			ep1_sym: Path = lib_dir / 'E1_R373_G_0E.30.49R' / 'elfloader.sym'
+			ep2_sym: Path = lib_dir / 'C650_R365_G_0B.D3.08R' / 'library.sym'
+			ep1_sym.write_text(f'{ADS_SYM_FILE_HEADER}\n0x10C1ACCC T memcpy\n0x00000001 C CONST\n')
+			ep2_sym.write_text('0x10080000 A Start\n')
+
+			cache: SymbolCache = open_symbol_cache(lib_dir)
+			with cache:
+				self.assertEqual(
+					cache.paths(), ['C650_R365_G_0B.D3.08R/library.sym', 'E1_R373_G_0E.30.49R/elfloader.sym']
+				)
+				self.assertEqual(
+					cache.model('E1_R373_G_0E.30.49R/elfloader.sym'),
+					[('0x10C1ACCC', 'T', 'memcpy'), ('0x00000001', 'C', 'CONST')]
+				)
+				self.assertEqual(cache.table('E1_R373_G_0E.30.49R/elfloader.sym').find('CONST'), 1)
+				self.assertTrue(cache.is_valid('E1_R373_G_0E.30.49R/elfloader.sym'))
+				self.assertFalse(cache.is_valid('C650_R365_G_0B.D3.08R/library.sym'))
+				self.assertIsNone(cache.table('E1_R373_G_0E.30.49R/library.sym'))
+
+			ep1_sym.write_text(f'{ADS_SYM_FILE_HEADER}\n0x10C1ACD0 T memset\n')
+			ep2_sym.unlink()
+			with open_symbol_cache(lib_dir) as cache:
+				self.assertEqual(cache.paths(), ['E1_R373_G_0E.30.49R/elfloader.sym'])
+				self.assertEqual(cache.model('E1_R373_G_0E.30.49R/elfloader.sym'), [('0x10C1ACD0', 'T', 'memset')])
@@ -0,0 +1,51 @@
+# forge_test/test_writer.py
+# -*- coding: utf-8 -*-
+
+"""
+The "Forge" python library for the P2K ELF SDK toolchain.
+
+Python: 3.10+
+License: MIT
+Authors: EXL, MotoFan.Ru
+Date: 15-Dec-2023
+Version: 1.0
+"""
+
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from forge import LineWriter
+from forge import write_lines_to_file
+from forge import get_forge_header
+from forge import get_sym_file_header
+from forge import ADS_SYM_FILE_HEADER
+from forge import MAX_TEXT_CHUNK_LINES
+
+
+class TestWriter(unittest.TestCase):
+	def test_write_lines_to_file(self) -> None:
+		with tempfile.TemporaryDirectory() as temp:
+			out_p: Path = Path(temp) / 'Lines.sym'
+			count: int = MAX_TEXT_CHUNK_LINES * 2 + 1
+			lines: list[str] = [f'0x{index:08X} T Func{index}' for index in range(count)]
+			self.assertEqual(write_lines_to_file(out_p, get_sym_file_header(), iter(lines)), count)
+			self.assertEqual(
+				out_p.read_bytes(),
+				'\r\n'.join([ADS_SYM_FILE_HEADER, '# SYMDEFS ADS HEADER', '', *lines, '']).encode('utf-8')
+			)
+
+			with LineWriter(out_p, mode='a') as writer:
+				writer.write_line()
+				writer.write_line('# NOT_FOUND: T Func')
+			self.assertTrue(
+				out_p.read_bytes().endswith(f'T Func{count - 1}\r\n\r\n# NOT_FOUND: T Func\r\n'.encode('utf-8'))
+			)
+
+	def test_get_forge_header(self) -> None:
+		header: list[str] = get_forge_header('Symbol listing', [('Phone', 'E1'), ('Firmware', 'R373_G_0E.30.49R')])
+		self.assertEqual(header[0], '# Symbol listing was generated by "forge" library.')
+		self.assertEqual(header[2:4], ['# Phone: E1', '# Firmware: R373_G_0E.30.49R'])
+		self.assertTrue(header[4].startswith('# Timestamp: '))
+		self.assertEqual(header[5], '')
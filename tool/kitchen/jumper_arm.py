@@ -16,6 +16,11 @@ import capstone
 
 import argparse
 
+from pathlib import Path
+
+from forge import FirmwareView
+from forge import open_address_index
+
 
 def hexdump(data, wide = 0x10, offset = 0):
 	line = bytearray()
@@ -52,9 +57,7 @@ def hexdump_line(offset, bytes_array, wide):
 
 def view_binary(address, opts):
 	if address:
-		opts['bin-file'].seek(0)
-		opts['bin-file'].seek(address - opts['offset'])
-		file_data = opts['bin-file'].read(0x50)
+		file_data = opts['bin-file'].read(address - opts['offset'], 0x50)
 		print(f'\n{hexdump(file_data, 0x10, address)}')
 
 
@@ -80,22 +83,22 @@ def process_i(inst_buff, offset, mode, opts) -> None:
 			bytecode = ' '.join([f'{b:02X}' for b in inst.bytes])
 			op_addr, op_str, addr_i = nake_address(inst.op_str, opts)
 			if op_addr and is_valid_armv4t_instruction(inst, opts):
+				if opts['symbols'] and addr_i is not None:
+					symbol = opts['symbols'].symbolize(addr_i)
+					if symbol:
+						op_str += f' <{symbol}>'
 				print(f'{mode} : 0x{inst.address:08X} : {bytecode:<11} : {inst.mnemonic.upper():<6} {op_str}')
 				if opts['bin-file']:
 					view_binary(addr_i, opts)
 
 
 def read_binary_file(opts):
-	opts['bin-file'] = open(opts['bin'], 'rb') if opts['bin'] else None
-	with open(opts['file'], 'rb') as file:
-		file_offset = 0
-		while True:
-			inst_buff = file.read(0x04)
-			if not inst_buff:
-				break
+	opts['bin-file'] = FirmwareView(Path(opts['bin'])) if opts['bin'] else None
+	with FirmwareView(Path(opts['file'])) as file:
+		for file_offset in range(0, len(file), 0x04):
+			inst_buff = bytes(file.read(file_offset, 0x04))
 			process_i(inst_buff, opts['offset'] + file_offset, 'T', opts)
 			process_i(inst_buff, opts['offset'] + file_offset, 'A', opts)
-			file_offset += len(inst_buff)
 	if opts['bin']:
 		opts['bin-file'].close()
 
@@ -137,6 +140,7 @@ def main():
 		'a': 'use ARMv4T instruction set (no BLX, no BXJ), default False',
 		'g': 'instruction group (Jump, Branch, Call), default Jump',
 		'i': 'add additional binary file (FULL FLASH) to hexdump analalyze',
+		'y': 'symbols file (SYM) to name the jump and branch targets',
 	}
 	epl = """examples:
 	# Little-Endian, Big-Endian, ARMv4T, and start offset:
@@ -156,6 +160,9 @@ def main():
 
 	# View-binary:
 	python jumper_arm.py -f BOOT_0826.bin -b -a -g Call -r 0x10DFFFFF-0x11140000 -i 32MB_FULL.bin
+
+	# Symbols:
+	python jumper_arm.py -f E1_R373_G_0E.30.49R.smg -b -a -g Call -x 0x10080000 -y elfloader.sym
 	"""
 	pa = argparse.ArgumentParser(description=hlp['D'], epilog=epl, formatter_class=argparse.RawDescriptionHelpFormatter)
 	pa.add_argument('-f', '--file', required=True, metavar='FILE', help=hlp['f'])
@@ -165,6 +172,7 @@ def main():
 	pa.add_argument('-a', '--armv4t', action='store_true', help=hlp['a'])
 	pa.add_argument('-g', '--group', type=str, default='All', metavar='GROUP', help=hlp['g'])
 	pa.add_argument('-i', '--view-bin', metavar='FILE', help=hlp['i'])
+	pa.add_argument('-y', '--symbols', metavar='FILE', help=hlp['y'])
 
 	args = pa.parse_args()
 
@@ -176,6 +184,7 @@ def main():
 		'armv4t'     : args.armv4t,
 		'bin'        : args.view_bin,
 		'group'      : set_group(args.group),
+		'symbols'    : open_address_index(Path(args.symbols)) if args.symbols else None,
 		'mda'        : capstone.Cs(capstone.CS_ARCH_ARM, capstone.CS_MODE_ARM   + set_endian(args.big_endian)),
 		'mdt'        : capstone.Cs(capstone.CS_ARCH_ARM, capstone.CS_MODE_THUMB + set_endian(args.big_endian)),
 	}
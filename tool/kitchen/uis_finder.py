@@ -18,6 +18,10 @@ import re
 import struct
 import argparse
 
+from pathlib import Path
+
+from forge import FirmwareView
+
 
 def decode_arm_immediate(instruction):
 	"""Decode immediate value for ARM instructions (8-bit with rotation)."""
@@ -91,12 +95,17 @@ def find_function_start(data, adr_addr, max_search=1024, arm_mode=False):
 def main(firmware_path, base_offset, output_file=None):
 	"""Main function to search for UIS_ functions in ARM firmware."""
 	try:
-		with open(firmware_path, 'rb') as f:
-			data = f.read()
+		firmware = FirmwareView(Path(firmware_path))
 	except FileNotFoundError:
 		print(f'Error: File \'{firmware_path}\' not found.')
 		return
 
+	with firmware:
+		find_uis_functions(firmware.data, base_offset, output_file)
+
+
+def find_uis_functions(data, base_offset, output_file=None):
+	"""Search for UIS_ functions in the firmware data."""
 	string_pattern = rb'\nUIS_[A-Za-z0-9_]+ enter'
 	matches = list(re.finditer(string_pattern, data))
 